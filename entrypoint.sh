@@ -1,11 +1,13 @@
 #!/bin/sh
 # Common boot for every Django container: web, task-worker, task-scheduler.
-# Apply migrations first so workers don't race the schema. Then dispatch:
+# Apply migrations and create the cache table first so workers don't race the
+# schema. Then dispatch:
 #   - no argv  → web (uWSGI)
 #   - any argv → exec it (worker / scheduler / one-off command)
 set -e
 
 python manage.py migrate --noinput
+python manage.py createcachetable
 
 if [ "$#" -gt 0 ]; then
     exec "$@"
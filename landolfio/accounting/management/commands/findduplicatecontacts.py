@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from accounting.models import Contact
+from accounting.services import find_duplicate_contact_groups
+
+
+class Command(BaseCommand):
+    help = "List groups of duplicate contacts, to merge them in Moneybird"
+
+    def handle(self, *args, **options):
+        groups = find_duplicate_contact_groups()
+        contacts = Contact.objects.in_bulk([pk for pks in groups for pk in pks])
+
+        for pks in groups:
+            original, *duplicates = (contacts[pk] for pk in pks)
+            self.stdout.write(
+                f"{original} (#{original.pk}, Moneybird {original.moneybird_id}): "
+                + ", ".join(
+                    f"{duplicate} (#{duplicate.pk}, Moneybird {duplicate.moneybird_id})"
+                    for duplicate in duplicates
+                )
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Found {len(groups)} groups of duplicate contacts, "
+                f"{sum(len(pks) - 1 for pks in groups)} duplicates."
+            )
+        )
@@ -0,0 +1,101 @@
+# Generated by Django 6.1.2 on 2026-10-19 11:57
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Frozen copies of the normalization in accounting.models.contact, so this
+# migration keeps its behaviour when the model code changes
+
+PHONE_MATCH_DIGITS = 9
+NORMALIZED_NAME_MAX_LENGTH = 255
+NORMALIZED_EMAIL_MAX_LENGTH = 254
+
+
+def normalize_email(email):
+    if not email:
+        return ""
+    return email.strip().lower()[:NORMALIZED_EMAIL_MAX_LENGTH]
+
+
+def normalize_name(name):
+    if not name:
+        return ""
+    name = "".join(
+        character
+        for character in unicodedata.normalize("NFKD", name)
+        if not unicodedata.combining(character)
+    )
+    return " ".join(re.findall(r"\w+", name.casefold()))
+
+
+def normalize_contact_name(first_name, last_name, company_name):
+    name = normalize_name(f"{first_name or ''} {last_name or ''}") or normalize_name(
+        company_name
+    )
+    return name[:NORMALIZED_NAME_MAX_LENGTH]
+
+
+def normalize_phone(phone):
+    return re.sub(r"\D", "", phone or "")[-PHONE_MATCH_DIGITS:]
+
+
+def populate_normalized_fields(apps, schema_editor):
+    """Fill the normalized contact details of existing contacts."""
+    Contact = apps.get_model("accounting", "Contact")
+
+    updated = []
+    for contact in Contact.objects.iterator(chunk_size=1000):
+        contact.normalized_name = normalize_contact_name(
+            contact.first_name, contact.last_name, contact.company_name
+        )
+        contact.normalized_email = normalize_email(contact.email)
+        contact.normalized_phone = normalize_phone(contact.phone)
+        updated.append(contact)
+
+    Contact.objects.bulk_update(
+        updated,
+        ["normalized_name", "normalized_email", "normalized_phone"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0004_autocomplete_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contact",
+            name="normalized_email",
+            field=models.CharField(blank=True, editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name="contact",
+            name="normalized_name",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="contact",
+            name="normalized_phone",
+            field=models.CharField(blank=True, editable=False, max_length=9),
+        ),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                fields=["normalized_name", "normalized_email"],
+                name="accounting__normali_ff545a_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                fields=["normalized_name", "normalized_phone"],
+                name="accounting__normali_2948b0_idx",
+            ),
+        ),
+        migrations.RunPython(populate_normalized_fields, migrations.RunPython.noop),
+    ]
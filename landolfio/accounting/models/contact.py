@@ -1,4 +1,6 @@
 import logging
+import re
+import unicodedata
 
 from django.core.exceptions import ValidationError
 from django.db import models
@@ -20,6 +22,47 @@ class SepaSequenceTypes(models.TextChoices):
     ONE_OFF = "OOFF", _("One-off")
 
 
+# Phone numbers are compared on their last digits, so "+31 6 1234 5678" and
+# "06-12345678" are the same number
+PHONE_MATCH_DIGITS = 9
+# Normalizing can make a name longer ("ß" becomes "ss") and a name combines the
+# first and last name, so the normalized forms are cut to fit their columns
+NORMALIZED_NAME_MAX_LENGTH = 255
+NORMALIZED_EMAIL_MAX_LENGTH = 254
+
+
+def normalize_email(email):
+    """Return the form of an email address that is compared to find duplicates."""
+    if not email:
+        return ""
+    return email.strip().lower()[:NORMALIZED_EMAIL_MAX_LENGTH]
+
+
+def normalize_name(name):
+    """Return the form of a name that ignores case, accents and whitespace."""
+    if not name:
+        return ""
+    name = "".join(
+        character
+        for character in unicodedata.normalize("NFKD", name)
+        if not unicodedata.combining(character)
+    )
+    return " ".join(re.findall(r"\w+", name.casefold()))
+
+
+def normalize_contact_name(first_name, last_name, company_name):
+    """Return the normalized name of a person, or of a company without a person."""
+    name = normalize_name(f"{first_name or ''} {last_name or ''}") or normalize_name(
+        company_name
+    )
+    return name[:NORMALIZED_NAME_MAX_LENGTH]
+
+
+def normalize_phone(phone):
+    """Return the last digits of a phone number, without country or area prefix."""
+    return re.sub(r"\D", "", phone or "")[-PHONE_MATCH_DIGITS:]
+
+
 class Contact(SynchronizableMoneybirdResourceModel):
     company_name = models.CharField(
         verbose_name=_("company name"),
@@ -165,6 +208,17 @@ class Contact(SynchronizableMoneybirdResourceModel):
         verbose_name=_("sales invoices url"), blank=True, max_length=2048, null=True
     )
 
+    # Normalized forms of the contact details, to find duplicate contacts
+    normalized_name = models.CharField(
+        max_length=NORMALIZED_NAME_MAX_LENGTH, blank=True, editable=False
+    )
+    normalized_email = models.CharField(
+        max_length=NORMALIZED_EMAIL_MAX_LENGTH, blank=True, editable=False
+    )
+    normalized_phone = models.CharField(
+        max_length=PHONE_MATCH_DIGITS, blank=True, editable=False
+    )
+
     # TODO calculate paid bails
 
     def clean(self):
@@ -214,6 +268,25 @@ class Contact(SynchronizableMoneybirdResourceModel):
         if errors:
             raise ValidationError(errors)
 
+    def update_normalized_fields(self):
+        self.normalized_name = normalize_contact_name(
+            self.first_name, self.last_name, self.company_name
+        )
+        self.normalized_email = normalize_email(self.email)
+        self.normalized_phone = normalize_phone(self.phone)
+
+    def save(self, *args, **kwargs):
+        self.update_normalized_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                "normalized_name",
+                "normalized_email",
+                "normalized_phone",
+            }
+        return super().save(*args, **kwargs)
+
     def __str__(self):
         if self.company_name:
             return self.company_name
@@ -223,6 +296,10 @@ class Contact(SynchronizableMoneybirdResourceModel):
         verbose_name = _("contact")
         verbose_name_plural = _("contacts")
         ordering = ["company_name", "last_name", "first_name"]
+        indexes = [
+            models.Index(fields=["normalized_name", "normalized_email"]),
+            models.Index(fields=["normalized_name", "normalized_phone"]),
+        ]
 
     def get_payments_mandate_url(self):
         administration = get_moneybird_administration()
@@ -5,6 +5,7 @@ from django.utils.translation import gettext_lazy as _
 from accounting.models.contact import Contact, ContactResourceType
 from moneybird import resources
 from moneybird.models import MoneybirdResourceModel
+from moneybird.references import get_reference
 from moneybird.resource_types import MoneybirdResourceId
 
 
@@ -34,6 +35,7 @@ class Subscription(MoneybirdResourceModel):
 
 class SubscriptionResourceType(resources.SubscriptionResourceType):
     model = Subscription
+    references = {"contact_id": ContactResourceType}
 
     @classmethod
     def get_model_kwargs(cls, resource_data):
@@ -54,8 +56,8 @@ class SubscriptionResourceType(resources.SubscriptionResourceType):
             if resource_data.get("cancelled_at")
             else None
         )
-        kwargs["contact"] = ContactResourceType.get_or_create_from_moneybird_data(
-            resource_data["contact_id"]
+        kwargs["contact"] = get_reference(
+            ContactResourceType, resource_data["contact_id"]
         )
         return kwargs
 
@@ -1,5 +1,79 @@
+from collections import defaultdict
+
+from django.db.models import Q
+
+from accounting.models import Contact
 from moneybird.synchronization import synchronize
 
 
 def sync_moneybird(full_sync=False) -> None:
     synchronize(full_sync=full_sync)
+
+
+def find_duplicate_contact(contact: Contact):
+    """
+    Return an existing contact with the same details as the contact, if any.
+
+    Contacts are duplicates when their normalized names are equal, and so are
+    their normalized email addresses or phone numbers. This ignores case,
+    accents, whitespace and the notation of phone numbers, and runs as one
+    query on the indexes of the normalized fields.
+    """
+    contact.update_normalized_fields()
+    if not contact.normalized_name:
+        return None
+
+    same_details = Q()
+    if contact.normalized_email:
+        same_details |= Q(normalized_email=contact.normalized_email)
+    if contact.normalized_phone:
+        same_details |= Q(normalized_phone=contact.normalized_phone)
+    if not same_details:
+        return None
+
+    contacts = Contact.objects.filter(
+        same_details, normalized_name=contact.normalized_name
+    )
+    if contact.pk:
+        contacts = contacts.exclude(pk=contact.pk)
+    return contacts.order_by("pk").first()
+
+
+def find_duplicate_contact_groups() -> list[list[int]]:
+    """
+    Return the groups of duplicate contacts among all contacts.
+
+    Each group is a list of contact ids, oldest first. Contacts are grouped
+    like in find_duplicate_contact, and through other contacts: a contact with
+    the email address of one contact and the phone number of another joins
+    both in one group. All contacts are read in one pass and grouped in memory.
+    """
+    group_of = {}
+    first_with_key = {}
+
+    def find_group(pk):
+        while group_of[pk] != pk:
+            group_of[pk] = group_of[group_of[pk]]
+            pk = group_of[pk]
+        return pk
+
+    contacts = (
+        Contact.objects.exclude(normalized_name="")
+        .order_by("pk")
+        .values_list("pk", "normalized_name", "normalized_email", "normalized_phone")
+    )
+    for pk, name, email, phone in contacts.iterator(chunk_size=2000):
+        group_of[pk] = pk
+        for key in ((name, "email", email), (name, "phone", phone)):
+            if not key[2]:
+                continue
+            if key not in first_with_key:
+                first_with_key[key] = pk
+                continue
+            group, other_group = find_group(first_with_key[key]), find_group(pk)
+            group_of[max(group, other_group)] = min(group, other_group)
+
+    groups = defaultdict(list)
+    for pk in group_of:
+        groups[find_group(pk)].append(pk)
+    return [pks for pks in groups.values() if len(pks) > 1]
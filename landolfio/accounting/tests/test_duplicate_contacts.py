@@ -0,0 +1,102 @@
+"""Test finding duplicate contacts."""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounting.models import Contact
+from accounting.services import find_duplicate_contact, find_duplicate_contact_groups
+
+
+class DuplicateContactTest(TestCase):
+    """Test cases for find_duplicate_contact and find_duplicate_contact_groups."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.contact = self._create_contact(
+            first_name="José",
+            last_name="van  Dijk",
+            email="Jose@Example.com",
+            phone="+31 6 1234 5678",
+        )
+
+    @staticmethod
+    def _create_contact(**kwargs):
+        contact = Contact(**kwargs)
+        contact.save(received_from_moneybird=True)
+        return contact
+
+    def test_normalized_fields(self):
+        """Test the contact details are normalized when saving."""
+        self.assertEqual(self.contact.normalized_name, "jose van dijk")
+        self.assertEqual(self.contact.normalized_email, "jose@example.com")
+        self.assertEqual(self.contact.normalized_phone, "612345678")
+
+        self.contact.email = "other@example.com"
+        self.contact.save(update_fields=["email"])
+        self.contact.refresh_from_db()
+        self.assertEqual(self.contact.normalized_email, "other@example.com")
+
+    def test_long_names_fit_their_column(self):
+        """Test normalized names are cut to the length of their column."""
+        contact = self._create_contact(
+            first_name="Straß" * 51, last_name="ß" * 255, email="İ" * 240 + "@b.nl"
+        )
+        max_length = Contact._meta.get_field("normalized_name").max_length
+        self.assertEqual(len(contact.normalized_name), max_length)
+        self.assertTrue(contact.normalized_name.startswith("strass"))
+        self.assertLessEqual(
+            len(contact.normalized_email),
+            Contact._meta.get_field("normalized_email").max_length,
+        )
+
+    def test_near_duplicates(self):
+        """Test differences in case, accents, whitespace and phone notation are ignored."""
+        duplicates = [
+            Contact(first_name="jose", last_name="Van Dijk", email=" jose@example.COM"),
+            Contact(first_name="JOSÉ", last_name="van Dijk", phone="06-12345678"),
+        ]
+        for contact in duplicates:
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(find_duplicate_contact(contact), self.contact)
+            self.assertEqual(len(queries), 1)
+
+        self.assertIsNone(
+            find_duplicate_contact(
+                Contact(
+                    first_name="Jan", last_name="van Dijk", email="jose@example.com"
+                )
+            )
+        )
+        self.assertIsNone(find_duplicate_contact(self.contact))
+
+    def test_groups(self):
+        """Test contacts are grouped through shared email addresses and phone numbers."""
+        by_email = self._create_contact(
+            first_name="Jose", last_name="van Dijk", email="jose@example.com"
+        )
+        by_phone = self._create_contact(
+            first_name="Jose",
+            last_name="van Dijk",
+            email="work@example.com",
+            phone="0612345678",
+        )
+        by_work_email = self._create_contact(
+            first_name="Jose", last_name="van Dijk", email="work@example.com"
+        )
+        self._create_contact(first_name="Jose", last_name="Jansen", phone="0612345678")
+        self._create_contact(company_name="Van Dijk", email="jose@example.com")
+
+        self.assertEqual(
+            find_duplicate_contact_groups(),
+            [[self.contact.pk, by_email.pk, by_phone.pk, by_work_email.pk]],
+        )
+
+        out = StringIO()
+        call_command("findduplicatecontacts", stdout=out)
+        self.assertIn(
+            "Found 1 groups of duplicate contacts, 3 duplicates.", out.getvalue()
+        )
@@ -0,0 +1,113 @@
+"""Test resolving the contacts of subscriptions in bulk during a sync."""
+
+from django.test import TestCase
+
+from accounting.models.contact import Contact
+from accounting.models.subscription import Subscription, SubscriptionResourceType
+from moneybird.synchronization import MoneybirdSync
+
+
+def contact_data(moneybird_id, last_name):
+    """Return the Moneybird data of a contact."""
+    data = dict.fromkeys(
+        [
+            "company_name",
+            "firstname",
+            "address1",
+            "address2",
+            "zipcode",
+            "city",
+            "phone",
+            "customer_id",
+            "tax_number",
+            "chamber_of_commerce",
+            "bank_account",
+            "attention",
+            "email",
+            "send_invoices_to_attention",
+            "send_estimates_to_attention",
+            "sepa_iban",
+            "sepa_iban_account_name",
+            "sepa_bic",
+            "sepa_mandate_id",
+            "sales_invoices_url",
+        ],
+        "",
+    )
+    data.update(
+        {
+            "id": moneybird_id,
+            "version": 1,
+            "lastname": last_name,
+            "country": "NL",
+            "email_ubl": False,
+            "send_invoices_to_email": "",
+            "send_estimates_to_email": "",
+            "sepa_active": False,
+            "sepa_mandate_date": None,
+            "sepa_sequence_type": "RCUR",
+            "tax_number_valid": False,
+        }
+    )
+    return data
+
+
+class FakeAdministration:
+    """Administration that serves fixed resources and records the requests."""
+
+    def __init__(self, resources):
+        self.resources = resources
+        self.requests = []
+
+    def get(self, resource_path, params=None):
+        self.requests.append(("GET", resource_path))
+        return self.resources[resource_path]
+
+    def post(self, resource_path, data):
+        self.requests.append(("POST", resource_path))
+        return [
+            resource
+            for resource in self.resources[resource_path]
+            if resource["id"] in data["ids"]
+        ]
+
+
+class SubscriptionReferencesTest(TestCase):
+    """Test cases for resolving references of subscriptions."""
+
+    def test_contacts_resolved_in_bulk(self):
+        """Test known contacts are loaded at once, and missing ones fetched at once."""
+        known = Contact(moneybird_id=1, last_name="Known")
+        known.save(received_from_moneybird=True)
+        administration = FakeAdministration(
+            {
+                "subscriptions": [
+                    {
+                        "id": str(10 + number),
+                        "reference": f"Huur {number}",
+                        "start_date": "2024-01-01",
+                        "contact_id": contact_id,
+                    }
+                    for number, contact_id in enumerate(["1", "2", "3", "2"])
+                ],
+                "contacts/synchronization": [
+                    contact_data("2", "New"),
+                    contact_data("3", "Other"),
+                ],
+            }
+        )
+
+        MoneybirdSync(administration).sync_naive(SubscriptionResourceType)
+
+        self.assertEqual(
+            administration.requests,
+            [("GET", "subscriptions"), ("POST", "contacts/synchronization")],
+        )
+        self.assertEqual(
+            [
+                subscription.contact.last_name
+                for subscription in Subscription.objects.order_by("moneybird_id")
+            ],
+            ["Known", "New", "Other", "New"],
+        )
+        self.assertEqual(Contact.objects.count(), 3)
@@ -30,7 +30,9 @@ from inventory.models.attachment import Attachment
 from inventory.models.category import Category, Size
 from inventory.models.collection import Collection
 from inventory.models.location import Location
+from inventory.models.status_change import annotate_current_status
 from inventory.models.status_type import StatusType
+from inventory.services import save_property_values
 from website.admin import AutocompleteFilterMixin
 
 
@@ -210,6 +212,38 @@ class AssetAdmin(
         AssetPropertyValueInline,
     ]
 
+    def get_queryset(self, request):
+        return annotate_current_status(super().get_queryset(request))
+
+    def save_formset(self, request, form, formset, change):
+        if formset.model is not AssetPropertyValue:
+            return super().save_formset(request, form, formset, change)
+
+        # Write the property values in bulk instead of saving each form
+        removed_ids = [
+            inline_form.initial["property"]
+            for inline_form in formset.initial_forms
+            if inline_form in formset.deleted_forms
+            or "property" in inline_form.changed_data
+        ]
+        values = {
+            asset_property: ""
+            for asset_property in AssetProperty.objects.filter(pk__in=removed_ids)
+        }
+        for inline_form in formset.forms:
+            if inline_form in formset.deleted_forms or not inline_form.has_changed():
+                continue
+            values[inline_form.cleaned_data["property"]] = inline_form.cleaned_data[
+                "value"
+            ]
+
+        created, updated, deleted = save_property_values(form.instance, values)
+        formset.new_objects = created
+        formset.changed_objects = [
+            (property_value, ["value"]) for property_value in updated
+        ]
+        formset.deleted_objects = deleted
+
     @admin.display(
         description=_("status"),
     )
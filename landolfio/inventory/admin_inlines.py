@@ -20,7 +20,7 @@ class AttachmentInlineAdmin(admin.StackedInline):
         # pylint: disable=no-self-use
         """Show a file as an image if it is one."""
         if is_an_image_path(obj.attachment.name):
-            return mark_safe(f'<img src="{obj.attachment.url}" height="600px"/>')
+            return mark_safe(f'<img src="{obj.medium_url}" height="600px"/>')
         return _("Not an image")
 
     show_image.short_description = _("Image")
@@ -0,0 +1,83 @@
+from collections import deque
+
+# Characters that separate an asset name from the surrounding text
+NAME_DELIMITERS = frozenset(" ,:;.\n-\t\r[]()")
+
+
+class AssetNameMatcher:
+    """
+    Aho-Corasick automaton that finds asset names in free text.
+
+    A text is scanned once, however many names there are. Names are only found
+    as a whole word, delimited by NAME_DELIMITERS or the ends of the text, so
+    "V1" is not found in "V11". A name may contain delimiters itself, such as
+    "V-11" or "Cello 4/4 (2)".
+    """
+
+    def __init__(self, names=(), version=None):
+        self.version = version
+        # Per state: the transitions, the failure state and the names ending there
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        self._size = 0
+
+        for name in names:
+            if name:
+                self._add(name)
+        self._link()
+
+    def __len__(self):
+        return self._size
+
+    def _add(self, name):
+        state = 0
+        for character in name:
+            next_state = self._goto[state].get(character)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][character] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        if name not in self._output[state]:
+            self._output[state] += (name,)
+            self._size += 1
+
+    def _link(self):
+        # Breadth-first, so the failure state of a state is always linked first
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and character not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(character, 0)
+                self._fail[next_state] = fail
+                self._output[next_state] += self._output[fail]
+
+    def find(self, text):
+        """Return the set of names that occur as a whole word in the text."""
+        found = set()
+        if not text:
+            return found
+
+        goto, fail, output = self._goto, self._fail, self._output
+        last = len(text) - 1
+        state = 0
+        for index, character in enumerate(text):
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+            if not output[state]:
+                continue
+            if index < last and text[index + 1] not in NAME_DELIMITERS:
+                continue
+            for name in output[state]:
+                start = index + 1 - len(name)
+                if start == 0 or text[start - 1] in NAME_DELIMITERS:
+                    found.add(name)
+        return found
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from inventory.models.attachment import Attachment
+from inventory.renditions import is_image_name, update_attachment_renditions
+from inventory.tasks import generate_attachment_renditions
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnail and WebP renditions for existing image attachments"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate renditions that already exist",
+        )
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Queue background tasks instead of generating inline",
+        )
+
+    def handle(self, *args, **options):
+        attachments = Attachment.objects.order_by("pk")
+        if not options["all"]:
+            attachments = attachments.filter(renditions={})
+
+        processed = 0
+        skipped = 0
+        for attachment in attachments.iterator(chunk_size=200):
+            if not is_image_name(attachment.attachment.name):
+                skipped += 1
+                continue
+
+            if options["enqueue"]:
+                generate_attachment_renditions.enqueue(attachment_id=attachment.pk)
+            elif not update_attachment_renditions(attachment):
+                self.stdout.write(
+                    self.style.WARNING(f"Could not process {attachment.attachment}")
+                )
+                continue
+
+            processed += 1
+            if processed % 100 == 0:
+                self.stdout.write(f"Processed {processed} attachments...")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {processed} attachments, skipped {skipped} non-images."
+            )
+        )
@@ -1,13 +1,50 @@
+import time
+
 from django.core.management.base import BaseCommand
 
-from inventory.services import relink_document_lines_to_assets
+from inventory.services import RELINK_CHUNK_SIZE, relink_tickets_to_assets
 
 
 class Command(BaseCommand):
-    help = "Relink all document lines to assets"
+    help = "Relink all tickets to the assets named in their description"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            help="Only relink tickets with a higher id, to resume an earlier run",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Also relink tickets that are linked to assets already",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=RELINK_CHUNK_SIZE,
+            help="Number of tickets to read and link at once",
+        )
 
     def handle(self, *args, **options):
-        relink_document_lines_to_assets()
+        start = time.monotonic()
+
+        def progress(stats):
+            rate = stats["tickets"] / max(time.monotonic() - start, 0.001)
+            self.stdout.write(
+                f"Processed {stats['tickets']} tickets ({rate:.0f}/s), "
+                f"{stats['links']} links, last id {stats['last_id']}"
+            )
+
+        stats = relink_tickets_to_assets(
+            start_after=options["start_after"],
+            include_linked=options["all"],
+            chunk_size=options["chunk_size"],
+            progress=progress,
+        )
         self.stdout.write(
-            self.style.SUCCESS(f"Successfully relinked document lines to assets.")
+            self.style.SUCCESS(
+                f"Successfully relinked {stats['tickets']} tickets to assets "
+                f"with {stats['links']} links in {time.monotonic() - start:.1f}s."
+            )
         )
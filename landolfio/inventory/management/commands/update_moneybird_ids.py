@@ -27,8 +27,7 @@ class Command(BaseCommand):
             return True
         return False
 
-    def _sync_with_retry(self, asset):
-        mb = MoneybirdAssetService()
+    def _sync_with_retry(self, mb, asset):
         while True:
             try:
                 mb.update_asset(asset_id=asset.moneybird_asset_id, name=str(asset))
@@ -59,39 +58,52 @@ class Command(BaseCommand):
         not_found_count = 0
         skipped_count = 0
 
+        moneybird_ids = {}
         for asset_name, asset_data in data.items():
             moneybird_id = asset_data.get("moneybird_id")
-
             if not moneybird_id:
                 self.stdout.write(
                     self.style.WARNING(f"Skipping {asset_name}: no moneybird_id")
                 )
                 skipped_count += 1
                 continue
+            moneybird_ids[asset_name] = int(moneybird_id)
 
-            try:
-                asset = Asset.objects.get(name=asset_name)
-                asset.moneybird_asset_id = int(moneybird_id)
-                asset.save(update_fields=["moneybird_asset_id"])
+        # Look up and update all assets at once, only syncing with Moneybird is
+        # done per asset
+        assets = {
+            asset.name: asset
+            for asset in Asset.objects.filter(name__in=moneybird_ids).select_related(
+                "category", "size"
+            )
+        }
+        for asset_name, moneybird_id in moneybird_ids.items():
+            if asset_name in assets:
+                assets[asset_name].moneybird_asset_id = moneybird_id
+            else:
+                self.stdout.write(self.style.ERROR(f"Asset not found: {asset_name}"))
+                not_found_count += 1
+        Asset.objects.bulk_update(
+            assets.values(), ["moneybird_asset_id"], batch_size=500
+        )
 
-                try:
-                    self._sync_with_retry(asset)
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f"Updated {asset_name}: {moneybird_id}, synced name to Moneybird, and refreshed data"
-                        )
+        mb = MoneybirdAssetService()
+        for asset_name, asset in assets.items():
+            moneybird_id = asset.moneybird_asset_id
+            try:
+                self._sync_with_retry(mb, asset)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Updated {asset_name}: {moneybird_id}, synced name to Moneybird, and refreshed data"
                     )
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f"Updated {asset_name}: {moneybird_id} but failed to sync: {e}"
-                        )
+                )
+            except Exception as e:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Updated {asset_name}: {moneybird_id} but failed to sync: {e}"
                     )
-
-                updated_count += 1
-            except Asset.DoesNotExist:
-                self.stdout.write(self.style.ERROR(f"Asset not found: {asset_name}"))
-                not_found_count += 1
+                )
+            updated_count += 1
 
         self.stdout.write(
             self.style.SUCCESS(
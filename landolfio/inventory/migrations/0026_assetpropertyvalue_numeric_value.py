@@ -0,0 +1,56 @@
+# Generated by Django 6.1.2 on 2026-10-19 11:22
+
+from decimal import Decimal, InvalidOperation
+
+from django.db import migrations, models
+
+
+def populate_numeric_values(apps, schema_editor):
+    """Copy numeric property values into the typed numeric column."""
+    AssetPropertyValue = apps.get_model("inventory", "AssetPropertyValue")
+
+    updated = []
+    for property_value in AssetPropertyValue.objects.filter(
+        property__property_type="number"
+    ).iterator(chunk_size=1000):
+        try:
+            number = Decimal(property_value.value.strip()).quantize(Decimal("0.000001"))
+        except InvalidOperation:
+            continue
+        if not number.is_finite() or number.adjusted() >= 14:
+            continue
+        property_value.numeric_value = number
+        updated.append(property_value)
+
+    AssetPropertyValue.objects.bulk_update(updated, ["numeric_value"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0025_alter_assetonjournaldocumentline_unique_together_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assetpropertyvalue",
+            name="numeric_value",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=6,
+                editable=False,
+                help_text="Typed copy of the value for numeric properties, used for filtering",
+                max_digits=20,
+                null=True,
+                verbose_name="numeric value",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="assetpropertyvalue",
+            index=models.Index(
+                fields=["property", "numeric_value"],
+                name="inventory_a_propert_28c0e9_idx",
+            ),
+        ),
+        migrations.RunPython(populate_numeric_values, migrations.RunPython.noop),
+    ]
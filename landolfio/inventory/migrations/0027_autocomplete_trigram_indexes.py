@@ -0,0 +1,43 @@
+from django.db import migrations
+
+TRIGRAM_INDEXES = [
+    ("inventory_asset_name_trgm", "inventory_asset", "name"),
+    (
+        "inventory_assetpropertyvalue_value_trgm",
+        "inventory_assetpropertyvalue",
+        "value",
+    ),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Create trigram indexes for the autocomplete lookups on PostgreSQL."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, table, column in TRIGRAM_INDEXES:
+        # Django's icontains/istartswith compare UPPER(column::text)
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} "
+            f"USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for index_name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0026_assetpropertyvalue_numeric_value"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
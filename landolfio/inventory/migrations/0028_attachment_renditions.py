@@ -0,0 +1,24 @@
+# Generated by Django 6.1.2 on 2026-10-19 11:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0027_autocomplete_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attachment",
+            name="renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Storage names of the resized versions of this image",
+                verbose_name="renditions",
+            ),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 6.1.2 on 2026-10-19 11:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0028_attachment_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttachmentUpload",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, verbose_name="storage name")),
+                (
+                    "order",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Order the attachment gets, reserved when the upload is queued",
+                        verbose_name="order",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "pending"),
+                            ("processing", "processing"),
+                            ("done", "done"),
+                            ("failed", "failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="status",
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="error")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="updated at"),
+                ),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attachment_uploads",
+                        to="inventory.asset",
+                        verbose_name="asset",
+                    ),
+                ),
+                (
+                    "attachment",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="upload",
+                        to="inventory.attachment",
+                        verbose_name="attachment",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "attachment upload",
+                "verbose_name_plural": "attachment uploads",
+                "ordering": ["created_at", "order"],
+                "indexes": [
+                    models.Index(
+                        fields=["asset", "status"],
+                        name="inventory_a_asset_i_93c8ee_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.1.2 on 2026-10-19 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0029_attachment_uploads"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="moneybird_data_refreshed_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="When the Moneybird data was last fetched or pushed by a webhook",
+                null=True,
+                verbose_name="Moneybird data refreshed at",
+            ),
+        ),
+    ]
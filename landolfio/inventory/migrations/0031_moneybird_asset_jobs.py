@@ -0,0 +1,105 @@
+# Generated by Django 6.1.2 on 2026-10-19 11:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0030_asset_moneybird_data_refreshed_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MoneybirdAssetJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("create", "create on Moneybird"),
+                            ("link", "link to Moneybird"),
+                            ("refresh", "refresh from Moneybird"),
+                            ("update", "update on Moneybird"),
+                            ("dispose", "dispose on Moneybird"),
+                        ],
+                        max_length=20,
+                        verbose_name="action",
+                    ),
+                ),
+                (
+                    "idempotency_key",
+                    models.CharField(
+                        help_text="Submitting the same action with the same key again does not queue it twice",
+                        max_length=64,
+                        verbose_name="idempotency key",
+                    ),
+                ),
+                (
+                    "parameters",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="parameters"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "pending"),
+                            ("running", "running"),
+                            ("done", "done"),
+                            ("failed", "failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="status",
+                    ),
+                ),
+                ("message", models.TextField(blank=True, verbose_name="message")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="updated at"),
+                ),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="moneybird_jobs",
+                        to="inventory.asset",
+                        verbose_name="asset",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Moneybird asset job",
+                "verbose_name_plural": "Moneybird asset jobs",
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["asset", "status"],
+                        name="inventory_m_asset_i_dc2ca8_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("asset", "action", "idempotency_key"),
+                        name="unique_moneybird_asset_job",
+                    )
+                ],
+            },
+        ),
+    ]
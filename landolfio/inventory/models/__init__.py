@@ -2,9 +2,15 @@ from .asset import Asset, AssetStates
 from .asset_on_document_line import AssetSubscription
 from .asset_property import AssetProperty, AssetPropertyType, AssetPropertyValue
 from .attachment import Attachment
+from .attachment_upload import AttachmentUpload, AttachmentUploadStates
 from .category import Category
 from .collection import Collection
 from .location import Location
+from .moneybird_asset_job import (
+    MoneybirdAssetActions,
+    MoneybirdAssetJob,
+    MoneybirdAssetJobStates,
+)
 from .remarks import Remark
 from .status_change import StatusChange
 from .status_type import StatusType
@@ -17,9 +23,14 @@ __all__ = [
     "AssetPropertyValue",
     "AssetPropertyType",
     "Attachment",
+    "AttachmentUpload",
+    "AttachmentUploadStates",
     "Category",
     "Collection",
     "Location",
+    "MoneybirdAssetActions",
+    "MoneybirdAssetJob",
+    "MoneybirdAssetJobStates",
     "Remark",
     "StatusChange",
     "StatusType",
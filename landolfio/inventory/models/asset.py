@@ -1,12 +1,14 @@
 import logging
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
 from django.db.models import PROTECT, Count
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
@@ -49,6 +51,28 @@ class AssetStates(models.TextChoices):
     SOLD = "sold", _("sold")
 
 
+# Seconds before a scheduled Moneybird refresh of an asset may be scheduled again
+MONEYBIRD_REFRESH_LOCK_TIMEOUT = 60
+
+# Statuses in which an asset is in house, so it can have a location
+LOCATION_STATUSES = (
+    AssetStates.AVAILABLE,
+    AssetStates.UNDER_REVIEW,
+    AssetStates.MAINTENANCE_IN_HOUSE,
+)
+
+# Fields that are derived from the Moneybird data of an asset
+MONEYBIRD_DATA_FIELDS = [
+    "moneybird_data",
+    "moneybird_data_refreshed_at",
+    "start_date",
+    "purchase_value_asset",
+    "is_margin_asset",
+    "disposal",
+    "current_value",
+]
+
+
 class AccountingStates(models.TextChoices):
     UNKNOWN = "unknown", _("unknown")  # does not occur in the accounting system
     AVAILABLE = "available", _("available")  # purchased, not amortized, not sold
@@ -140,6 +164,13 @@ class Asset(models.Model):
         blank=True,
         help_text=_("Cached data from Moneybird API"),
     )
+    moneybird_data_refreshed_at = models.DateTimeField(
+        verbose_name=_("Moneybird data refreshed at"),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("When the Moneybird data was last fetched or pushed by a webhook"),
+    )
     start_date = models.DateField(
         verbose_name=_("start date"),
         null=True,
@@ -184,6 +215,12 @@ class Asset(models.Model):
     def current_status(self):
         """Get the current status from the latest StatusChange with a non-null new_status."""
         if not hasattr(self, "_current_status_cache"):
+            if hasattr(self, "latest_status_from_changes"):
+                # Annotated by inventory.models.status_change.annotate_current_status
+                self._current_status_cache = (
+                    self.latest_status_from_changes or self.local_status
+                )
+                return self._current_status_cache
             try:
                 # Find the most recent status change that actually changed the status
                 latest_change = (
@@ -199,6 +236,15 @@ class Asset(models.Model):
                 self._current_status_cache = self.local_status
         return self._current_status_cache
 
+    def clear_status_cache(self):
+        """Forget the cached current and financial status of this asset."""
+        for attribute in (
+            "_current_status_cache",
+            "_financial_status_cache",
+            "latest_status_from_changes",
+        ):
+            self.__dict__.pop(attribute, None)
+
     @property
     def current_status_display(self):
         """Get the display name for the current status."""
@@ -238,32 +284,29 @@ class Asset(models.Model):
     @property
     def financial_status(self):
         """Get the financial status for badge display."""
+        if not hasattr(self, "_financial_status_cache"):
+            self._financial_status_cache = self._get_financial_status()
+        return self._financial_status_cache
+
+    def _get_financial_status(self):
         # Determine base status first
         base_status = None
         base_color = None
 
         # If there's a disposal, use disposal-based status
         if self.disposal:
-            if self.disposal == "out_of_use":
-                from inventory.models.status_type import StatusType
-
-                try:
-                    status_type = StatusType.objects.get(slug="out_of_use")
-                    base_status = status_type.name
-                    base_color = status_type.background_color
-                except StatusType.DoesNotExist:
-                    base_status = str(_("out of use"))
-                    base_color = "dark"
+            from inventory.models.status_type import get_status_types
+
+            status_type = get_status_types().get(self.disposal)
+            if status_type is not None:
+                base_status = status_type.name
+                base_color = status_type.background_color
+            elif self.disposal == "out_of_use":
+                base_status = str(_("out of use"))
+                base_color = "dark"
             elif self.disposal == "divested":
-                from inventory.models.status_type import StatusType
-
-                try:
-                    status_type = StatusType.objects.get(slug="divested")
-                    base_status = status_type.name
-                    base_color = status_type.background_color
-                except StatusType.DoesNotExist:
-                    base_status = str(_("divested"))
-                    base_color = "secondary"
+                base_status = str(_("divested"))
+                base_color = "secondary"
         else:
             # No disposal, check current value
             current_val = self.current_value or 0
@@ -276,25 +319,12 @@ class Asset(models.Model):
                 base_status = str(_("active"))
                 base_color = "success"
 
-        # Check for status mismatch with local status
-        has_mismatch = False
-        if self.moneybird_asset_id:  # Only check if financially linked
-            current = self.current_status
-            if current == "amortized" and self.disposal != "out_of_use":
-                has_mismatch = True
-            elif current == "sold" and self.disposal != "divested":
-                has_mismatch = True
-            elif self.disposal == "out_of_use" and current != "amortized":
-                has_mismatch = True
-            elif self.disposal == "divested" and current != "sold":
-                has_mismatch = True
-
         # Append unlink icon if financially unlinked (no sources)
         if self.is_financially_unlinked:
             base_status += ' <i class="fa-solid fa-link-slash fa-xs"></i>'
 
         # Append warning symbol if there's a status mismatch
-        if has_mismatch:
+        if self.has_status_warning:
             base_status += ' <i class="fa-solid fa-triangle-exclamation fa-xs"></i>'
 
         return {"status": base_status, "color": base_color}
@@ -374,21 +404,27 @@ class Asset(models.Model):
         size_str = f" ({self.size})" if self.size else ""
         return f"{category_name} {self.name}{size_str}"
 
-    def save(self, *args, **kwargs):
-        """Override save to ensure non-commerce assets are always margin assets and clear location if status doesn't allow it."""
+    def update_derived_fields(self):
+        """Ensure non-commerce assets are margin assets and clear the location if the status doesn't allow it."""
         if self.collection and not self.collection.commerce:
             self.is_margin_asset = True
 
-        if self.current_status not in [
-            AssetStates.AVAILABLE,
-            AssetStates.UNDER_REVIEW,
-            AssetStates.MAINTENANCE_IN_HOUSE,
-        ]:
+        if self.current_status not in LOCATION_STATUSES:
             self.location = None
             self.location_nr = None
 
+    def save(self, *args, **kwargs):
+        """Override save to update the derived fields before saving."""
+        self.update_derived_fields()
+
+        # Disposal or value may have changed, so recompute the financial status
+        self.__dict__.pop("_financial_status_cache", None)
         super().save(*args, **kwargs)
 
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.clear_status_cache()
+
     def get_asset_ledger_account_id(self):
         """Get the appropriate ledger account ID based on margin status."""
         if self.is_margin_asset:
@@ -396,6 +432,36 @@ class Asset(models.Model):
         else:
             return settings.MONEYBIRD_NOT_MARGIN_ASSETS_LEDGER_ACCOUNT_ID
 
+    @property
+    def moneybird_data_is_stale(self):
+        """Whether the Moneybird data of a linked asset is older than the TTL."""
+        if not self.moneybird_asset_id:
+            return False
+        if self.moneybird_data_refreshed_at is None:
+            return True
+        age = timezone.now() - self.moneybird_data_refreshed_at
+        return age > timedelta(seconds=settings.MONEYBIRD_DATA_TTL)
+
+    def schedule_moneybird_refresh(self):
+        """
+        Refresh the Moneybird data in the background.
+
+        Returns false when a refresh of this asset was already scheduled recently,
+        so that repeated page views do not queue the same refresh many times.
+        """
+        from inventory.tasks import refresh_asset_from_moneybird
+
+        if not cache.add(
+            f"inventory:moneybird_refresh:{self.pk}",
+            True,
+            MONEYBIRD_REFRESH_LOCK_TIMEOUT,
+        ):
+            return False
+        transaction.on_commit(
+            lambda: refresh_asset_from_moneybird.enqueue(asset_id=str(self.pk))
+        )
+        return True
+
     def refresh_from_moneybird(self):
         """Refresh asset data from Moneybird API if moneybird_asset_id is set."""
         if not self.moneybird_asset_id:
@@ -437,7 +503,14 @@ class Asset(models.Model):
 
     def _refresh_from_moneybird(self, moneybird_data=None):
         """Refresh asset data with Moneybird API data."""
+        self.apply_moneybird_data(moneybird_data)
+        self.save(update_fields=MONEYBIRD_DATA_FIELDS)
+        return moneybird_data
+
+    def apply_moneybird_data(self, moneybird_data):
+        """Set the fields in MONEYBIRD_DATA_FIELDS from Moneybird data, without saving."""
         self.moneybird_data = moneybird_data
+        self.moneybird_data_refreshed_at = timezone.now()
 
         if "purchase_date" in moneybird_data:
             self.start_date = datetime.strptime(
@@ -471,18 +544,6 @@ class Asset(models.Model):
             # No disposal data means asset is still active
             self.disposal = None
 
-        self.save(
-            update_fields=[
-                "moneybird_data",
-                "start_date",
-                "purchase_value_asset",
-                "is_margin_asset",
-                "disposal",
-                "current_value",
-            ]
-        )
-        return moneybird_data
-
     def create_on_moneybird(self):
         """Create a new asset on Moneybird and store the returned asset ID."""
 
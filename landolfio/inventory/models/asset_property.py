@@ -1,10 +1,70 @@
 import json
+from decimal import Decimal, InvalidOperation
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
+NUMERIC_VALUE_MAX_DIGITS = 20
+NUMERIC_VALUE_DECIMAL_PLACES = 6
+
+ASSET_PROPERTIES_CACHE_KEY = "inventory:asset_properties"
+ASSET_PROPERTIES_CACHE_TIMEOUT = 60 * 60
+
+
+def parse_numeric_value(value):
+    """Parse a property value into a Decimal for the numeric column, or None."""
+    try:
+        number = Decimal(str(value).strip())
+        if not number.is_finite():
+            return None
+        number = number.quantize(Decimal(1).scaleb(-NUMERIC_VALUE_DECIMAL_PLACES))
+    except (InvalidOperation, TypeError):
+        return None
+    if number.adjusted() >= NUMERIC_VALUE_MAX_DIGITS - NUMERIC_VALUE_DECIMAL_PLACES:
+        return None
+    return number
+
+
+def get_asset_properties():
+    """
+    Return all property definitions in display order, with their category ids.
+
+    The result is shared through the cache and cleared when a property or its
+    categories change (see inventory.signals).
+    """
+    properties = cache.get(ASSET_PROPERTIES_CACHE_KEY)
+    if properties is None:
+        properties = list(
+            AssetProperty.objects.prefetch_related("categories").order_by(
+                "order", "name"
+            )
+        )
+        for asset_property in properties:
+            asset_property.category_ids = {
+                category.pk for category in asset_property.categories.all()
+            }
+        cache.set(
+            ASSET_PROPERTIES_CACHE_KEY, properties, ASSET_PROPERTIES_CACHE_TIMEOUT
+        )
+    return properties
+
+
+def get_category_properties(category_id):
+    """Return the property definitions of a category in display order."""
+    return [
+        asset_property
+        for asset_property in get_asset_properties()
+        if category_id in asset_property.category_ids
+    ]
+
+
+def clear_asset_properties_cache():
+    """Clear the cached property definitions."""
+    cache.delete(ASSET_PROPERTIES_CACHE_KEY)
+
 
 class AssetPropertyType(models.TextChoices):
     STRING = "string", _("String")
@@ -66,6 +126,10 @@ class AssetProperty(models.Model):
         verbose_name_plural = _("asset properties")
         ordering = ["name", "order"]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._orig_property_type = self.__dict__.get("property_type")
+
     def __str__(self):
         category_names = ", ".join([cat.name for cat in self.categories.all()[:3]])
         if self.categories.count() > 3:
@@ -126,8 +190,23 @@ class AssetProperty(models.Model):
         if not self.slug:
             self.slug = self._generate_slug()
 
+        type_changed = self.pk and self.property_type != self._orig_property_type
         self.full_clean()
         super().save(*args, **kwargs)
+        self._orig_property_type = self.property_type
+
+        if type_changed:
+            self.update_numeric_values()
+
+    def update_numeric_values(self):
+        """Recompute the numeric column of the values of this property."""
+        values = list(self.values.all())
+        for value in values:
+            value.property = self
+            value.numeric_value = value.get_numeric_value()
+        AssetPropertyValue.objects.bulk_update(
+            values, ["numeric_value"], batch_size=1000
+        )
 
 
 class AssetPropertyValue(models.Model):
@@ -151,11 +230,25 @@ class AssetPropertyValue(models.Model):
         verbose_name=_("value"),
         help_text=_("The value of this property for this asset"),
     )
+    numeric_value = models.DecimalField(
+        max_digits=NUMERIC_VALUE_MAX_DIGITS,
+        decimal_places=NUMERIC_VALUE_DECIMAL_PLACES,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("numeric value"),
+        help_text=_(
+            "Typed copy of the value for numeric properties, used for filtering"
+        ),
+    )
 
     class Meta:
         verbose_name = _("asset property value")
         verbose_name_plural = _("asset property values")
         unique_together = [("asset", "property")]
+        indexes = [
+            models.Index(fields=["property", "numeric_value"]),
+        ]
 
     def __str__(self):
         return f"{self.asset.name} - {self.property.name}: {self.value}"
@@ -169,7 +262,10 @@ class AssetPropertyValue(models.Model):
                 {"property": _("Property must apply to the asset's category")}
             )
 
-        # Validate value based on property type
+        self.clean_value()
+
+    def clean_value(self):
+        """Validate the value based on the property type, without queries."""
         if self.property.property_type == AssetPropertyType.NUMBER:
             try:
                 float(self.value)
@@ -177,6 +273,10 @@ class AssetPropertyValue(models.Model):
                 raise ValidationError(
                     {"value": _("Value must be a valid number for numeric properties")}
                 )
+            if parse_numeric_value(self.value) is None:
+                raise ValidationError(
+                    {"value": _("Value is out of range for numeric properties")}
+                )
 
         elif self.property.property_type == AssetPropertyType.DROPDOWN:
             options = self.property.get_dropdown_options()
@@ -189,7 +289,14 @@ class AssetPropertyValue(models.Model):
                     }
                 )
 
+    def get_numeric_value(self):
+        """Return the value to store in the numeric column."""
+        if self.property.property_type == AssetPropertyType.NUMBER:
+            return parse_numeric_value(self.value)
+        return None
+
     def save(self, *args, **kwargs):
+        self.numeric_value = self.get_numeric_value()
         self.full_clean()
         super().save(*args, **kwargs)
 
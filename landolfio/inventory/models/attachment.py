@@ -1,15 +1,16 @@
 import os
 
 import shortuuid
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from inventory.models.asset import Asset
+from inventory.renditions import delete_renditions, is_image_name
 
 
 def attachments_directory_path(instance, filename):
-    filename, extension = filename.split(".")
-    return f"inventory/attachments/{instance.asset.id}/{instance.asset.name}-{filename}-{shortuuid.random(length=8)}.{extension}"
+    filename, extension = os.path.splitext(filename)
+    return f"inventory/attachments/{instance.asset.id}/{instance.asset.name}-{filename}-{shortuuid.random(length=8)}{extension}"
 
 
 class Attachment(models.Model):
@@ -32,6 +33,13 @@ class Attachment(models.Model):
         verbose_name=_("order"),
         help_text=_("Order in which attachments are displayed"),
     )
+    renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name=_("renditions"),
+        help_text=_("Storage names of the resized versions of this image"),
+    )
 
     def __str__(self):
         return f"{self.attachment} {_('from')} {self.asset}"
@@ -40,6 +48,33 @@ class Attachment(models.Model):
     def filename(self):
         return os.path.basename(self.attachment.name)
 
+    @property
+    def is_image(self):
+        return is_image_name(self.attachment.name)
+
+    def get_rendition_url(self, key, fallback=True):
+        """Return the URL of a rendition, or of the original if it is missing."""
+        name = self.renditions.get(key)
+        if name:
+            return self.attachment.storage.url(name)
+        return self.attachment.url if fallback else None
+
+    @property
+    def thumbnail_url(self):
+        return self.get_rendition_url("thumbnail")
+
+    @property
+    def thumbnail_webp_url(self):
+        return self.get_rendition_url("thumbnail_webp", fallback=False)
+
+    @property
+    def medium_url(self):
+        return self.get_rendition_url("medium")
+
+    @property
+    def medium_webp_url(self):
+        return self.get_rendition_url("medium_webp", fallback=False)
+
     class Meta:
         verbose_name = _("attachment")
         verbose_name_plural = _("attachments")
@@ -55,12 +90,29 @@ class Attachment(models.Model):
     def delete(self, using=None, keep_parents=False):
         if self.attachment.name:
             self.attachment.storage.delete(self.attachment.name)
+        delete_renditions(self.attachment.storage, self.renditions)
         return super().delete(using, keep_parents)
 
     def save(self, **kwargs):
+        file_changed = self.attachment.name != self._orig_image
+        if file_changed and self.renditions:
+            delete_renditions(self.attachment.storage, self.renditions)
+            self.renditions = {}
+
         super().save(**kwargs)
         storage = self.attachment.storage
 
         if self._orig_image and self._orig_image != self.attachment.name:
             storage.delete(self._orig_image)
-            self._orig_image = None
+        self._orig_image = self.attachment.name
+
+        if file_changed and self.is_image:
+            self.schedule_renditions()
+
+    def schedule_renditions(self):
+        """Generate the renditions in the background once the upload is committed."""
+        from inventory.tasks import generate_attachment_renditions
+
+        transaction.on_commit(
+            lambda: generate_attachment_renditions.enqueue(attachment_id=self.pk)
+        )
@@ -0,0 +1,75 @@
+import os
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class AttachmentUploadStates(models.TextChoices):
+    PENDING = "pending", _("pending")
+    PROCESSING = "processing", _("processing")
+    DONE = "done", _("done")
+    FAILED = "failed", _("failed")
+
+
+class AttachmentUpload(models.Model):
+    """A file uploaded to storage that is being turned into an attachment."""
+
+    asset = models.ForeignKey(
+        "Asset",
+        on_delete=models.CASCADE,
+        related_name="attachment_uploads",
+        verbose_name=_("asset"),
+    )
+    name = models.CharField(
+        max_length=255,
+        verbose_name=_("storage name"),
+    )
+    order = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("order"),
+        help_text=_("Order the attachment gets, reserved when the upload is queued"),
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=AttachmentUploadStates.choices,
+        default=AttachmentUploadStates.PENDING,
+        verbose_name=_("status"),
+    )
+    error = models.TextField(blank=True, verbose_name=_("error"))
+    attachment = models.OneToOneField(
+        "Attachment",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="upload",
+        verbose_name=_("attachment"),
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("created at"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("updated at"))
+
+    class Meta:
+        ordering = ["created_at", "order"]
+        verbose_name = _("attachment upload")
+        verbose_name_plural = _("attachment uploads")
+        indexes = [
+            models.Index(fields=["asset", "status"]),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.get_status_display()})"
+
+    @property
+    def filename(self):
+        return os.path.basename(self.name)
+
+    @property
+    def is_finished(self):
+        return self.status in (
+            AttachmentUploadStates.DONE,
+            AttachmentUploadStates.FAILED,
+        )
+
+    def set_status(self, status, error=""):
+        self.status = status
+        self.error = error
+        self.save(update_fields=["status", "error", "updated_at"])
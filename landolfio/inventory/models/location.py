@@ -1,7 +1,56 @@
+from django.core.cache import cache
 from django.db import models
 from django.db.models import PROTECT, SET_NULL
 from django.utils.translation import gettext_lazy as _
 
+LOCATIONS_CACHE_KEY = "inventory:locations"
+LOCATIONS_CACHE_TIMEOUT = 60 * 60
+
+
+def get_locations():
+    """
+    Return all locations sorted hierarchically by their order fields.
+
+    The parent of each location is linked in memory, so rendering the full
+    names does not query the parents. The result is shared through the cache
+    and cleared when a location is saved or deleted (see inventory.signals).
+    """
+    locations = cache.get(LOCATIONS_CACHE_KEY)
+    if locations is None:
+        locations = list(Location.objects.all())
+        location_dict = {location.id: location for location in locations}
+        for location in locations:
+            if location.parent_id:
+                location.parent = location_dict.get(location.parent_id)
+
+        # Get ancestry chain order values for sorting
+        def get_order_chain(location):
+            """Returns tuple of order values from root to this location."""
+            chain = []
+            current = location
+            while current:
+                chain.insert(
+                    0,
+                    (
+                        current.order if current.order is not None else 999999,
+                        current.id,
+                    ),
+                )
+                if current.parent_id and not current.display_as_root:
+                    current = location_dict.get(current.parent_id)
+                else:
+                    break
+            return tuple(chain)
+
+        locations.sort(key=get_order_chain)
+        cache.set(LOCATIONS_CACHE_KEY, locations, LOCATIONS_CACHE_TIMEOUT)
+    return locations
+
+
+def clear_locations_cache():
+    """Clear the cached locations."""
+    cache.delete(LOCATIONS_CACHE_KEY)
+
 
 class Location(models.Model):
     class Meta:
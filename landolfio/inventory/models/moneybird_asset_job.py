@@ -0,0 +1,81 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class MoneybirdAssetActions(models.TextChoices):
+    CREATE = "create", _("create on Moneybird")
+    LINK = "link", _("link to Moneybird")
+    REFRESH = "refresh", _("refresh from Moneybird")
+    UPDATE = "update", _("update on Moneybird")
+    DISPOSE = "dispose", _("dispose on Moneybird")
+
+
+class MoneybirdAssetJobStates(models.TextChoices):
+    PENDING = "pending", _("pending")
+    RUNNING = "running", _("running")
+    DONE = "done", _("done")
+    FAILED = "failed", _("failed")
+
+
+class MoneybirdAssetJob(models.Model):
+    """An action on the Moneybird asset of an asset, run in the background."""
+
+    asset = models.ForeignKey(
+        "Asset",
+        on_delete=models.CASCADE,
+        related_name="moneybird_jobs",
+        verbose_name=_("asset"),
+    )
+    action = models.CharField(
+        max_length=20,
+        choices=MoneybirdAssetActions.choices,
+        verbose_name=_("action"),
+    )
+    idempotency_key = models.CharField(
+        max_length=64,
+        verbose_name=_("idempotency key"),
+        help_text=_(
+            "Submitting the same action with the same key again does not queue it twice"
+        ),
+    )
+    parameters = models.JSONField(
+        default=dict, blank=True, verbose_name=_("parameters")
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=MoneybirdAssetJobStates.choices,
+        default=MoneybirdAssetJobStates.PENDING,
+        verbose_name=_("status"),
+    )
+    message = models.TextField(blank=True, verbose_name=_("message"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("created at"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("updated at"))
+
+    class Meta:
+        ordering = ["created_at"]
+        verbose_name = _("Moneybird asset job")
+        verbose_name_plural = _("Moneybird asset jobs")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["asset", "action", "idempotency_key"],
+                name="unique_moneybird_asset_job",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["asset", "status"]),
+        ]
+
+    def __str__(self):
+        return f"{self.asset.name}: {self.get_action_display()} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (
+            MoneybirdAssetJobStates.DONE,
+            MoneybirdAssetJobStates.FAILED,
+        )
+
+    def set_status(self, status, message=""):
+        self.status = status
+        self.message = message
+        self.save(update_fields=["status", "message", "updated_at"])
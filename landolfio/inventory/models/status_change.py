@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import OuterRef, Subquery
 from django.utils.translation import gettext_lazy as _
 
 from inventory.models.asset import AssetStates
@@ -69,5 +70,25 @@ class StatusChange(models.Model):
         super().save(*args, **kwargs)
 
         # Update the asset's cached current status
-        if hasattr(self.asset, "_current_status_cache"):
-            del self.asset._current_status_cache
+        self.asset.clear_status_cache()
+
+
+def latest_status_subquery():
+    """Subquery selecting the latest status an asset was changed to."""
+    return Subquery(
+        StatusChange.objects.filter(asset=OuterRef("pk"), new_status__isnull=False)
+        .order_by("-status_date", "-created_at")
+        .values("new_status")[:1]
+    )
+
+
+def annotate_current_status(queryset):
+    """
+    Annotate assets with their latest status change.
+
+    Asset.current_status uses this annotation when present, which avoids a
+    query per asset when rendering lists.
+    """
+    if "latest_status_from_changes" in queryset.query.annotations:
+        return queryset
+    return queryset.annotate(latest_status_from_changes=latest_status_subquery())
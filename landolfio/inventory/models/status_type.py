@@ -1,6 +1,32 @@
+from django.core.cache import cache
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+STATUS_TYPES_CACHE_KEY = "inventory:status_types"
+STATUS_TYPES_CACHE_TIMEOUT = 60 * 60
+
+
+def get_status_types():
+    """
+    Return all status types as a dict keyed by slug.
+
+    The result is shared through the cache, so listing pages that render a badge
+    per asset do not query the status types per row. The cache is cleared when a
+    status type is saved or deleted (see inventory.signals).
+    """
+    status_types = cache.get(STATUS_TYPES_CACHE_KEY)
+    if status_types is None:
+        status_types = {
+            status_type.slug: status_type for status_type in StatusType.objects.all()
+        }
+        cache.set(STATUS_TYPES_CACHE_KEY, status_types, STATUS_TYPES_CACHE_TIMEOUT)
+    return status_types
+
+
+def clear_status_types_cache():
+    """Clear the cached status types."""
+    cache.delete(STATUS_TYPES_CACHE_KEY)
+
 
 class StatusType(models.Model):
     """
@@ -0,0 +1,278 @@
+import logging
+from datetime import date, timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from inventory.models.asset import Asset, DisposalReasons
+from inventory.models.moneybird_asset_job import (
+    MoneybirdAssetActions,
+    MoneybirdAssetJob,
+    MoneybirdAssetJobStates,
+)
+
+logger = logging.getLogger(__name__)
+
+# A job that is still running after this long is assumed to be lost, for example
+# because its worker was restarted
+MONEYBIRD_JOB_TIMEOUT = timedelta(minutes=15)
+
+
+class MoneybirdJobError(Exception):
+    """Raised when a Moneybird action cannot be run for an asset."""
+
+
+def clean_job_parameters(asset, action, parameters):
+    """
+    Check that an action can be run for an asset in its current state.
+
+    Returns the parameters the job needs, or raises MoneybirdJobError with a
+    message for the user. The check runs when the job is queued and again
+    right before it runs, as the asset may have changed in between.
+    """
+    if action in (MoneybirdAssetActions.CREATE, MoneybirdAssetActions.LINK):
+        if asset.moneybird_asset_id:
+            raise MoneybirdJobError(
+                f'Asset "{asset.name}" is already linked to Moneybird.'
+            )
+    elif not asset.moneybird_asset_id:
+        raise MoneybirdJobError(f'Asset "{asset.name}" is not linked to Moneybird.')
+
+    if action == MoneybirdAssetActions.CREATE:
+        if not asset.start_date or not asset.purchase_value_asset:
+            raise MoneybirdJobError(
+                f'Asset "{asset.name}" is missing required fields (start date and purchase value) for Moneybird creation.'
+            )
+        return {}
+
+    if action == MoneybirdAssetActions.LINK:
+        try:
+            moneybird_asset_id = int(parameters.get("moneybird_asset_id"))
+        except (TypeError, ValueError):
+            raise MoneybirdJobError(
+                f'Please provide a valid numeric Moneybird Asset ID for "{asset.name}".'
+            )
+        return {"moneybird_asset_id": moneybird_asset_id}
+
+    if action == MoneybirdAssetActions.DISPOSE:
+        if asset.is_disposed:
+            raise MoneybirdJobError(f'Asset "{asset.name}" is already disposed.')
+        disposal_reason = parameters.get("disposal_reason")
+        if disposal_reason not in (
+            DisposalReasons.OUT_OF_USE,
+            DisposalReasons.DIVESTED,
+        ):
+            raise MoneybirdJobError("Invalid disposal reason.")
+        try:
+            disposal_date = date.fromisoformat(parameters.get("disposal_date") or "")
+        except ValueError:
+            raise MoneybirdJobError("Disposal date is required.")
+        return {
+            "disposal_reason": disposal_reason,
+            "disposal_date": disposal_date.isoformat(),
+        }
+
+    if action not in MoneybirdAssetActions.values:
+        raise MoneybirdJobError(f"Unknown Moneybird action {action}.")
+    return {}
+
+
+def queue_moneybird_jobs(
+    assets, action, idempotency_key, parameters=None, asset_parameters=None
+):
+    """
+    Queue a Moneybird action for many assets at once.
+
+    parameters are passed to the job of every asset, asset_parameters maps asset
+    ids to parameters for that asset only (such as the Moneybird asset to link).
+    Submitting the same action with the same idempotency key again returns the
+    jobs that were queued the first time instead of queueing new ones. New jobs
+    are created with one bulk insert and enqueued once the transaction commits.
+    Returns the jobs and a list of error messages for assets that were skipped.
+    """
+    from inventory.tasks import run_moneybird_asset_job
+
+    parameters = parameters or {}
+    asset_parameters = asset_parameters or {}
+    assets = list(assets)
+
+    existing = {
+        job.asset_id: job
+        for job in MoneybirdAssetJob.objects.filter(
+            asset__in=assets, action=action, idempotency_key=idempotency_key
+        )
+    }
+
+    errors = []
+    new_jobs = []
+    for asset in assets:
+        if asset.pk in existing:
+            continue
+        try:
+            job_parameters = clean_job_parameters(
+                asset, action, {**parameters, **asset_parameters.get(asset.pk, {})}
+            )
+        except MoneybirdJobError as e:
+            errors.append(str(e))
+            continue
+        new_jobs.append(
+            MoneybirdAssetJob(
+                asset=asset,
+                action=action,
+                idempotency_key=idempotency_key,
+                parameters=job_parameters,
+            )
+        )
+
+    if action == MoneybirdAssetActions.LINK:
+        new_jobs, link_errors = _exclude_linked_moneybird_assets(new_jobs)
+        errors.extend(link_errors)
+
+    if new_jobs:
+        try:
+            with transaction.atomic():
+                new_jobs = MoneybirdAssetJob.objects.bulk_create(new_jobs)
+                for job in new_jobs:
+                    transaction.on_commit(
+                        lambda job_id=job.pk: run_moneybird_asset_job.enqueue(
+                            job_id=job_id
+                        )
+                    )
+        except IntegrityError:
+            # The same submission was queued concurrently, use those jobs
+            new_jobs = list(
+                MoneybirdAssetJob.objects.filter(
+                    asset__in=[job.asset for job in new_jobs],
+                    action=action,
+                    idempotency_key=idempotency_key,
+                )
+            )
+
+    jobs = list(existing.values()) + new_jobs
+    return jobs, errors
+
+
+def _exclude_linked_moneybird_assets(jobs):
+    """Skip link jobs for Moneybird assets that are linked already, with one query."""
+    linked = dict(
+        Asset.objects.filter(
+            moneybird_asset_id__in=[
+                job.parameters["moneybird_asset_id"] for job in jobs
+            ]
+        ).values_list("moneybird_asset_id", "name")
+    )
+    errors = []
+    remaining = []
+    seen = set()
+    for job in jobs:
+        moneybird_asset_id = job.parameters["moneybird_asset_id"]
+        if moneybird_asset_id in linked:
+            errors.append(
+                f'Moneybird Asset ID {moneybird_asset_id} is already linked to asset "{linked[moneybird_asset_id]}".'
+            )
+        elif moneybird_asset_id in seen:
+            errors.append(
+                f"Moneybird Asset ID {moneybird_asset_id} can only be linked to one asset."
+            )
+        else:
+            seen.add(moneybird_asset_id)
+            remaining.append(job)
+    return remaining, errors
+
+
+def run_moneybird_job(job):
+    """
+    Run a queued Moneybird action.
+
+    The job is claimed with a conditional update, so a job that is enqueued
+    twice only runs once. The outcome is recorded on the job, so the page that
+    queued it can show it.
+    """
+    claimed = MoneybirdAssetJob.objects.filter(
+        pk=job.pk, status=MoneybirdAssetJobStates.PENDING
+    ).update(status=MoneybirdAssetJobStates.RUNNING, updated_at=timezone.now())
+    if not claimed:
+        return
+    job.status = MoneybirdAssetJobStates.RUNNING
+
+    asset = job.asset
+    try:
+        parameters = clean_job_parameters(asset, job.action, job.parameters)
+        message = _run_action(asset, job.action, parameters)
+    except MoneybirdJobError as e:
+        job.set_status(MoneybirdAssetJobStates.FAILED, str(e))
+        return
+    except Exception as e:
+        logger.exception(f"Moneybird job {job.pk} for asset {asset.pk} failed")
+        job.set_status(
+            MoneybirdAssetJobStates.FAILED,
+            f'Failed to {job.get_action_display()} for asset "{asset.name}": {e}',
+        )
+        return
+
+    job.set_status(MoneybirdAssetJobStates.DONE, message)
+
+
+def fail_stale_moneybird_jobs(jobs=None):
+    """
+    Mark jobs that have been running for longer than MONEYBIRD_JOB_TIMEOUT as failed.
+
+    A job is claimed before it runs, so a job whose worker stopped would stay
+    running forever and the page that queued it would never finish. The jobs
+    are not queued again, as the action may have reached Moneybird already.
+    Returns the number of jobs that were marked as failed.
+    """
+    if jobs is None:
+        jobs = MoneybirdAssetJob.objects.all()
+    return jobs.filter(
+        status=MoneybirdAssetJobStates.RUNNING,
+        updated_at__lt=timezone.now() - MONEYBIRD_JOB_TIMEOUT,
+    ).update(
+        status=MoneybirdAssetJobStates.FAILED,
+        message="The job did not finish in time, please check the asset on Moneybird and try again.",
+        updated_at=timezone.now(),
+    )
+
+
+def _run_action(asset, action, parameters):
+    if action == MoneybirdAssetActions.CREATE:
+        asset.create_on_moneybird()
+        return f'Asset "{asset.name}" has been successfully created on Moneybird.'
+
+    if action == MoneybirdAssetActions.LINK:
+        moneybird_asset_id = parameters["moneybird_asset_id"]
+        existing_asset = (
+            Asset.objects.filter(moneybird_asset_id=moneybird_asset_id)
+            .exclude(pk=asset.pk)
+            .first()
+        )
+        if existing_asset:
+            raise MoneybirdJobError(
+                f'Moneybird Asset ID {moneybird_asset_id} is already linked to asset "{existing_asset.name}".'
+            )
+        asset.moneybird_asset_id = moneybird_asset_id
+        asset.save(update_fields=["moneybird_asset_id"])
+        if asset.refresh_from_moneybird() is None:
+            return f'Asset "{asset.name}" has been linked to Moneybird Asset {moneybird_asset_id}, but failed to refresh data.'
+        return f'Asset "{asset.name}" has been successfully linked to Moneybird Asset {moneybird_asset_id} and data has been refreshed.'
+
+    if action == MoneybirdAssetActions.REFRESH:
+        if asset.refresh_from_moneybird() is None:
+            raise MoneybirdJobError(
+                f'Failed to refresh asset "{asset.name}" from Moneybird.'
+            )
+        return f'Asset "{asset.name}" has been successfully refreshed from Moneybird.'
+
+    if action == MoneybirdAssetActions.UPDATE:
+        asset.update_on_moneybird()
+        return f'Asset "{asset.name}" has been successfully updated on Moneybird with current local data.'
+
+    disposal_date = date.fromisoformat(parameters["disposal_date"])
+    if parameters["disposal_reason"] == DisposalReasons.DIVESTED:
+        # For divested, use divestment value change which automatically creates disposal
+        asset.create_divestment_value_change_on_moneybird(disposal_date)
+        return f'Asset "{asset.name}" has been successfully divested on Moneybird.'
+
+    # For out_of_use, use fully depreciate which automatically creates an "out-of-use" disposal
+    asset.fully_depreciate_on_moneybird(disposal_date, "Full depreciation - out of use")
+    return f'Asset "{asset.name}" has been successfully disposed on Moneybird as out of use.'
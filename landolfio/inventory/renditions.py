@@ -0,0 +1,110 @@
+import logging
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# Longest side in pixels of each rendition
+RENDITION_SIZES = {
+    "thumbnail": 256,
+    "medium": 1024,
+}
+
+# Rendition key suffix, Pillow format, file extension and save options
+RENDITION_FORMATS = {
+    "": ("JPEG", "jpg", {"quality": 85, "optimize": True, "progressive": True}),
+    "_webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+}
+
+IMAGE_EXTENSIONS = ("jpg", "jpeg", "png", "gif", "webp", "bmp", "tif", "tiff")
+
+
+def is_image_name(name):
+    """Return true if a file name has an image extension."""
+    return name.rsplit(".", 1)[-1].lower() in IMAGE_EXTENSIONS
+
+
+def get_rendition_name(original_name, size, extension):
+    """Return the storage name of a rendition, next to its original."""
+    root, _ = os.path.splitext(original_name)
+    return f"{root}.{size}.{extension}"
+
+
+def delete_renditions(storage, renditions):
+    """Delete previously generated renditions from storage."""
+    for name in renditions.values():
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning(f"Could not delete rendition {name}: {e}")
+
+
+def generate_renditions(attachment):
+    """
+    Generate the resized JPEG and WebP renditions of an image attachment.
+
+    The renditions are stored next to the original and their storage names are
+    returned as a dict keyed like "thumbnail" and "thumbnail_webp".
+    """
+    storage = attachment.attachment.storage
+    with storage.open(attachment.attachment.name, "rb") as original:
+        with Image.open(original) as image:
+            # Apply the EXIF orientation, since the metadata is not kept
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+
+            renditions = {}
+            for size, max_pixels in RENDITION_SIZES.items():
+                resized = image.copy()
+                resized.thumbnail((max_pixels, max_pixels), Image.Resampling.LANCZOS)
+                for suffix, rendition_format in RENDITION_FORMATS.items():
+                    image_format, extension, options = rendition_format
+                    buffer = BytesIO()
+                    resized.save(buffer, image_format, **options)
+                    name = get_rendition_name(
+                        attachment.attachment.name, size, extension
+                    )
+                    if storage.exists(name):
+                        storage.delete(name)
+                    renditions[f"{size}{suffix}"] = storage.save(
+                        name, ContentFile(buffer.getvalue())
+                    )
+    return renditions
+
+
+def update_attachment_renditions(attachment):
+    """Regenerate and record the renditions of an attachment."""
+    from inventory.models.attachment import Attachment
+
+    if not is_image_name(attachment.attachment.name):
+        return {}
+
+    old_renditions = attachment.renditions
+    try:
+        renditions = generate_renditions(attachment)
+    except (UnidentifiedImageError, OSError) as e:
+        logger.warning(
+            f"Could not generate renditions for attachment {attachment.pk}: {e}"
+        )
+        return {}
+
+    stale = {
+        key: name
+        for key, name in old_renditions.items()
+        if name not in renditions.values()
+    }
+    delete_renditions(attachment.attachment.storage, stale)
+
+    # Update without save() to not trigger the file handling in Attachment.save
+    Attachment.objects.filter(pk=attachment.pk).update(renditions=renditions)
+    attachment.renditions = renditions
+    return renditions
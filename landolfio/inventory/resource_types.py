@@ -49,7 +49,8 @@ class AssetResourceType(MoneybirdResourceType):
         # Check if asset already exists locally
         try:
             asset = cls.get_queryset().get(moneybird_asset_id=resource_id)
-            asset.refresh_from_moneybird()
+            # The webhook carries the asset itself, so there is no need to fetch it
+            asset._refresh_from_moneybird(data)
 
             # If this is a created event and the name doesn't match, update Moneybird
             if event.value == "company_assets_asset_created":
@@ -78,7 +79,7 @@ class AssetResourceType(MoneybirdResourceType):
             )
             asset.moneybird_asset_id = resource_id
             asset.save(update_fields=["moneybird_asset_id"])
-            asset.refresh_from_moneybird()
+            asset._refresh_from_moneybird(data)
 
             # Update Moneybird name if it doesn't match local asset representation
             expected_name = str(asset)
@@ -1,23 +1,81 @@
 import logging
 import re
+import uuid
+from collections import defaultdict
 from decimal import Decimal
 from functools import lru_cache
 from typing import Union
 
-from inventory.models.asset import Asset
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.functions import Coalesce, Lower, Trim
+
+from inventory.asset_matcher import NAME_DELIMITERS, AssetNameMatcher
+from inventory.models.asset import LOCATION_STATUSES, Asset
+from inventory.models.asset_property import AssetPropertyValue
+from inventory.models.status_change import StatusChange, latest_status_subquery
 
 MIN_ASSET_NAME_LENGTH_FOR_FUZZY_LINK = 3
 
+ASSET_NAMES_CACHE_KEY = "inventory:asset_names"
+ASSET_NAMES_CACHE_TIMEOUT = 60 * 60
+ASSET_NAMES_VERSION_CACHE_KEY = "inventory:asset_names:version"
 
-@lru_cache(maxsize=None)
-def get_asset_ids():
-    return set(Asset.objects.values_list("name", flat=True))
+RELINK_CHUNK_SIZE = 2000
+
+_asset_matcher = None
+
+
+def get_asset_names():
+    """
+    Return a dict of all asset names to their ids.
+
+    The result is shared through the cache, so detecting assets in a text does
+    not load every asset name. The cache is cleared when an asset is created,
+    renamed or deleted (see inventory.signals).
+    """
+    asset_names = cache.get(ASSET_NAMES_CACHE_KEY)
+    if asset_names is None:
+        asset_names = dict(Asset.objects.values_list("name", "pk"))
+        cache.set(ASSET_NAMES_CACHE_KEY, asset_names, ASSET_NAMES_CACHE_TIMEOUT)
+    return asset_names
+
+
+def clear_asset_names_cache():
+    """Clear the cached asset names, and make every process rebuild its matcher."""
+    cache.delete(ASSET_NAMES_CACHE_KEY)
+    cache.set(ASSET_NAMES_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
+def get_asset_matcher() -> AssetNameMatcher:
+    """
+    Return the matcher for all asset names.
+
+    Building the matcher takes a while for many assets, so it is kept for the
+    lifetime of the process. The names have a version in the cache that
+    changes with every change to the names, and the matcher is rebuilt when it
+    was built for another version.
+    """
+    global _asset_matcher
+
+    version = cache.get(ASSET_NAMES_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(ASSET_NAMES_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+        version = cache.get(ASSET_NAMES_VERSION_CACHE_KEY)
+
+    matcher = _asset_matcher
+    if matcher is None or matcher.version != version:
+        # The version is read before the names, so a change in between is
+        # picked up by the next call
+        matcher = AssetNameMatcher(get_asset_names(), version=version)
+        _asset_matcher = matcher
+    return matcher
 
 
 @lru_cache(maxsize=None)
 def get_split_regex_pattern():
-    delimiters = " ", ",", ":", ";", ".", "\n", "-", "\t", "\r", "[", "]", "(", ")"
-    return "|".join(map(re.escape, delimiters))
+    return "|".join(map(re.escape, sorted(NAME_DELIMITERS)))
 
 
 def split_description(description: str) -> list[str]:
@@ -38,45 +96,318 @@ def find_existing_asset_from_description(
 ) -> Union[list[Asset], Asset, None]:
     if description is None:
         return None
+    return find_existing_assets_in_texts([description])[0]
+
+
+def find_existing_assets_in_texts(texts) -> list[list[Asset]]:
+    """
+    Return the assets named in each of the texts, in order.
+
+    The texts are scanned with the asset name matcher and all assets that are
+    found are loaded with one query.
+    """
+    texts = list(texts)
+    matcher = get_asset_matcher()
+    matches = [matcher.find(text) for text in texts]
+    names = set().union(*matches)
+    if not names:
+        return [[] for _ in texts]
+
+    # Resolve by name, an asset renamed since the matcher was built is skipped
+    assets = {
+        asset.name: asset
+        for asset in Asset.objects.filter(name__in=names).select_related(
+            "category", "size"
+        )
+    }
+    results = []
+    for text, text_matches in zip(texts, matches):
+        text_assets = [assets[name] for name in text_matches if name in assets]
+        for asset in text_assets:
+            logging.info(f"Detected asset {asset} in '{text}'")
+        results.append(text_assets)
+    return results
+
+
+def relink_tickets_to_assets(
+    start_after=None, include_linked=False, chunk_size=RELINK_CHUNK_SIZE, progress=None
+):
+    """
+    Link tickets to the assets named in their description, in bulk.
+
+    Tickets are streamed in order of their id and matched in memory, and the
+    links of each chunk of tickets are written with one insert. Existing links
+    are kept. Tickets that are linked to assets already are skipped, like
+    Ticket.save does, unless include_linked is set.
+
+    progress is called with the statistics after every chunk. Its last_id can
+    be passed as start_after to resume an interrupted run.
+    """
+    from tickets.models import Ticket
+
+    asset_ids = defaultdict(list)
+    for name, asset_id in Asset.objects.values_list("name", "pk"):
+        asset_ids[name].append(asset_id)
+    matcher = AssetNameMatcher(asset_ids)
+    TicketAsset = Ticket.assets.through
+
+    tickets = Ticket.objects.exclude(description__isnull=True).exclude(description="")
+    if start_after is not None:
+        tickets = tickets.filter(pk__gt=start_after)
+    if not include_linked:
+        tickets = tickets.filter(assets__isnull=True)
+
+    stats = {"tickets": 0, "links": 0, "last_id": start_after}
+    links = []
+
+    def write_links():
+        TicketAsset.objects.bulk_create(links, ignore_conflicts=True)
+        stats["links"] += len(links)
+        links.clear()
+        if progress is not None:
+            progress(stats)
+
+    for ticket_id, description in (
+        tickets.order_by("pk")
+        .values_list("pk", "description")
+        .iterator(chunk_size=chunk_size)
+    ):
+        for name in matcher.find(description):
+            links.extend(
+                TicketAsset(ticket_id=ticket_id, asset_id=asset_id)
+                for asset_id in asset_ids[name]
+            )
+        stats["tickets"] += 1
+        stats["last_id"] = ticket_id
+        if stats["tickets"] % chunk_size == 0:
+            write_links()
+
+    if stats["tickets"] % chunk_size:
+        write_links()
+    return stats
+
+
+def normalize_asset_name(name: str) -> str:
+    """Return the form of an asset name that is matched against Moneybird names."""
+    return name.strip().lower() if name else ""
+
 
-    asset_ids = get_asset_ids()
-    words = set(split_description(description))
-    matches = words.intersection(asset_ids)
+class AssetNameIndex:
+    """
+    Index of unlinked assets by their normalized name.
+
+    Matching a Moneybird name looks up each of its words, instead of comparing
+    the name with every asset, and linked assets can be removed as they get
+    linked. Assets with very short names are never indexed, to avoid false
+    positives.
+    """
+
+    def __init__(self, assets=()):
+        self._assets = defaultdict(dict)
+        for asset in assets:
+            self.add(asset)
+
+    @classmethod
+    def for_unlinked_assets(cls):
+        """Build the index of all assets that are not linked to Moneybird."""
+        return cls(Asset.objects.filter(moneybird_asset_id__isnull=True))
+
+    @classmethod
+    def for_moneybird_name(cls, moneybird_name: str):
+        """Build the index of the unlinked assets that can match a Moneybird name."""
+        words = {
+            word.lower()
+            for word in split_description(moneybird_name or "")
+            if len(word) >= MIN_ASSET_NAME_LENGTH_FOR_FUZZY_LINK
+        }
+        if not words:
+            return cls()
+        return cls(
+            Asset.objects.filter(moneybird_asset_id__isnull=True)
+            .alias(normalized_name=Lower(Trim("name")))
+            .filter(normalized_name__in=words)
+        )
+
+    def __len__(self):
+        return sum(len(assets) for assets in self._assets.values())
+
+    def add(self, asset):
+        name = normalize_asset_name(asset.name)
+        if len(name) >= MIN_ASSET_NAME_LENGTH_FOR_FUZZY_LINK:
+            self._assets[name][asset.pk] = asset
+
+    def remove(self, asset):
+        assets = self._assets.get(normalize_asset_name(asset.name))
+        if assets is not None:
+            assets.pop(asset.pk, None)
+
+    def match(self, moneybird_name: str) -> tuple[Union[Asset, None], list[Asset]]:
+        """
+        Find the unique asset whose name appears as a whole word in the Moneybird
+        name (so "V11" matches "Viool V11" but "V1" does not).
 
-    assets = []
-    for match in matches:
-        asset = find_asset_from_id(match)
-        if asset:
-            logging.info(f"Detected asset {asset} in '{description}'")
-            assets.append(asset)
-    return assets
+        Returns (asset_or_None, all_matches). When more than one asset matches,
+        the first element is None and the caller can inspect all_matches to
+        decide what to do.
+        """
+        if not moneybird_name:
+            return None, []
+
+        words = dict.fromkeys(
+            word.lower() for word in split_description(moneybird_name) if word
+        )
+        matches = [
+            asset for word in words for asset in self._assets.get(word, {}).values()
+        ]
+
+        if len(matches) == 1:
+            return matches[0], matches
+        return None, matches
 
 
 def find_unique_unlinked_asset_for_moneybird_name(
-    moneybird_name: str, unlinked_assets=None
+    moneybird_name: str, index: AssetNameIndex = None
 ) -> tuple[Union[Asset, None], list[Asset]]:
     """
     Find the unique unlinked local Asset whose name appears as a whole word
-    in the Moneybird name (so "V11" matches "Viool V11" but "V1" does not).
-    Returns (asset_or_None, all_matches). When more than one local asset
-    matches, the first element is None and the caller can inspect all_matches
-    to decide what to do.
-    """
-    if not moneybird_name:
-        return None, []
-
-    if unlinked_assets is None:
-        unlinked_assets = list(Asset.objects.filter(moneybird_asset_id__isnull=True))
-
-    words_lower = {w.lower() for w in split_description(moneybird_name) if w}
-    matches = [
-        asset
-        for asset in unlinked_assets
-        if asset.name
-        and len(asset.name.strip()) >= MIN_ASSET_NAME_LENGTH_FOR_FUZZY_LINK
-        and asset.name.strip().lower() in words_lower
-    ]
-
-    if len(matches) == 1:
-        return matches[0], matches
-    return None, matches
+    in the Moneybird name, see AssetNameIndex.match. Without an index, only
+    the assets that can match the name are loaded.
+    """
+    if index is None:
+        index = AssetNameIndex.for_moneybird_name(moneybird_name)
+    return index.match(moneybird_name)
+
+
+def clear_locations_for_current_status(asset_ids):
+    """
+    Clear the location of assets whose current status does not allow one.
+
+    This is what Asset.save does for a single asset, done in one UPDATE.
+    Returns the number of assets whose location was cleared.
+    """
+    return (
+        Asset.objects.filter(pk__in=asset_ids)
+        .exclude(location__isnull=True, location_nr__isnull=True)
+        .alias(status=Coalesce(latest_status_subquery(), "local_status"))
+        .exclude(status__in=LOCATION_STATUSES)
+        .update(location=None, location_nr=None)
+    )
+
+
+def bulk_change_status(
+    asset_ids, status_date, new_status=None, comments="", contact=None
+) -> tuple[list[StatusChange], list[tuple[str, str]]]:
+    """
+    Record the same status change for many assets at once.
+
+    The ids are validated with one query, all status changes are inserted with
+    one bulk insert and locations are cleared in bulk, in a single transaction.
+    Returns the created status changes and a list of (asset id, reason) pairs
+    for the ids that were skipped.
+    """
+    failures = []
+    valid_ids = []
+    for asset_id in asset_ids:
+        try:
+            valid_id = uuid.UUID(str(asset_id))
+        except ValueError:
+            failures.append((str(asset_id), "invalid id"))
+            continue
+        if valid_id not in valid_ids:
+            valid_ids.append(valid_id)
+
+    existing_ids = set(
+        Asset.objects.filter(pk__in=valid_ids).values_list("pk", flat=True)
+    )
+    failures.extend(
+        (str(asset_id), "not found")
+        for asset_id in valid_ids
+        if asset_id not in existing_ids
+    )
+    asset_ids = [asset_id for asset_id in valid_ids if asset_id in existing_ids]
+
+    if not asset_ids:
+        return [], failures
+
+    with transaction.atomic():
+        status_changes = StatusChange.objects.bulk_create(
+            StatusChange(
+                asset_id=asset_id,
+                status_date=status_date,
+                new_status=new_status,
+                comments=comments,
+                contact=contact,
+            )
+            for asset_id in asset_ids
+        )
+        if new_status is not None:
+            clear_locations_for_current_status(asset_ids)
+
+    return status_changes, failures
+
+
+def save_property_values(
+    asset, values
+) -> tuple[
+    list[AssetPropertyValue], list[AssetPropertyValue], list[AssetPropertyValue]
+]:
+    """
+    Write the property values of an asset in bulk.
+
+    values maps AssetProperty instances to their new value, a blank value
+    removes the property from the asset. The existing values are loaded with one
+    query and the changes are written with one bulk insert, update and delete,
+    in a single transaction. All values are validated before anything is
+    written, a ValidationError lists the messages of the invalid ones.
+    Returns the created, updated and deleted property values.
+    """
+    existing = {
+        property_value.property_id: property_value
+        for property_value in AssetPropertyValue.objects.filter(
+            asset=asset, property__in=list(values)
+        )
+    }
+
+    created, updated, deleted = [], [], []
+    errors = []
+    for asset_property, value in values.items():
+        value = (value or "").strip()
+        property_value = existing.get(asset_property.pk)
+
+        if not value:
+            if property_value is not None:
+                deleted.append(property_value)
+            continue
+        if property_value is None:
+            property_value = AssetPropertyValue(asset=asset, property=asset_property)
+            created.append(property_value)
+        elif property_value.value != value:
+            updated.append(property_value)
+        else:
+            continue
+
+        property_value.asset = asset
+        property_value.property = asset_property
+        property_value.value = value
+        property_value.numeric_value = property_value.get_numeric_value()
+        try:
+            property_value.clean_value()
+        except ValidationError as e:
+            errors.extend(f"{asset_property.name}: {message}" for message in e.messages)
+
+    if errors:
+        raise ValidationError(errors)
+    if not created and not updated and not deleted:
+        return created, updated, deleted
+
+    with transaction.atomic():
+        if created:
+            AssetPropertyValue.objects.bulk_create(created)
+        if updated:
+            AssetPropertyValue.objects.bulk_update(updated, ["value", "numeric_value"])
+        if deleted:
+            AssetPropertyValue.objects.filter(
+                pk__in=[property_value.pk for property_value in deleted]
+            ).delete()
+
+    return created, updated, deleted
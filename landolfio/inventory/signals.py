@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from inventory.models.asset import Asset
+from inventory.models.asset_property import AssetProperty, clear_asset_properties_cache
+from inventory.models.location import Location, clear_locations_cache
+from inventory.models.status_type import StatusType, clear_status_types_cache
+from inventory.services import clear_asset_names_cache
+
+
+@receiver([post_save, post_delete], sender=StatusType)
+def status_type_changed(sender, **kwargs):
+    """Clear the cached status types when one changes."""
+    clear_status_types_cache()
+
+
+@receiver([post_save, post_delete], sender=Location)
+def location_changed(sender, **kwargs):
+    """Clear the cached locations when one changes."""
+    clear_locations_cache()
+
+
+@receiver([post_save, post_delete], sender=AssetProperty)
+@receiver(m2m_changed, sender=AssetProperty.categories.through)
+def asset_property_changed(sender, **kwargs):
+    """Clear the cached property definitions when one or its categories change."""
+    clear_asset_properties_cache()
+
+
+# The asset names are cleared once the change is committed, as another process
+# that rebuilt its matcher before that would keep the old names for this version
+
+
+@receiver(post_save, sender=Asset)
+def asset_saved(sender, created, update_fields=None, **kwargs):
+    """Clear the cached asset names when an asset may have been added or renamed."""
+    if created or update_fields is None or "name" in update_fields:
+        transaction.on_commit(clear_asset_names_cache)
+
+
+@receiver(post_delete, sender=Asset)
+def asset_deleted(sender, **kwargs):
+    """Clear the cached asset names when an asset is deleted."""
+    transaction.on_commit(clear_asset_names_cache)
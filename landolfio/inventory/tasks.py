@@ -1,33 +1,142 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
 from django.db import transaction
 from django.tasks import task
 from django_scheduled_tasks import cron_task
 
-from inventory.models.asset import Asset
+from inventory.models.asset import MONEYBIRD_DATA_FIELDS, Asset
+from inventory.models.attachment import Attachment
+from inventory.models.attachment_upload import AttachmentUpload, AttachmentUploadStates
+from inventory.models.collection import Collection
+from inventory.models.moneybird_asset_job import MoneybirdAssetJob
 from inventory.moneybird import MoneybirdAssetService
-from inventory.services import (
-    MIN_ASSET_NAME_LENGTH_FOR_FUZZY_LINK,
-    find_unique_unlinked_asset_for_moneybird_name,
-)
+from inventory.moneybird_jobs import fail_stale_moneybird_jobs, run_moneybird_job
+from inventory.renditions import update_attachment_renditions
+from inventory.services import AssetNameIndex
+from inventory.uploads import fail_stale_uploads, ingest_attachment_upload
 
 logger = logging.getLogger(__name__)
 
 
+# Number of newly linked assets that are written in one UPDATE
+MONEYBIRD_LINK_BATCH_SIZE = 100
+
+
+def fetch_ledger_account_assets(ledger_accounts):
+    """
+    Fetch the Moneybird assets of the ledger accounts concurrently.
+
+    Returns the list of assets of each ledger account in the order of
+    ledger_accounts, leaving out the accounts that could not be fetched.
+    """
+
+    def fetch(ledger_account_id):
+        # Every thread uses its own connection to Moneybird
+        return MoneybirdAssetService().list_assets(
+            ledger_account_id=int(ledger_account_id)
+        )
+
+    results = []
+    with ThreadPoolExecutor(max_workers=len(ledger_accounts)) as executor:
+        futures = [
+            (ledger_account_id, executor.submit(fetch, ledger_account_id))
+            for ledger_account_id in ledger_accounts
+        ]
+        for ledger_account_id, future in futures:
+            try:
+                assets = future.result()
+            except Exception as e:
+                logger.error(
+                    f"Failed to fetch assets from ledger account {ledger_account_id}: {e}"
+                )
+                continue
+            logger.info(
+                f"Found {len(assets)} assets in ledger account {ledger_account_id}"
+            )
+            results.append(assets)
+    return results
+
+
+def link_moneybird_assets(links, stats):
+    """
+    Link local assets to the Moneybird assets they were matched with.
+
+    links are (local asset, Moneybird asset data) pairs. The data from the list
+    payload is stored right away, so linking needs no request per asset, and
+    the links are written in batches. When a batch fails, its assets are linked
+    one by one so a single failure does not block the rest.
+    """
+    # bulk_update skips Asset.save(), which keeps non-commerce assets margin assets
+    non_commerce_collection_ids = set(
+        Collection.objects.filter(commerce=False).values_list("pk", flat=True)
+    )
+
+    for start in range(0, len(links), MONEYBIRD_LINK_BATCH_SIZE):
+        batch = links[start : start + MONEYBIRD_LINK_BATCH_SIZE]
+        for local_asset, mb_asset in batch:
+            local_asset.moneybird_asset_id = mb_asset["id"]
+            local_asset.apply_moneybird_data(mb_asset)
+            if local_asset.collection_id in non_commerce_collection_ids:
+                local_asset.is_margin_asset = True
+
+        try:
+            with transaction.atomic():
+                Asset.objects.bulk_update(
+                    [local_asset for local_asset, _ in batch],
+                    ["moneybird_asset_id", *MONEYBIRD_DATA_FIELDS],
+                )
+        except Exception as e:
+            logger.warning(f"Failed to link a batch of assets, linking one by one: {e}")
+            batch = _link_one_by_one(batch, stats)
+
+        for local_asset, mb_asset in batch:
+            stats["newly_linked"] += 1
+            logger.info(
+                f"Linked asset '{local_asset.name}' to Moneybird ID {mb_asset['id']}"
+            )
+
+
+def _link_one_by_one(batch, stats):
+    linked = []
+    for local_asset, mb_asset in batch:
+        try:
+            with transaction.atomic():
+                local_asset.save(
+                    update_fields=["moneybird_asset_id", *MONEYBIRD_DATA_FIELDS]
+                )
+        except Exception as e:
+            logger.error(
+                f"Failed to link asset '{local_asset.name}' to Moneybird ID {mb_asset['id']}: {e}"
+            )
+            stats["unmatched"].append(
+                {
+                    "id": str(mb_asset["id"]),
+                    "name": mb_asset.get("name", ""),
+                    "reason": "link_failed",
+                    "error": str(e),
+                }
+            )
+        else:
+            linked.append((local_asset, mb_asset))
+    return linked
+
+
 @cron_task(cron_schedule="0 3 * * *")  # 3 AM every day
 @task
 def sync_unlinked_moneybird_assets(**kwargs):
     """
     Fetch all Moneybird assets and link unlinked ones to local assets.
     Runs nightly at 3 AM.
+
+    The ledger accounts are fetched concurrently, the assets are matched by name
+    and the links are written in batches with the data of the fetched list.
     """
     if kwargs:
         logger.warning("Ignoring unexpected task kwargs: %s", sorted(kwargs))
     logger.info("Starting Moneybird asset sync task")
 
-    mb = MoneybirdAssetService()
-
     # Track statistics
     stats = {
         "total_fetched": 0,
@@ -55,27 +164,11 @@ def sync_unlinked_moneybird_assets(**kwargs):
         )
     }
 
-    # Get all unlinked local assets once (excluding empty/very short names)
-    unlinked_local_assets = [
-        asset
-        for asset in Asset.objects.filter(moneybird_asset_id__isnull=True)
-        if asset.name
-        and len(asset.name.strip()) >= MIN_ASSET_NAME_LENGTH_FOR_FUZZY_LINK
-    ]
-
-    for ledger_account_id in ledger_accounts:
-        logger.info(f"Fetching assets from ledger account {ledger_account_id}")
-
-        try:
-            assets = mb.list_assets(ledger_account_id=int(ledger_account_id))
-        except Exception as e:
-            logger.error(
-                f"Failed to fetch assets from ledger account {ledger_account_id}: {e}"
-            )
-            continue
-
-        logger.info(f"Found {len(assets)} assets in ledger account {ledger_account_id}")
+    # Index all unlinked local assets by name once
+    unlinked_local_assets = AssetNameIndex.for_unlinked_assets()
 
+    links = []
+    for assets in fetch_ledger_account_assets(ledger_accounts):
         for mb_asset in assets:
             stats["total_fetched"] += 1
             mb_id = str(mb_asset["id"])
@@ -86,38 +179,13 @@ def sync_unlinked_moneybird_assets(**kwargs):
                 stats["already_linked"] += 1
                 continue
 
-            local_asset, matches = find_unique_unlinked_asset_for_moneybird_name(
-                mb_name, unlinked_local_assets
-            )
+            local_asset, matches = unlinked_local_assets.match(mb_name)
 
             if local_asset is not None:
-                try:
-                    # Link them atomically
-                    with transaction.atomic():
-                        local_asset.moneybird_asset_id = mb_id
-                        local_asset.save(update_fields=["moneybird_asset_id"])
-                        local_asset.refresh_from_moneybird()
-
-                    # Remove from unlinked list and add to linked IDs
-                    unlinked_local_assets.remove(local_asset)
-                    linked_mb_ids.add(mb_id)
-
-                    stats["newly_linked"] += 1
-                    logger.info(
-                        f"Linked asset '{local_asset.name}' to Moneybird ID {mb_id}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to link asset '{local_asset.name}' to Moneybird ID {mb_id}: {e}"
-                    )
-                    stats["unmatched"].append(
-                        {
-                            "id": mb_id,
-                            "name": mb_name,
-                            "reason": "link_failed",
-                            "error": str(e),
-                        }
-                    )
+                # Remove from the unlinked index and add to linked IDs
+                unlinked_local_assets.remove(local_asset)
+                linked_mb_ids.add(mb_id)
+                links.append((local_asset, mb_asset))
 
             elif len(matches) > 1:
                 logger.warning(
@@ -134,6 +202,8 @@ def sync_unlinked_moneybird_assets(**kwargs):
             else:
                 stats["unmatched"].append({"id": mb_id, "name": mb_name})
 
+    link_moneybird_assets(links, stats)
+
     # Log summary
     logger.info(
         f"Sync complete: {stats['total_fetched']} fetched, "
@@ -146,3 +216,72 @@ def sync_unlinked_moneybird_assets(**kwargs):
         logger.info(f"Unmatched assets: {stats['unmatched']}")
 
     return stats
+
+
+@task
+def generate_attachment_renditions(attachment_id):
+    """Generate the thumbnail and WebP renditions of an uploaded image."""
+    try:
+        attachment = Attachment.objects.get(pk=attachment_id)
+    except Attachment.DoesNotExist:
+        logger.info(f"Attachment {attachment_id} was deleted before processing")
+        return
+    update_attachment_renditions(attachment)
+
+
+@task
+def process_attachment_upload(upload_id):
+    """Validate, process and register a file that was uploaded to storage."""
+    try:
+        upload = AttachmentUpload.objects.get(pk=upload_id)
+    except AttachmentUpload.DoesNotExist:
+        logger.info(f"Attachment upload {upload_id} was deleted before processing")
+        return
+
+    try:
+        ingest_attachment_upload(upload)
+    except Exception:
+        logger.exception(f"Failed to process attachment upload {upload_id}")
+        upload.set_status(
+            AttachmentUploadStates.FAILED, f"Could not process {upload.filename}"
+        )
+        raise
+
+
+@task
+def refresh_asset_from_moneybird(asset_id):
+    """Refresh the Moneybird data of an asset whose data has become stale."""
+    try:
+        asset = Asset.objects.get(pk=asset_id)
+    except Asset.DoesNotExist:
+        return
+    asset.refresh_from_moneybird()
+
+
+@task
+def run_moneybird_asset_job(job_id):
+    """Run an action on Moneybird that was queued from the frontend."""
+    try:
+        job = MoneybirdAssetJob.objects.select_related("asset").get(pk=job_id)
+    except MoneybirdAssetJob.DoesNotExist:
+        logger.info(f"Moneybird asset job {job_id} was deleted before running")
+        return
+    run_moneybird_job(job)
+
+
+@cron_task(cron_schedule="*/15 * * * *")  # Every 15 minutes
+@task
+def fail_stale_moneybird_asset_jobs(**kwargs):
+    """Mark Moneybird asset jobs whose worker stopped as failed."""
+    failed = fail_stale_moneybird_jobs()
+    if failed:
+        logger.warning(f"Marked {failed} stale Moneybird asset jobs as failed")
+
+
+@cron_task(cron_schedule="*/15 * * * *")  # Every 15 minutes
+@task
+def fail_stale_attachment_uploads(**kwargs):
+    """Mark attachment uploads whose worker stopped as failed."""
+    failed = fail_stale_uploads()
+    if failed:
+        logger.warning(f"Marked {failed} stale attachment uploads as failed")
@@ -0,0 +1,62 @@
+"""Test detecting assets by name in free text."""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from inventory.models.asset import Asset
+from inventory.services import find_existing_asset_from_description
+from inventory.tests.utils import create_category, create_collection
+from tickets.models import Ticket
+
+
+class AssetDetectionTest(TestCase):
+    """Test cases for find_existing_asset_from_description."""
+
+    def setUp(self):
+        """Set up the test case."""
+        cache.clear()
+        self.category = create_category()
+        self.collection = create_collection()
+        self.v11 = self._create_asset("V11")
+
+    def _create_asset(self, name):
+        return Asset.objects.create(
+            name=name, category=self.category, collection=self.collection
+        )
+
+    def test_detects_new_and_renamed_assets(self):
+        """Test the cached names follow created, renamed and deleted assets."""
+        self.assertEqual(find_existing_asset_from_description("V11, V12"), [self.v11])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            v12 = self._create_asset("V12")
+        self.assertCountEqual(
+            find_existing_asset_from_description("V11, V12"), [self.v11, v12]
+        )
+
+        self.v11.name = "V13"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.v11.save()
+        self.assertEqual(find_existing_asset_from_description("V11 V13"), [self.v11])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            v12.delete()
+        self.assertEqual(find_existing_asset_from_description("V12"), [])
+
+    def test_one_query_per_description(self):
+        """Test the matches are resolved with one query once the names are cached."""
+        for name in ("V12", "V13", "V14"):
+            self._create_asset(name)
+        find_existing_asset_from_description("")
+
+        with CaptureQueriesContext(connection) as queries:
+            assets = find_existing_asset_from_description("V11, V12, V13 en V14")
+        self.assertEqual(len(assets), 4)
+        self.assertEqual(len(queries), 1)
+
+    def test_ticket_detects_assets(self):
+        """Test a ticket links the assets named in its description."""
+        ticket = Ticket.objects.create(description="Snaar kapot van V11")
+        self.assertEqual(list(ticket.assets.all()), [self.v11])
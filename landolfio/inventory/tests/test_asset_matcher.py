@@ -0,0 +1,97 @@
+"""Test finding asset names in free text."""
+
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from inventory.asset_matcher import AssetNameMatcher
+from inventory.models.asset import Asset
+from inventory.services import (
+    find_existing_asset_from_description,
+    find_existing_assets_in_texts,
+    get_asset_matcher,
+)
+from inventory.tests.utils import create_category, create_collection
+
+
+class AssetNameMatcherTest(SimpleTestCase):
+    """Test cases for AssetNameMatcher."""
+
+    def test_whole_words(self):
+        """Test names are only found delimited by the ends of the text or delimiters."""
+        matcher = AssetNameMatcher(["V1", "V11", "C12"])
+        self.assertEqual(matcher.find("V11"), {"V11"})
+        self.assertEqual(matcher.find("(V1) en V11."), {"V1", "V11"})
+        self.assertEqual(matcher.find("V111 XV1 C12a"), set())
+        self.assertEqual(matcher.find("v11"), set())
+        self.assertEqual(matcher.find(""), set())
+
+    def test_names_with_delimiters(self):
+        """Test names containing delimiters and overlapping names are all found."""
+        matcher = AssetNameMatcher(["V-11", "11", "Cello 4/4", "4/4"])
+        self.assertEqual(matcher.find("Kapot: V-11"), {"V-11", "11"})
+        self.assertEqual(matcher.find("Cello 4/4 (2)"), {"Cello 4/4", "4/4"})
+        self.assertEqual(matcher.find("Cello 4/43"), set())
+        self.assertEqual(len(matcher), 4)
+
+    def test_benchmark(self):
+        """Test scanning texts does not slow down with the number of names."""
+        matcher = AssetNameMatcher(f"V{number}" for number in range(20000))
+        texts = [
+            f"Snaar van V{number} is kapot, zie ook V{number + 1}"
+            for number in range(10000)
+        ]
+
+        start = time.perf_counter()
+        results = [matcher.find(text) for text in texts]
+        duration = time.perf_counter() - start
+
+        self.assertEqual(results[5], {"V5", "V6"})
+        self.assertLess(duration, 5)
+
+
+class AssetMatcherCacheTest(TestCase):
+    """Test cases for the asset matcher of all assets."""
+
+    def setUp(self):
+        """Set up the test case."""
+        cache.clear()
+        self.category = create_category()
+        self.collection = create_collection()
+        self.v11 = self._create_asset("V-11")
+
+    def _create_asset(self, name):
+        return Asset.objects.create(
+            name=name, category=self.category, collection=self.collection
+        )
+
+    def test_rebuilt_on_change(self):
+        """Test the matcher is kept, and rebuilt when asset names change."""
+        matcher = get_asset_matcher()
+        self.assertIs(get_asset_matcher(), matcher)
+        self.assertEqual(
+            find_existing_asset_from_description("Stemmen V-11"), [self.v11]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            v12 = self._create_asset("V 12")
+            # Other processes keep the old names until the new one is committed
+            self.assertIs(get_asset_matcher(), matcher)
+        self.assertIsNot(get_asset_matcher(), matcher)
+        self.assertEqual(find_existing_asset_from_description("De V 12"), [v12])
+
+    def test_batch_one_query(self):
+        """Test the assets of many texts are loaded with one query."""
+        v12 = self._create_asset("V12")
+        get_asset_matcher()
+
+        with CaptureQueriesContext(connection) as queries:
+            results = find_existing_assets_in_texts(
+                ["V-11 en V12", "Geen instrument", "V12"]
+            )
+        self.assertEqual(len(queries), 1)
+        self.assertCountEqual(results[0], [self.v11, v12])
+        self.assertEqual(results[1:], [[], [v12]])
@@ -0,0 +1,173 @@
+"""Test matching Moneybird asset names to local assets."""
+
+import time
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from inventory.models.asset import Asset
+from inventory.models.collection import Collection
+from inventory.services import (
+    AssetNameIndex,
+    find_unique_unlinked_asset_for_moneybird_name,
+)
+from inventory.tasks import sync_unlinked_moneybird_assets
+from inventory.tests.utils import create_category, create_collection
+
+
+class AssetNameIndexTest(TestCase):
+    """Test cases for AssetNameIndex."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.category = create_category()
+        self.collection = create_collection("Verkoop", commerce=True)
+
+    def _create_asset(self, name, **kwargs):
+        kwargs.setdefault("collection", self.collection)
+        return Asset.objects.create(name=name, category=self.category, **kwargs)
+
+    def test_match(self):
+        """Test names match as whole words, case-insensitively."""
+        v11 = self._create_asset("V11")
+        self._create_asset("V1")
+        index = AssetNameIndex.for_unlinked_assets()
+
+        self.assertEqual(index.match("Viool v11"), (v11, [v11]))
+        self.assertEqual(index.match("Viool V111"), (None, []))
+        self.assertEqual(index.match(""), (None, []))
+
+        index.remove(v11)
+        self.assertEqual(index.match("Viool V11"), (None, []))
+
+    def test_multiple_matches(self):
+        """Test a name matching several assets does not pick one."""
+        v11 = self._create_asset("V11")
+        c12 = self._create_asset("C12")
+        asset, matches = AssetNameIndex.for_unlinked_assets().match("V11 en C12")
+        self.assertIsNone(asset)
+        self.assertCountEqual(matches, [v11, c12])
+
+    def test_for_moneybird_name(self):
+        """Test the webhook path only loads candidates that are not linked."""
+        v11 = self._create_asset(" V11 ")
+        self._create_asset("V12", moneybird_asset_id=1)
+        self._create_asset("V13")
+
+        index = AssetNameIndex.for_moneybird_name("Viool V11 V12")
+        self.assertEqual(len(index), 1)
+        self.assertEqual(
+            find_unique_unlinked_asset_for_moneybird_name("Viool V11 V12"),
+            (v11, [v11]),
+        )
+
+    @override_settings(
+        MONEYBIRD_MARGIN_ASSETS_LEDGER_ACCOUNT_ID="1",
+        MONEYBIRD_NOT_MARGIN_ASSETS_LEDGER_ACCOUNT_ID="2",
+    )
+    @mock.patch.object(Asset, "refresh_from_moneybird")
+    @mock.patch("inventory.tasks.MoneybirdAssetService")
+    def test_sync_links_each_asset_once(self, service, refresh_from_moneybird):
+        """Test the nightly sync links by name with the data of the list."""
+        self._create_asset("V11")
+        self._create_asset("V12")
+        ledger_accounts = {
+            1: [
+                {"id": 100, "name": "Viool V11", "current_value": "50.0"},
+                {"id": 101, "name": "Nog een V11"},
+            ],
+            2: [{"id": 102, "name": "Viool V12"}, {"id": 103, "name": "Onbekend"}],
+        }
+        service.return_value.list_assets.side_effect = (
+            lambda ledger_account_id: ledger_accounts[ledger_account_id]
+        )
+
+        stats = sync_unlinked_moneybird_assets.call()
+
+        self.assertEqual(stats["total_fetched"], 4)
+        self.assertEqual(stats["newly_linked"], 2)
+        self.assertEqual(len(stats["unmatched"]), 2)
+        v11 = Asset.objects.get(name="V11")
+        self.assertEqual(v11.moneybird_asset_id, 100)
+        self.assertEqual(v11.current_value, 50)
+        self.assertFalse(v11.moneybird_data_is_stale)
+        self.assertEqual(Asset.objects.get(name="V12").moneybird_asset_id, 102)
+        refresh_from_moneybird.assert_not_called()
+        self.assertEqual(service.return_value.list_assets.call_count, 2)
+
+    @override_settings(
+        MONEYBIRD_MARGIN_ASSETS_LEDGER_ACCOUNT_ID="1",
+        MONEYBIRD_NOT_MARGIN_ASSETS_LEDGER_ACCOUNT_ID=None,
+    )
+    @mock.patch("inventory.tasks.MoneybirdAssetService")
+    def test_sync_failed_batch(self, service):
+        """Test a failing batch is linked one by one, reporting the failures."""
+        self._create_asset("V11")
+        self._create_asset("V12")
+        self._create_asset("V13", moneybird_asset_id=200)
+        service.return_value.list_assets.return_value = [
+            {"id": 100, "name": "Viool V11"},
+            {"id": 200, "name": "Viool V12"},
+        ]
+        # V13 holds Moneybird ID 200, as if it was linked while the sync ran
+        with mock.patch.object(
+            Asset.objects, "filter", wraps=Asset.objects.filter
+        ) as filter:
+            filter.side_effect = lambda *args, **kwargs: (
+                Asset.objects.none()
+                if kwargs == {"moneybird_asset_id__isnull": False}
+                else Asset.objects.all().filter(*args, **kwargs)
+            )
+            stats = sync_unlinked_moneybird_assets.call()
+
+        self.assertEqual(stats["newly_linked"], 1)
+        self.assertEqual(stats["unmatched"][0]["reason"], "link_failed")
+        self.assertEqual(Asset.objects.get(name="V11").moneybird_asset_id, 100)
+        self.assertIsNone(Asset.objects.get(name="V12").moneybird_asset_id)
+
+    @override_settings(
+        MONEYBIRD_MARGIN_ASSETS_LEDGER_ACCOUNT_ID="1",
+        MONEYBIRD_NOT_MARGIN_ASSETS_LEDGER_ACCOUNT_ID="2",
+    )
+    @mock.patch("inventory.tasks.MoneybirdAssetService")
+    def test_sync_keeps_non_commerce_assets_margin(self, service):
+        """Test assets in a non-commerce collection stay margin assets when linked."""
+        private = Collection.objects.create(name="Prive", commerce=False)
+        self._create_asset("V11", collection=private)
+        self._create_asset("V12")
+        ledger_accounts = {
+            1: [],
+            2: [
+                {"id": 100, "name": "Viool V11", "ledger_account_id": "2"},
+                {"id": 101, "name": "Viool V12", "ledger_account_id": "2"},
+            ],
+        }
+        service.return_value.list_assets.side_effect = (
+            lambda ledger_account_id: ledger_accounts[ledger_account_id]
+        )
+
+        stats = sync_unlinked_moneybird_assets.call()
+
+        self.assertEqual(stats["newly_linked"], 2)
+        self.assertTrue(Asset.objects.get(name="V11").is_margin_asset)
+        self.assertFalse(Asset.objects.get(name="V12").is_margin_asset)
+
+    def test_benchmark(self):
+        """Test matching 20k Moneybird names against 20k assets stays fast."""
+        assets = [Asset(name=f"V{number}") for number in range(1000, 21000)]
+        for number, asset in enumerate(assets):
+            asset.pk = number
+
+        start = time.perf_counter()
+        index = AssetNameIndex(assets)
+        linked = 0
+        for number in range(1000, 21000):
+            asset, _ = index.match(f"Viool V{number} 4/4")
+            if asset is not None:
+                index.remove(asset)
+                linked += 1
+        duration = time.perf_counter() - start
+
+        self.assertEqual(linked, 20000)
+        # Comparing every name with every asset took minutes
+        self.assertLess(duration, 5)
@@ -0,0 +1,112 @@
+"""Test the typed storage of asset property values."""
+
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import RequestFactory, TestCase
+
+from inventory.models.asset import Asset
+from inventory.models.asset_property import (
+    AssetProperty,
+    AssetPropertyType,
+    AssetPropertyValue,
+    parse_numeric_value,
+)
+from inventory.models.category import Category
+from inventory.tests.utils import create_collection
+from inventory_frontend.views import AssetListView
+
+
+class AssetPropertyValueTest(TestCase):
+    """Test cases for the numeric column of AssetPropertyValue."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.category = Category.objects.create(name="Cellos", name_singular="cello")
+        self.collection = create_collection()
+        self.length = AssetProperty.objects.create(
+            name="Length", property_type=AssetPropertyType.NUMBER, unit="cm"
+        )
+        self.length.categories.add(self.category)
+        self.color = AssetProperty.objects.create(name="Color")
+        self.color.categories.add(self.category)
+
+    def _create_asset(self, name, length):
+        asset = Asset.objects.create(
+            name=name, category=self.category, collection=self.collection
+        )
+        AssetPropertyValue.objects.create(
+            asset=asset, property=self.length, value=length
+        )
+        return asset
+
+    def test_parse_numeric_value(self):
+        """Test parsing values into the numeric column."""
+        self.assertEqual(parse_numeric_value("42"), Decimal("42"))
+        self.assertEqual(parse_numeric_value(" 4.5 "), Decimal("4.5"))
+        self.assertEqual(parse_numeric_value("-1e2"), Decimal("-100"))
+        self.assertIsNone(parse_numeric_value("abc"))
+        self.assertIsNone(parse_numeric_value("nan"))
+        self.assertIsNone(parse_numeric_value("1e20"))
+
+    def test_numeric_value_is_stored(self):
+        """Test numeric properties store a typed copy of their value."""
+        asset = self._create_asset("C1", "42.5")
+        property_value = AssetPropertyValue.objects.get(
+            asset=asset, property=self.length
+        )
+        self.assertEqual(property_value.numeric_value, Decimal("42.5"))
+
+        property_value.value = "41"
+        property_value.save()
+        property_value.refresh_from_db()
+        self.assertEqual(property_value.numeric_value, Decimal("41"))
+
+    def test_string_property_has_no_numeric_value(self):
+        """Test non-numeric properties leave the numeric column empty."""
+        asset = self._create_asset("C1", "42")
+        property_value = AssetPropertyValue.objects.create(
+            asset=asset, property=self.color, value="12"
+        )
+        self.assertIsNone(property_value.numeric_value)
+
+    def test_changing_property_type_updates_numeric_values(self):
+        """Test changing the type of a property recomputes its numeric values."""
+        asset = self._create_asset("C1", "42")
+        property_value = AssetPropertyValue.objects.create(
+            asset=asset, property=self.color, value="12"
+        )
+
+        self.color.property_type = AssetPropertyType.NUMBER
+        self.color.save()
+        property_value.refresh_from_db()
+        self.assertEqual(property_value.numeric_value, Decimal("12"))
+
+        self.color.property_type = AssetPropertyType.STRING
+        self.color.save()
+        property_value.refresh_from_db()
+        self.assertIsNone(property_value.numeric_value)
+
+    def test_out_of_range_value_is_rejected(self):
+        """Test values that do not fit the numeric column are rejected."""
+        asset = self._create_asset("C1", "42")
+        property_value = AssetPropertyValue.objects.get(
+            asset=asset, property=self.length
+        )
+        property_value.value = "1e20"
+        with self.assertRaises(ValidationError):
+            property_value.save()
+
+    def test_list_view_numeric_range_filter(self):
+        """Test range filters compare the typed values on a single row."""
+        self._create_asset("C1", "9")
+        self._create_asset("C2", "40")
+        self._create_asset("C3", "44.5")
+        self._create_asset("C4", "100")
+
+        view = AssetListView()
+        view.request = RequestFactory().get(
+            "/", {"q": "C", "length_min": "10", "length_max": "50"}
+        )
+        names = sorted(view.get_queryset().values_list("name", flat=True))
+        self.assertEqual(names, ["C2", "C3"])
@@ -0,0 +1,90 @@
+"""Test changing the status of many assets at once."""
+
+import uuid
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from inventory.models.asset import Asset, AssetStates
+from inventory.models.location import Location
+from inventory.models.status_change import StatusChange
+from inventory.services import bulk_change_status
+from inventory.tests.utils import create_category, create_collection
+
+
+class BulkStatusChangeTest(TestCase):
+    """Test cases for bulk_change_status."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.category = create_category()
+        self.collection = create_collection()
+        self.location = Location.objects.create(name="Shelf")
+
+    def _create_assets(self, count):
+        return [
+            Asset.objects.create(
+                name=f"V{Asset.objects.count()}",
+                category=self.category,
+                collection=self.collection,
+                local_status=AssetStates.AVAILABLE,
+                location=self.location,
+                location_nr=number,
+            )
+            for number in range(count)
+        ]
+
+    def test_changes_status_and_clears_locations(self):
+        """Test all assets get the status and lose their location when issued."""
+        assets = self._create_assets(3)
+        status_changes, failures = bulk_change_status(
+            [asset.pk for asset in assets], date(2025, 1, 1), AssetStates.ISSUED_RENT
+        )
+
+        self.assertEqual(len(status_changes), 3)
+        self.assertEqual(failures, [])
+        for asset in Asset.objects.all():
+            self.assertEqual(asset.current_status, AssetStates.ISSUED_RENT)
+            self.assertIsNone(asset.location)
+            self.assertIsNone(asset.location_nr)
+
+    def test_keeps_location_for_in_house_status(self):
+        """Test locations are kept when the current status allows one."""
+        assets = self._create_assets(2)
+        bulk_change_status(
+            [asset.pk for asset in assets],
+            date(2025, 1, 1),
+            AssetStates.MAINTENANCE_IN_HOUSE,
+        )
+        self.assertEqual(Asset.objects.filter(location=self.location).count(), 2)
+
+    def test_reports_failures(self):
+        """Test invalid and unknown ids are reported without stopping the batch."""
+        asset = self._create_assets(1)[0]
+        unknown = uuid.uuid4()
+        status_changes, failures = bulk_change_status(
+            [asset.pk, "not-a-uuid", str(unknown), str(asset.pk)],
+            date(2025, 1, 1),
+            comments="Checked",
+        )
+
+        self.assertEqual(len(status_changes), 1)
+        self.assertEqual(
+            failures, [("not-a-uuid", "invalid id"), (str(unknown), "not found")]
+        )
+        self.assertEqual(StatusChange.objects.get().comments, "Checked")
+        # A comment without a status change keeps the location
+        self.assertEqual(Asset.objects.get().location, self.location)
+
+    def test_query_count_is_constant(self):
+        """Test the number of queries does not depend on the number of assets."""
+        few = [asset.pk for asset in self._create_assets(2)]
+        many = [asset.pk for asset in self._create_assets(20)]
+
+        with CaptureQueriesContext(connection) as few_queries:
+            bulk_change_status(few, date(2025, 1, 1), AssetStates.SOLD)
+        with CaptureQueriesContext(connection) as many_queries:
+            bulk_change_status(many, date(2025, 1, 1), AssetStates.SOLD)
+        self.assertEqual(len(few_queries), len(many_queries))
@@ -0,0 +1,178 @@
+"""Test queueing and running Moneybird actions in the background."""
+
+import json
+from datetime import date, timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from inventory.models.asset import Asset
+from inventory.models.moneybird_asset_job import (
+    MoneybirdAssetActions,
+    MoneybirdAssetJob,
+    MoneybirdAssetJobStates,
+)
+from inventory.moneybird_jobs import MONEYBIRD_JOB_TIMEOUT, queue_moneybird_jobs
+from inventory.tasks import run_moneybird_asset_job
+from inventory.tests.utils import create_category, create_collection, login_superuser
+
+
+class MoneybirdAssetJobTest(TestCase):
+    """Test cases for Moneybird asset jobs."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.category = create_category()
+        self.collection = create_collection("Verkoop", commerce=True)
+        self.assets = [
+            Asset.objects.create(
+                name=f"V{number}",
+                category=self.category,
+                collection=self.collection,
+                start_date=date(2024, 1, 1),
+                purchase_value_asset=1000,
+            )
+            for number in range(3)
+        ]
+        login_superuser(self.client)
+
+    def _run_all(self):
+        for job in MoneybirdAssetJob.objects.order_by("pk"):
+            run_moneybird_asset_job.call(job_id=job.pk)
+
+    def test_view_queues_job_once(self):
+        """Test the view queues the action, and a second submission is ignored."""
+        url = reverse("inventory_frontend:create_moneybird", args=[self.assets[0].pk])
+        with mock.patch("inventory.tasks.run_moneybird_asset_job") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(url, {"idempotency_key": "abc"})
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(url, {"idempotency_key": "abc"})
+
+        job = MoneybirdAssetJob.objects.get()
+        task.enqueue.assert_called_once_with(job_id=job.pk)
+        self.assertEqual(job.action, MoneybirdAssetActions.CREATE)
+        self.assertEqual(job.status, MoneybirdAssetJobStates.PENDING)
+
+    @mock.patch.object(Asset, "create_on_moneybird")
+    def test_run_job_and_status(self, create_on_moneybird):
+        """Test running a job records its outcome, which the endpoint reports."""
+        jobs, errors = queue_moneybird_jobs(
+            self.assets[:2], MoneybirdAssetActions.CREATE, "key"
+        )
+        self.assertEqual(errors, [])
+        create_on_moneybird.side_effect = [None, ValueError("No ledger account")]
+        self._run_all()
+        self._run_all()
+
+        self.assertEqual(create_on_moneybird.call_count, 2)
+        status = self.client.get(
+            reverse("inventory_frontend:moneybird_job_status"),
+            {"ids": ",".join(str(job.pk) for job in jobs)},
+        ).json()
+        self.assertTrue(status["finished"])
+        self.assertEqual(
+            [job["status"] for job in status["jobs"]],
+            [MoneybirdAssetJobStates.DONE, MoneybirdAssetJobStates.FAILED],
+        )
+        self.assertIn("No ledger account", status["jobs"][1]["message"])
+
+    def test_invalid_actions_are_not_queued(self):
+        """Test actions that cannot run for an asset are reported instead."""
+        self.assets[1].moneybird_asset_id = 5
+        self.assets[1].save()
+
+        jobs, errors = queue_moneybird_jobs(
+            self.assets,
+            MoneybirdAssetActions.LINK,
+            "key",
+            asset_parameters={
+                self.assets[0].pk: {"moneybird_asset_id": "5"},
+                self.assets[2].pk: {"moneybird_asset_id": "x"},
+            },
+        )
+        self.assertEqual(jobs, [])
+        self.assertEqual(
+            errors,
+            [
+                'Asset "V1" is already linked to Moneybird.',
+                'Please provide a valid numeric Moneybird Asset ID for "V2".',
+                'Moneybird Asset ID 5 is already linked to asset "V1".',
+            ],
+        )
+
+        jobs, errors = queue_moneybird_jobs(
+            self.assets, MoneybirdAssetActions.DISPOSE, "key"
+        )
+        self.assertEqual(jobs, [])
+        self.assertEqual(
+            errors,
+            [
+                'Asset "V0" is not linked to Moneybird.',
+                "Invalid disposal reason.",
+                'Asset "V2" is not linked to Moneybird.',
+            ],
+        )
+
+    @mock.patch.object(Asset, "refresh_from_moneybird", return_value={})
+    def test_bulk_link(self, refresh_from_moneybird):
+        """Test many assets are linked in one submission."""
+        with mock.patch("inventory.tasks.run_moneybird_asset_job") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse("inventory_frontend:bulk_moneybird"),
+                    {
+                        "asset_ids": json.dumps([str(a.pk) for a in self.assets]),
+                        "action": MoneybirdAssetActions.LINK,
+                        "idempotency_key": "bulk",
+                        "moneybird_asset_ids": "11, 12, 13",
+                    },
+                )
+        self.assertEqual(task.enqueue.call_count, 3)
+        self.assertRedirects(
+            response,
+            reverse("inventory_frontend:bulk_update")
+            + "?moneybird_jobs="
+            + ",".join(
+                str(pk)
+                for pk in MoneybirdAssetJob.objects.order_by("pk").values_list(
+                    "pk", flat=True
+                )
+            ),
+        )
+
+        self._run_all()
+        self.assertEqual(
+            sorted(Asset.objects.values_list("moneybird_asset_id", flat=True)),
+            [11, 12, 13],
+        )
+        self.assertEqual(refresh_from_moneybird.call_count, 3)
+
+    def test_stale_running_jobs_fail(self):
+        """Test jobs that are running for too long are reported as failed."""
+        jobs, errors = queue_moneybird_jobs(
+            self.assets[:2], MoneybirdAssetActions.CREATE, "key"
+        )
+        self.assertEqual(errors, [])
+        MoneybirdAssetJob.objects.update(status=MoneybirdAssetJobStates.RUNNING)
+        MoneybirdAssetJob.objects.filter(pk=jobs[0].pk).update(
+            updated_at=timezone.now() - MONEYBIRD_JOB_TIMEOUT - timedelta(minutes=1)
+        )
+
+        status = self.client.get(
+            reverse("inventory_frontend:moneybird_job_status"),
+            {"ids": ",".join(str(job.pk) for job in jobs)},
+        ).json()
+
+        self.assertEqual(
+            [job["status"] for job in status["jobs"]],
+            [MoneybirdAssetJobStates.FAILED, MoneybirdAssetJobStates.RUNNING],
+        )
+        self.assertFalse(status["finished"])
+
+        # A failed job is not run when it is enqueued again
+        with mock.patch.object(Asset, "create_on_moneybird") as create_on_moneybird:
+            self._run_all()
+        create_on_moneybird.assert_not_called()
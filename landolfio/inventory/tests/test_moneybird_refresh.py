@@ -0,0 +1,105 @@
+"""Test the freshness policy of the stored Moneybird data of assets."""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from inventory.models.asset import Asset
+from inventory.resource_types import AssetResourceType
+from inventory.tests.utils import create_category, create_collection, login_superuser
+from moneybird.webhooks.events import WebhookEvent
+
+MONEYBIRD_DATA = {
+    "id": "123",
+    "name": "V1",
+    "purchase_date": "2024-01-01",
+    "purchase_value": "1000.0",
+    "current_value": "800.0",
+    "disposal": None,
+}
+
+
+@override_settings(MONEYBIRD_DATA_TTL=600)
+class MoneybirdRefreshTest(TestCase):
+    """Test cases for serving and refreshing stored Moneybird data."""
+
+    def setUp(self):
+        """Set up the test case."""
+        cache.clear()
+        category = create_category()
+        collection = create_collection("Verkoop", commerce=True)
+        self.asset = Asset.objects.create(
+            name="V1",
+            category=category,
+            collection=collection,
+            moneybird_asset_id=123,
+        )
+        login_superuser(self.client)
+
+    def test_staleness(self):
+        """Test data is stale until refreshed, and again after the TTL."""
+        self.assertTrue(self.asset.moneybird_data_is_stale)
+
+        self.asset._refresh_from_moneybird(MONEYBIRD_DATA)
+        self.asset.refresh_from_db()
+        self.assertFalse(self.asset.moneybird_data_is_stale)
+
+        self.asset.moneybird_data_refreshed_at = timezone.now() - timedelta(hours=1)
+        self.assertTrue(self.asset.moneybird_data_is_stale)
+
+        self.asset.moneybird_asset_id = None
+        self.assertFalse(self.asset.moneybird_data_is_stale)
+
+    @mock.patch("inventory.models.asset.MoneybirdAssetService")
+    def test_detail_page_schedules_refresh(self, service):
+        """Test the detail page does not call Moneybird, but queues a refresh once."""
+        url = reverse("inventory_frontend:detail", args=[self.asset.pk])
+        with mock.patch("inventory.tasks.refresh_asset_from_moneybird") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.get(url)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["moneybird_refresh_pending"])
+        self.assertContains(
+            response,
+            reverse("inventory_frontend:financial_panel", args=[self.asset.pk]),
+        )
+        task.enqueue.assert_called_once_with(asset_id=str(self.asset.pk))
+        service.assert_not_called()
+
+    def test_fresh_detail_page_does_not_refresh(self):
+        """Test fresh data is served without scheduling a refresh."""
+        self.asset._refresh_from_moneybird(MONEYBIRD_DATA)
+        with mock.patch("inventory.tasks.refresh_asset_from_moneybird") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.get(
+                    reverse("inventory_frontend:detail", args=[self.asset.pk])
+                )
+        self.assertFalse(response.context["moneybird_refresh_pending"])
+        task.enqueue.assert_not_called()
+
+    def test_financial_panel(self):
+        """Test the financial panel endpoint renders the stored values."""
+        self.asset._refresh_from_moneybird(MONEYBIRD_DATA)
+        data = self.client.get(
+            reverse("inventory_frontend:financial_panel", args=[self.asset.pk])
+        ).json()
+        self.assertFalse(data["stale"])
+        self.assertIn("800", data["html"])
+
+    @mock.patch("inventory.models.asset.MoneybirdAssetService")
+    def test_webhook_marks_data_fresh(self, service):
+        """Test a webhook stores its payload without fetching the asset again."""
+        AssetResourceType.process_webhook_event(
+            "123", MONEYBIRD_DATA, WebhookEvent.COMPANY_ASSETS_ASSET_UPDATED
+        )
+        self.asset.refresh_from_db()
+        self.assertFalse(self.asset.moneybird_data_is_stale)
+        self.assertEqual(self.asset.current_value, 800)
+        service.assert_not_called()
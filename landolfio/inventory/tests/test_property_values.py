@@ -0,0 +1,163 @@
+"""Test writing the property values of an asset in bulk."""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from inventory.models.asset import Asset
+from inventory.models.asset_property import (
+    AssetProperty,
+    AssetPropertyType,
+    AssetPropertyValue,
+)
+from inventory.models.category import Category
+from inventory.services import save_property_values
+from inventory.tests.utils import create_collection, login_superuser
+
+
+class SavePropertyValuesTest(TestCase):
+    """Test cases for save_property_values."""
+
+    def setUp(self):
+        """Set up the test case."""
+        cache.clear()
+        self.category = Category.objects.create(name="Cellos", name_singular="cello")
+        self.asset = Asset.objects.create(
+            name="C1",
+            category=self.category,
+            collection=create_collection(),
+        )
+        self.length = AssetProperty.objects.create(
+            name="Length", property_type=AssetPropertyType.NUMBER, unit="cm"
+        )
+        self.color = AssetProperty.objects.create(name="Color")
+        self.maker = AssetProperty.objects.create(name="Maker")
+        for asset_property in (self.length, self.color, self.maker):
+            asset_property.categories.add(self.category)
+
+    def _values(self):
+        return dict(
+            AssetPropertyValue.objects.filter(asset=self.asset).values_list(
+                "property__name", "value"
+            )
+        )
+
+    def test_create_update_delete(self):
+        """Test values are created, updated and removed in one call."""
+        AssetPropertyValue.objects.create(
+            asset=self.asset, property=self.color, value="Red"
+        )
+        AssetPropertyValue.objects.create(
+            asset=self.asset, property=self.maker, value="Amati"
+        )
+
+        created, updated, deleted = save_property_values(
+            self.asset, {self.length: " 75.5 ", self.color: "Blue", self.maker: ""}
+        )
+
+        self.assertEqual([value.property for value in created], [self.length])
+        self.assertEqual([value.property for value in updated], [self.color])
+        self.assertEqual([value.property for value in deleted], [self.maker])
+        self.assertEqual(self._values(), {"Length": "75.5", "Color": "Blue"})
+        self.assertEqual(
+            AssetPropertyValue.objects.get(property=self.length).numeric_value,
+            Decimal("75.5"),
+        )
+
+    def test_unchanged_values_are_not_written(self):
+        """Test saving the same values again does not write anything."""
+        save_property_values(self.asset, {self.color: "Red"})
+        with CaptureQueriesContext(connection) as queries:
+            changes = save_property_values(self.asset, {self.color: "Red"})
+        self.assertEqual(changes, ([], [], []))
+        self.assertEqual(len(queries), 1)
+
+    def test_invalid_values_write_nothing(self):
+        """Test one invalid value rejects the whole batch."""
+        with self.assertRaises(ValidationError) as context:
+            save_property_values(self.asset, {self.color: "Red", self.length: "long"})
+        self.assertIn("Length", context.exception.messages[0])
+        self.assertEqual(self._values(), {})
+
+    def test_query_count_is_constant(self):
+        """Test the number of queries does not depend on the number of properties."""
+        with CaptureQueriesContext(connection) as one:
+            save_property_values(self.asset, {self.color: "Red"})
+        with CaptureQueriesContext(connection) as many:
+            save_property_values(
+                self.asset, {self.color: "Blue", self.length: "80", self.maker: "X"}
+            )
+        self.assertEqual(len(one), len(many) - 1)
+
+    def test_detail_page_and_admin(self):
+        """Test the detail page and the admin inline write through the service."""
+        login_superuser(self.client)
+
+        self.client.post(
+            reverse("inventory_frontend:detail", args=[self.asset.pk]),
+            {
+                "action": "update_all",
+                "property_length": "80",
+                "property_color": "Green",
+            },
+        )
+        self.assertEqual(self._values(), {"Length": "80", "Color": "Green"})
+
+        response = self.client.post(
+            reverse("inventory_frontend:detail", args=[self.asset.pk]),
+            {"action": "update_all", "property_length": "long"},
+            follow=True,
+        )
+        self.assertContains(response, "Length: ")
+        self.assertEqual(self._values(), {"Length": "80", "Color": "Green"})
+
+        values = list(
+            AssetPropertyValue.objects.filter(asset=self.asset).order_by(
+                "property__name"
+            )
+        )
+        url = reverse("admin:inventory_asset_change", args=[self.asset.pk])
+        response = self.client.get(url)
+        data = {
+            key: value
+            for key, value in response.context["adminform"].form.initial.items()
+            if value is not None and not isinstance(value, list)
+        }
+        data.update(
+            {
+                "category": self.category.pk,
+                "collection": self.asset.collection_id,
+                "local_status": self.asset.local_status,
+            }
+        )
+        for formset in response.context["inline_admin_formsets"]:
+            prefix = formset.formset.prefix
+            initial = len(formset.formset.initial_forms)
+            data[f"{prefix}-TOTAL_FORMS"] = initial + (
+                1 if prefix == "property_values" else 0
+            )
+            data[f"{prefix}-INITIAL_FORMS"] = initial
+        data.update(
+            {
+                "property_values-0-id": values[0].pk,
+                "property_values-0-asset": self.asset.pk,
+                "property_values-0-property": self.color.pk,
+                "property_values-0-value": "Green",
+                "property_values-0-DELETE": "on",
+                "property_values-1-id": values[1].pk,
+                "property_values-1-asset": self.asset.pk,
+                "property_values-1-property": self.length.pk,
+                "property_values-1-value": "90",
+                "property_values-2-asset": self.asset.pk,
+                "property_values-2-property": self.maker.pk,
+                "property_values-2-value": "Amati",
+            }
+        )
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self._values(), {"Length": "90", "Maker": "Amati"})
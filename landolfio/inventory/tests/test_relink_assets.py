@@ -0,0 +1,74 @@
+"""Test relinking tickets to assets in bulk."""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from inventory.models.asset import Asset
+from inventory.services import relink_tickets_to_assets
+from inventory.tests.utils import create_category, create_collection
+from tickets.models import Ticket
+
+
+class RelinkTicketsTest(TestCase):
+    """Test cases for relink_tickets_to_assets."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.category = create_category()
+        self.collection = create_collection()
+        self.v11 = self._create_asset("V11")
+        self.v12 = self._create_asset("V12")
+        # Tickets created before the assets existed, so nothing was detected
+        self.tickets = Ticket.objects.bulk_create(
+            [
+                Ticket(description="Snaar van V11 kapot"),
+                Ticket(description="V11 en V12 stemmen"),
+                Ticket(description="Geen instrument"),
+                Ticket(description="V12 ophalen"),
+                Ticket(description=None),
+            ]
+        )
+        self.tickets[3].assets.add(self.v11)
+
+    def _create_asset(self, name):
+        return Asset.objects.create(
+            name=name, category=self.category, collection=self.collection
+        )
+
+    def test_relink(self):
+        """Test unlinked tickets are linked and linked tickets are left alone."""
+        stats = relink_tickets_to_assets()
+
+        self.assertEqual(stats["tickets"], 3)
+        self.assertEqual(stats["links"], 3)
+        self.assertEqual(list(self.tickets[0].assets.all()), [self.v11])
+        self.assertCountEqual(self.tickets[1].assets.all(), [self.v11, self.v12])
+        self.assertEqual(list(self.tickets[3].assets.all()), [self.v11])
+
+        stats = relink_tickets_to_assets(include_linked=True)
+        self.assertEqual(stats["tickets"], 4)
+        self.assertCountEqual(self.tickets[3].assets.all(), [self.v11, self.v12])
+
+    def test_queries_per_chunk(self):
+        """Test the links are written with one query per chunk of tickets."""
+        chunks = []
+        with CaptureQueriesContext(connection) as queries:
+            relink_tickets_to_assets(chunk_size=2, progress=chunks.append)
+        # The assets, the tickets and the links of each chunk
+        self.assertEqual(len(chunks), 2)
+        self.assertLessEqual(len(queries), 2 + len(chunks))
+
+    def test_resume(self):
+        """Test a run can be resumed after the last ticket of an earlier run."""
+        out = StringIO()
+        call_command(
+            "relinkassets", start_after=self.tickets[0].pk, chunk_size=1, stdout=out
+        )
+        self.assertFalse(self.tickets[0].assets.exists())
+        self.assertEqual(self.tickets[1].assets.count(), 2)
+        self.assertIn(f"last id {self.tickets[2].pk}", out.getvalue())
+        self.assertIn("Successfully relinked 2 tickets", out.getvalue())
@@ -0,0 +1,87 @@
+"""Test the image renditions of attachments."""
+
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from PIL import Image
+
+from inventory.models.asset import Asset
+from inventory.models.attachment import Attachment
+from inventory.renditions import update_attachment_renditions
+from inventory.tests.utils import (
+    TemporaryMediaRootMixin,
+    create_category,
+    create_collection,
+)
+
+
+def make_image(size=(2000, 1000), mode="RGBA", image_format="PNG"):
+    buffer = BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128)[: len(mode)]).save(buffer, image_format)
+    return ContentFile(buffer.getvalue())
+
+
+class AttachmentRenditionsTest(TemporaryMediaRootMixin, TestCase):
+    """Test cases for generating and serving renditions."""
+
+    def setUp(self):
+        """Set up the test case."""
+        super().setUp()
+        category = create_category()
+        collection = create_collection()
+        self.asset = Asset.objects.create(
+            name="V1", category=category, collection=collection
+        )
+
+    def _create_attachment(self, filename="photo.png", content=None):
+        attachment = Attachment(asset=self.asset)
+        attachment.attachment.save(filename, content or make_image(), save=False)
+        with mock.patch("inventory.tasks.generate_attachment_renditions") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                attachment.save()
+        return attachment, task.enqueue
+
+    def test_upload_schedules_renditions(self):
+        """Test saving a new image queues the rendition task."""
+        attachment, enqueue = self._create_attachment()
+        enqueue.assert_called_once_with(attachment_id=attachment.pk)
+
+    def test_non_image_is_not_processed(self):
+        """Test non-image attachments do not get renditions."""
+        _, enqueue = self._create_attachment("invoice.pdf", ContentFile(b"%PDF-1.4"))
+        enqueue.assert_not_called()
+
+    def test_generate_renditions(self):
+        """Test all sizes and formats are generated next to the original."""
+        attachment, _ = self._create_attachment()
+        renditions = update_attachment_renditions(attachment)
+        self.assertEqual(
+            set(renditions),
+            {"thumbnail", "thumbnail_webp", "medium", "medium_webp"},
+        )
+
+        storage = attachment.attachment.storage
+        with storage.open(renditions["thumbnail"]) as thumbnail:
+            image = Image.open(thumbnail)
+            self.assertEqual(image.format, "JPEG")
+            self.assertEqual(image.size, (256, 128))
+        with storage.open(renditions["medium_webp"]) as medium:
+            self.assertEqual(Image.open(medium).format, "WEBP")
+
+        attachment.refresh_from_db()
+        self.assertEqual(attachment.thumbnail_url, storage.url(renditions["thumbnail"]))
+        self.assertTrue(
+            renditions["thumbnail"].startswith(attachment.attachment.name[:-4])
+        )
+
+        attachment.delete()
+        for name in renditions.values():
+            self.assertFalse(storage.exists(name))
+
+    def test_missing_renditions_fall_back_to_original(self):
+        """Test URLs fall back to the original until renditions exist."""
+        attachment, _ = self._create_attachment()
+        self.assertEqual(attachment.thumbnail_url, attachment.attachment.url)
+        self.assertIsNone(attachment.thumbnail_webp_url)
@@ -0,0 +1,68 @@
+"""Test the cached status presentation of assets."""
+
+from datetime import date
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from inventory.models.asset import Asset
+from inventory.models.status_change import StatusChange, annotate_current_status
+from inventory.models.status_type import StatusType, get_status_types
+from inventory.tests.utils import create_category, create_collection
+
+
+class AssetStatusCacheTest(TestCase):
+    """Test cases for the per-asset and per-process status caches."""
+
+    def setUp(self):
+        """Set up the test case."""
+        cache.clear()
+        category = create_category()
+        collection = create_collection()
+        StatusType.objects.create(slug="divested", name="Divested")
+        for number in range(5):
+            asset = Asset.objects.create(
+                name=f"V{number}",
+                category=category,
+                collection=collection,
+                moneybird_asset_id=number + 1,
+                disposal="divested",
+                moneybird_data={"sources": [{"id": 1}]},
+            )
+            StatusChange.objects.create(
+                asset=asset, new_status="sold", status_date=date(2025, 1, 1)
+            )
+
+    def test_badges_do_not_query_per_asset(self):
+        """Test rendering the badges of a list costs no queries per asset."""
+        get_status_types()
+        assets = list(annotate_current_status(Asset.objects.all()))
+        with self.assertNumQueries(0):
+            for asset in assets:
+                self.assertEqual(asset.current_status, "sold")
+                self.assertEqual(asset.financial_status_display, "Divested")
+                self.assertEqual(asset.financial_status_color, "#0d6efd")
+                self.assertFalse(asset.has_status_warning)
+                self.assertIsNone(asset.status_warning_message)
+
+    def test_status_change_clears_asset_cache(self):
+        """Test a new status change is reflected on an annotated asset."""
+        asset = annotate_current_status(Asset.objects.filter(name="V0")).get()
+        self.assertFalse(asset.has_status_warning)
+        self.assertNotIn("triangle-exclamation", asset.financial_status_display)
+
+        StatusChange.objects.create(
+            asset=asset, new_status="available", status_date=date(2025, 2, 1)
+        )
+        self.assertEqual(asset.current_status, "available")
+        self.assertTrue(asset.has_status_warning)
+        self.assertIn("triangle-exclamation", asset.financial_status_display)
+
+    def test_status_type_change_clears_cache(self):
+        """Test saving a status type invalidates the cached status types."""
+        self.assertEqual(get_status_types()["divested"].name, "Divested")
+        status_type = StatusType.objects.get(slug="divested")
+        status_type.name = "Verkocht"
+        status_type.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_status_types()["divested"].name, "Verkocht")
@@ -0,0 +1,40 @@
+"""Fixtures shared by the tests of the inventory and the apps built on it."""
+
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from inventory.models.category import Category
+from inventory.models.collection import Collection
+
+
+class TemporaryMediaRootMixin:
+    """Store the files a test writes in a temporary MEDIA_ROOT that is removed after it."""
+
+    def setUp(self):
+        """Set up the temporary MEDIA_ROOT."""
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+def create_category(name="Violins", name_singular="violin"):
+    """Create a category for test assets."""
+    return Category.objects.create(name=name, name_singular=name_singular)
+
+
+def create_collection(name="Verhuur", **kwargs):
+    """Create a collection for test assets."""
+    return Collection.objects.create(name=name, **kwargs)
+
+
+def login_superuser(client):
+    """Create a superuser and log the test client in as them."""
+    user = get_user_model().objects.create_superuser("admin", "a@b.nl", "pw")
+    client.force_login(user)
+    return user
@@ -0,0 +1,265 @@
+import os
+from datetime import timedelta
+
+from django.core import signing
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from PIL import Image, UnidentifiedImageError
+
+from inventory.models.attachment import Attachment
+from inventory.models.attachment_upload import AttachmentUpload, AttachmentUploadStates
+from inventory.renditions import generate_renditions, is_image_name
+
+DIRECT_UPLOAD_MAX_SIZE = 200 * 1024 * 1024
+DIRECT_UPLOAD_EXPIRY = 60 * 60
+# Registration happens when the form is submitted, which may be a while later
+DIRECT_UPLOAD_TOKEN_MAX_AGE = 24 * 60 * 60
+DIRECT_UPLOAD_SALT = "inventory.direct-upload"
+# An upload that is still processing after this long is assumed to be lost, for
+# example because its worker was restarted
+ATTACHMENT_UPLOAD_TIMEOUT = timedelta(minutes=15)
+
+
+class DirectUploadError(Exception):
+    """Raised when a direct upload cannot be accepted or registered."""
+
+
+def uses_presigned_uploads(storage):
+    """Return true if the storage is an S3 bucket that accepts presigned POSTs."""
+    return hasattr(storage, "bucket_name") and hasattr(storage, "connection")
+
+
+def get_upload_name(asset, filename):
+    """
+    Return the storage name for a new attachment of an asset.
+
+    The filename comes from the client, so only its base name is used and it is
+    cleaned like the names of regular uploads. Its stem is shortened when the
+    storage name would not fit the attachment column.
+    """
+    field = Attachment._meta.get_field("attachment")
+    try:
+        filename = get_valid_filename(os.path.basename(filename.replace("\\", "/")))
+    except SuspiciousFileOperation:
+        raise DirectUploadError("Invalid file name")
+
+    name = field.generate_filename(Attachment(asset=asset), filename)
+    excess = len(name) - field.max_length
+    if excess > 0:
+        stem, extension = os.path.splitext(filename)
+        if excess >= len(stem):
+            raise DirectUploadError(f"{filename} has a name that is too long")
+        name = field.generate_filename(
+            Attachment(asset=asset), stem[:-excess] + extension
+        )
+    return name
+
+
+def create_direct_upload(asset, filename, local_url, size=None, content_type=None):
+    """
+    Prepare an upload that the browser sends straight to the storage backend.
+
+    Returns the signed token that identifies the upload, and the URL and form
+    fields the browser must POST the file to (with the file as last field,
+    named "file"). On S3 this is a presigned POST to the bucket, otherwise it is
+    local_url, a view that stores the file with save_local_upload.
+    """
+    if size is not None and not 0 < size <= DIRECT_UPLOAD_MAX_SIZE:
+        raise DirectUploadError(f"{filename} is empty or too large")
+
+    name = get_upload_name(asset, filename)
+    token = signing.dumps(
+        {"asset": str(asset.pk), "name": name}, salt=DIRECT_UPLOAD_SALT
+    )
+    storage = Attachment._meta.get_field("attachment").storage
+
+    if not uses_presigned_uploads(storage):
+        return {
+            "token": token,
+            "url": local_url,
+            "fields": {"token": token},
+        }
+
+    fields = {}
+    conditions = [["content-length-range", 1, DIRECT_UPLOAD_MAX_SIZE]]
+    if content_type:
+        fields["Content-Type"] = content_type
+        conditions.append({"Content-Type": content_type})
+
+    presigned = storage.connection.meta.client.generate_presigned_post(
+        storage.bucket_name,
+        storage._normalize_name(name),
+        Fields=fields,
+        Conditions=conditions,
+        ExpiresIn=DIRECT_UPLOAD_EXPIRY,
+    )
+    return {"token": token, "url": presigned["url"], "fields": presigned["fields"]}
+
+
+def read_upload_token(token, asset=None, max_age=DIRECT_UPLOAD_TOKEN_MAX_AGE):
+    """Return the storage name of a signed upload token."""
+    try:
+        data = signing.loads(token, salt=DIRECT_UPLOAD_SALT, max_age=max_age)
+    except signing.BadSignature:
+        raise DirectUploadError("Invalid or expired upload")
+
+    if asset is not None and data["asset"] != str(asset.pk):
+        raise DirectUploadError("Upload belongs to another asset")
+    return data["name"]
+
+
+def save_local_upload(token, file):
+    """Store a file uploaded to the local stand-in of a presigned POST."""
+    name = read_upload_token(token, max_age=DIRECT_UPLOAD_EXPIRY)
+    if file.size > DIRECT_UPLOAD_MAX_SIZE:
+        raise DirectUploadError(f"{file.name} is too large")
+
+    storage = Attachment._meta.get_field("attachment").storage
+    saved_name = storage.save(name, file)
+    if saved_name != name:
+        # The name was already taken, the token was used before
+        storage.delete(saved_name)
+        raise DirectUploadError("Upload was already stored")
+    return name
+
+
+def queue_direct_uploads(asset, tokens):
+    """
+    Queue files that were uploaded directly to storage for processing.
+
+    Creates an AttachmentUpload for each valid token in one bulk insert, with
+    the order reserved after the existing and queued attachments, and enqueues
+    the processing task for each of them once the transaction commits. Returns
+    the uploads and a list of error messages for tokens that were rejected.
+    """
+    from inventory.tasks import process_attachment_upload
+
+    errors = []
+    names = []
+    for token in tokens:
+        try:
+            name = read_upload_token(token, asset)
+        except DirectUploadError as e:
+            errors.append(str(e))
+            continue
+        if name not in names:
+            names.append(name)
+
+    # Submitting the same form twice should not add the files twice
+    already_queued = set(
+        AttachmentUpload.objects.filter(name__in=names)
+        .exclude(status=AttachmentUploadStates.FAILED)
+        .values_list("name", flat=True)
+    )
+    names = [name for name in names if name not in already_queued]
+    if not names:
+        return [], errors
+
+    with transaction.atomic():
+        max_order = max(
+            asset.attachments.aggregate(Max("order"))["order__max"] or 0,
+            asset.attachment_uploads.filter(
+                status__in=[
+                    AttachmentUploadStates.PENDING,
+                    AttachmentUploadStates.PROCESSING,
+                ]
+            ).aggregate(Max("order"))["order__max"]
+            or 0,
+        )
+        uploads = AttachmentUpload.objects.bulk_create(
+            AttachmentUpload(asset=asset, name=name, order=max_order + index)
+            for index, name in enumerate(names, start=1)
+        )
+        for upload in uploads:
+            transaction.on_commit(
+                lambda upload_id=upload.pk: process_attachment_upload.enqueue(
+                    upload_id=upload_id
+                )
+            )
+
+    return uploads, errors
+
+
+def validate_upload(storage, name):
+    """Check that an uploaded file exists, is not too large and can be opened."""
+    filename = os.path.basename(name)
+    if not storage.exists(name):
+        raise DirectUploadError(
+            f"Upload {filename} is no longer available, please upload it again"
+        )
+    if storage.size(name) > DIRECT_UPLOAD_MAX_SIZE:
+        raise DirectUploadError(f"{filename} is too large")
+
+    if is_image_name(name):
+        try:
+            with storage.open(name, "rb") as file, Image.open(file) as image:
+                image.verify()
+        except Image.DecompressionBombError:
+            raise DirectUploadError(f"{filename} has too many pixels")
+        except (UnidentifiedImageError, OSError):
+            raise DirectUploadError(f"{filename} is not a valid image")
+
+
+def ingest_attachment_upload(upload):
+    """
+    Turn a queued upload into an attachment.
+
+    The file is validated, its renditions are generated (rotated according to
+    the EXIF orientation) and the attachment is registered with the reserved
+    order. Failures are recorded on the upload, so the page can show them.
+    Returns the attachment, or None if the upload failed.
+    """
+    if upload.is_finished:
+        return upload.attachment
+
+    storage = Attachment._meta.get_field("attachment").storage
+    upload.set_status(AttachmentUploadStates.PROCESSING)
+
+    try:
+        validate_upload(storage, upload.name)
+        # The name is passed on creation, so save() does not schedule renditions
+        attachment = Attachment(
+            asset_id=upload.asset_id, attachment=upload.name, order=upload.order
+        )
+        if attachment.is_image:
+            attachment.renditions = generate_renditions(attachment)
+    except DirectUploadError as e:
+        upload.set_status(AttachmentUploadStates.FAILED, str(e))
+        return None
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        upload.set_status(
+            AttachmentUploadStates.FAILED,
+            f"Could not process {upload.filename}: {e}",
+        )
+        return None
+
+    with transaction.atomic():
+        attachment.save()
+        upload.attachment = attachment
+        upload.status = AttachmentUploadStates.DONE
+        upload.error = ""
+        upload.save(update_fields=["attachment", "status", "error", "updated_at"])
+    return attachment
+
+
+def fail_stale_uploads(uploads=None):
+    """
+    Mark uploads that have been processing for longer than ATTACHMENT_UPLOAD_TIMEOUT as failed.
+
+    An upload is marked as processing before it is validated, so an upload whose
+    worker stopped would stay processing forever and the page that queued it
+    would keep polling. Returns the number of uploads that were marked as failed.
+    """
+    if uploads is None:
+        uploads = AttachmentUpload.objects.all()
+    return uploads.filter(
+        status=AttachmentUploadStates.PROCESSING,
+        updated_at__lt=timezone.now() - ATTACHMENT_UPLOAD_TIMEOUT,
+    ).update(
+        status=AttachmentUploadStates.FAILED,
+        error="The upload could not be processed in time, please upload it again.",
+        updated_at=timezone.now(),
+    )
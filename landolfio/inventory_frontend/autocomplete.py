@@ -0,0 +1,109 @@
+import hashlib
+from functools import reduce
+from operator import or_
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_CACHE_TIMEOUT = 30
+AUTOCOMPLETE_MAX_QUERY_LENGTH = 100
+
+
+class AutocompleteEngine:
+    """
+    Search, rank and cache autocomplete suggestions over one or more text fields.
+
+    Matches are ranked exact match first, then prefix matches, then other
+    substring matches. On PostgreSQL, matches within a rank are ordered by
+    trigram similarity, and the pg_trgm indexes created by the migrations serve
+    the case-insensitive lookups. Other databases (SQLite in development) use
+    the same lookups without those indexes. Results are cached for a short time
+    per query, because typing the same prefix is very common.
+    """
+
+    def __init__(
+        self,
+        name,
+        fields,
+        min_length=2,
+        limit=AUTOCOMPLETE_LIMIT,
+        timeout=AUTOCOMPLETE_CACHE_TIMEOUT,
+    ):
+        self.name = name
+        self.fields = list(fields)
+        self.min_length = min_length
+        self.limit = limit
+        self.timeout = timeout
+
+    def clean_query(self, query):
+        """Normalize a query, returning None when it is too short to search."""
+        query = (query or "").strip()[:AUTOCOMPLETE_MAX_QUERY_LENGTH]
+        if len(query) < self.min_length:
+            return None
+        return query
+
+    def _any_field(self, lookup, query):
+        return reduce(
+            or_, (Q(**{f"{field}__{lookup}": query}) for field in self.fields)
+        )
+
+    def search(self, queryset, query):
+        """Filter and rank a queryset, limited to the maximum number of results."""
+        queryset = queryset.filter(self._any_field("icontains", query)).annotate(
+            autocomplete_rank=Case(
+                When(self._any_field("iexact", query), then=Value(0)),
+                When(self._any_field("istartswith", query), then=Value(1)),
+                default=Value(2),
+                output_field=IntegerField(),
+            )
+        )
+        ordering = ["autocomplete_rank"]
+
+        if connections[queryset.db].vendor == "postgresql":
+            from django.contrib.postgres.search import TrigramSimilarity
+
+            similarities = [TrigramSimilarity(field, query) for field in self.fields]
+            queryset = queryset.annotate(
+                autocomplete_similarity=(
+                    Greatest(*similarities)
+                    if len(similarities) > 1
+                    else similarities[0]
+                )
+            )
+            ordering.append(F("autocomplete_similarity").desc(nulls_last=True))
+
+        return queryset.order_by(*ordering, *self.fields)[: self.limit]
+
+    def get_cache_key(self, query, scope=""):
+        digest = hashlib.md5(f"{scope}:{query.lower()}".encode()).hexdigest()
+        return f"autocomplete:{self.name}:{digest}"
+
+    def suggest(self, queryset, query, serialize, scope=""):
+        """
+        Return serialized suggestions for a query, using the short-lived cache.
+
+        The scope distinguishes searches over differently filtered querysets
+        (e.g. the property whose values are completed).
+        """
+        query = self.clean_query(query)
+        if query is None:
+            return []
+
+        cache_key = self.get_cache_key(query, scope)
+        suggestions = cache.get(cache_key)
+        if suggestions is None:
+            suggestions = [serialize(obj) for obj in self.search(queryset, query)]
+            cache.set(cache_key, suggestions, self.timeout)
+        return suggestions
+
+
+asset_autocomplete = AutocompleteEngine("asset", ["name"])
+contact_autocomplete = AutocompleteEngine(
+    "contact", ["company_name", "first_name", "last_name"]
+)
+property_value_autocomplete = AutocompleteEngine(
+    "property_value", ["value"], min_length=1
+)
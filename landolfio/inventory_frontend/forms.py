@@ -1,39 +1,17 @@
+import json
+import uuid
 from datetime import date
 
 from django import forms
 from django.utils.translation import gettext_lazy as _
 
 from accounting.models.contact import Contact
-from inventory.models.asset import Asset, AssetStates
-from inventory.models.location import Location
+from inventory.models.asset import Asset, AssetStates, DisposalReasons
+from inventory.models.location import Location, get_locations
+from inventory.models.moneybird_asset_job import MoneybirdAssetActions
 from inventory.models.status_change import StatusChange
 
 
-def get_locations_hierarchical():
-    """Get locations sorted hierarchically by order field recursively."""
-    all_locations = list(Location.objects.all())
-    location_dict = {loc.id: loc for loc in all_locations}
-
-    # Get ancestry chain order values for sorting
-    def get_order_chain(location):
-        """Returns tuple of order values from root to this location."""
-        chain = []
-        current = location
-        while current:
-            chain.insert(
-                0, (current.order if current.order is not None else 999999, current.id)
-            )
-            if current.parent_id and not current.display_as_root:
-                current = location_dict.get(current.parent_id)
-            else:
-                break
-        return tuple(chain)
-
-    # Sort all locations by their ancestry chain
-    sorted_locations = sorted(all_locations, key=get_order_chain)
-    return sorted_locations
-
-
 class HTML5DateInput(forms.DateInput):
     input_type = "date"
 
@@ -136,7 +114,7 @@ class AssetForm(forms.ModelForm):
         self.fields["is_margin_asset"].required = False
 
         # Set hierarchical location ordering
-        ordered_locations = get_locations_hierarchical()
+        ordered_locations = get_locations()
         # Convert list to queryset with preserved order
         if ordered_locations:
             location_ids = [loc.id for loc in ordered_locations]
@@ -317,3 +295,73 @@ class BulkStatusChangeForm(forms.Form):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.fields["status_date"].initial = date.today()
+
+
+class BulkMoneybirdActionForm(forms.Form):
+    """Form for queueing a Moneybird action for multiple assets at once."""
+
+    asset_ids = forms.CharField(widget=forms.HiddenInput())
+
+    action = forms.ChoiceField(
+        choices=MoneybirdAssetActions.choices,
+        widget=forms.Select(attrs={"class": "form-select"}),
+        label=_("Action"),
+    )
+
+    idempotency_key = forms.CharField(max_length=64, widget=forms.HiddenInput())
+
+    moneybird_asset_ids = forms.CharField(
+        required=False,
+        widget=forms.TextInput(
+            attrs={"class": "form-control", "placeholder": "123, 456"}
+        ),
+        label=_("Moneybird Asset IDs"),
+        help_text=_(
+            "For linking: the Moneybird Asset IDs, comma-separated, in the order of the selected assets"
+        ),
+    )
+
+    disposal_reason = forms.ChoiceField(
+        required=False,
+        choices=[("", "—")] + list(DisposalReasons.choices),
+        widget=forms.Select(attrs={"class": "form-select"}),
+        label=_("Disposal reason"),
+    )
+
+    disposal_date = forms.DateField(
+        required=False,
+        widget=HTML5DateInput(attrs={"class": "form-control"}),
+        input_formats=["%Y-%m-%d"],
+        localize=False,
+        label=_("Disposal date"),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["idempotency_key"].initial = uuid.uuid4().hex
+
+    def clean_asset_ids(self):
+        try:
+            asset_ids = [
+                uuid.UUID(str(pk)) for pk in json.loads(self.cleaned_data["asset_ids"])
+            ]
+        except (TypeError, ValueError):
+            raise forms.ValidationError(_("Invalid asset data"))
+        if not asset_ids:
+            raise forms.ValidationError(_("Please select at least one asset"))
+        # Keep the order, the Moneybird Asset IDs to link follow it
+        return list(dict.fromkeys(asset_ids))
+
+    def clean_moneybird_asset_ids(self):
+        value = self.cleaned_data["moneybird_asset_ids"]
+        return [pk.strip() for pk in value.split(",") if pk.strip()]
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get("action") == MoneybirdAssetActions.LINK and len(
+            cleaned_data.get("moneybird_asset_ids", [])
+        ) != len(cleaned_data.get("asset_ids", [])):
+            raise forms.ValidationError(
+                _("Provide one Moneybird Asset ID for every selected asset")
+            )
+        return cleaned_data
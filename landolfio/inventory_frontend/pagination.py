@@ -0,0 +1,167 @@
+import base64
+import binascii
+import json
+from functools import cached_property
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+
+
+def approximate_count(queryset):
+    """
+    Return a cheap estimate of the number of rows in a queryset.
+
+    On PostgreSQL this uses the planner's row estimate, so it never scans the
+    result set. Other databases fall back to an exact count.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    try:
+        plan = json.loads(queryset.order_by().explain(format="json"))
+        return max(int(plan[0]["Plan"]["Plan Rows"]), 0)
+    except (ValueError, KeyError, IndexError, TypeError):
+        return queryset.count()
+
+
+class KeysetPage:
+    """A page of results from a KeysetPaginator."""
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the last seen row instead of using OFFSET.
+
+    The ordering must consist of plain, non-nullable model fields. The primary key
+    is appended as a tie-breaker, so the order is always total. A cursor encodes
+    the ordering values of the first or last row of a page together with the
+    direction to seek in, so every page costs the same as the first one.
+    """
+
+    def __init__(self, queryset, per_page, ordering, approximate=True):
+        self.per_page = int(per_page)
+        self.ordering = list(ordering)
+        if not any(field.lstrip("-") in ("pk", "id") for field in self.ordering):
+            self.ordering.append("pk")
+        self.queryset = queryset.order_by(*self.ordering)
+        self.approximate = approximate
+
+    @cached_property
+    def count(self):
+        """Return the (possibly approximate) total number of objects."""
+        if self.approximate:
+            return approximate_count(self.queryset)
+        return self.queryset.count()
+
+    def get_page(self, cursor):
+        """
+        Return the page for a cursor, falling back to the first page.
+
+        Invalid or tampered cursors are not an error, just like Django's
+        Paginator.get_page() does for out-of-range page numbers.
+        """
+        try:
+            direction, values = self.decode_cursor(cursor) if cursor else (None, None)
+        except (ValueError, ValidationError):
+            direction, values = None, None
+
+        if direction == "previous":
+            reversed_ordering = [self._reverse(field) for field in self.ordering]
+            queryset = self.queryset.filter(self._seek_filter(values, reverse=True))
+            rows = list(queryset.order_by(*reversed_ordering)[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[: self.per_page][::-1]
+            has_previous, has_next = has_more, True
+        else:
+            queryset = self.queryset
+            if direction == "next":
+                queryset = queryset.filter(self._seek_filter(values))
+            rows = list(queryset[: self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            has_previous = direction == "next"
+
+        next_cursor = None
+        previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor("next", rows[-1])
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor("previous", rows[0])
+        return KeysetPage(rows, self, next_cursor, previous_cursor)
+
+    def encode_cursor(self, direction, obj):
+        """Encode the ordering values of an object into an opaque cursor."""
+        values = [getattr(obj, self._field_name(field)) for field in self.ordering]
+        # Not DjangoJSONEncoder: it truncates datetimes to milliseconds
+        payload = json.dumps({"d": direction, "v": values}, default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """Decode a cursor into a direction and the ordering values."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            direction = payload["d"]
+            raw_values = payload["v"]
+        except (binascii.Error, UnicodeDecodeError, KeyError, TypeError) as e:
+            raise ValueError("Invalid cursor") from e
+
+        if direction not in ("next", "previous") or not isinstance(raw_values, list):
+            raise ValueError("Invalid cursor")
+        if len(raw_values) != len(self.ordering):
+            raise ValueError("Cursor does not match the ordering")
+
+        model = self.queryset.model
+        values = []
+        for field, raw_value in zip(self.ordering, raw_values):
+            name = self._field_name(field)
+            model_field = (
+                model._meta.pk if name == "pk" else model._meta.get_field(name)
+            )
+            values.append(model_field.to_python(raw_value))
+        return direction, values
+
+    def _seek_filter(self, values, reverse=False):
+        """Build the filter selecting all rows after (or before) the given values."""
+        seek = Q()
+        for index, field in enumerate(self.ordering):
+            descending = field.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            condition = {
+                self._field_name(previous): values[i]
+                for i, previous in enumerate(self.ordering[:index])
+            }
+            condition[f"{self._field_name(field)}__{lookup}"] = values[index]
+            seek |= Q(**condition)
+        return seek
+
+    @staticmethod
+    def _field_name(field):
+        return field.lstrip("-")
+
+    @staticmethod
+    def _reverse(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
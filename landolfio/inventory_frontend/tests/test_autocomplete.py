@@ -0,0 +1,55 @@
+"""Test the autocomplete engine."""
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from inventory.models.asset import Asset
+from inventory.tests.utils import create_category, create_collection, login_superuser
+from inventory_frontend.autocomplete import AutocompleteEngine
+
+
+class AutocompleteEngineTest(TestCase):
+    """Test cases for ranking, limiting and caching suggestions."""
+
+    def setUp(self):
+        """Set up the test case."""
+        cache.clear()
+        category = create_category()
+        collection = create_collection()
+        for name in ["XV12", "V12B", "V12", "AV12C", "V1", "V123"]:
+            Asset.objects.create(name=name, category=category, collection=collection)
+
+    def test_ranking(self):
+        """Test exact matches rank before prefix matches before other matches."""
+        engine = AutocompleteEngine("test", ["name"])
+        names = [asset.name for asset in engine.search(Asset.objects.all(), "v12")]
+        self.assertEqual(names, ["V12", "V123", "V12B", "AV12C", "XV12"])
+
+    def test_limit(self):
+        """Test the number of suggestions is strictly limited."""
+        engine = AutocompleteEngine("test", ["name"], limit=2)
+        self.assertEqual(len(engine.search(Asset.objects.all(), "V")), 2)
+
+    def test_short_query(self):
+        """Test queries below the minimum length do not hit the database."""
+        engine = AutocompleteEngine("test", ["name"])
+        with self.assertNumQueries(0):
+            self.assertEqual(engine.suggest(Asset.objects.all(), " V ", str), [])
+
+    def test_suggestions_are_cached(self):
+        """Test repeated prefixes are served from the cache."""
+        engine = AutocompleteEngine("test", ["name"])
+        first = engine.suggest(Asset.objects.all(), "V12", lambda a: a.name)
+        with self.assertNumQueries(0):
+            second = engine.suggest(Asset.objects.all(), "v12", lambda a: a.name)
+        self.assertEqual(first, second)
+
+    def test_asset_autocomplete_view(self):
+        """Test the asset autocomplete endpoint."""
+        login_superuser(self.client)
+        response = self.client.get(
+            reverse("inventory_frontend:autocomplete"), {"q": "V12"}
+        )
+        self.assertEqual(response.json()[0]["name"], "V12")
+        self.assertEqual(response.json()[0]["current_status"], "unknown")
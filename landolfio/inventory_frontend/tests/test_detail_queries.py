@@ -0,0 +1,116 @@
+"""Test the number of queries of the asset detail page."""
+
+from datetime import date
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from inventory.models.asset import Asset, AssetStates
+from inventory.models.asset_property import AssetProperty, AssetPropertyValue
+from inventory.models.attachment import Attachment
+from inventory.models.location import (
+    LOCATIONS_CACHE_KEY,
+    LOCATIONS_CACHE_TIMEOUT,
+    Location,
+    get_locations,
+)
+from inventory.models.status_change import StatusChange
+from inventory.models.status_type import StatusType
+from inventory.tests.utils import (
+    TemporaryMediaRootMixin,
+    create_category,
+    create_collection,
+    login_superuser,
+)
+
+
+class AssetDetailQueriesTest(TemporaryMediaRootMixin, TestCase):
+    """Test cases for the queries of AssetDetailView."""
+
+    def setUp(self):
+        """Set up the test case."""
+        super().setUp()
+        cache.clear()
+        StatusType.objects.create(slug="available", name="Available")
+        self.category = create_category()
+        self.collection = create_collection()
+        self.building = Location.objects.create(name="Building")
+        self.shelf = Location.objects.create(name="Shelf", parent=self.building)
+        self.maker = AssetProperty.objects.create(name="Maker")
+        self.maker.categories.add(self.category)
+        login_superuser(self.client)
+
+    def _create_asset(self, name, related_count):
+        asset = Asset.objects.create(
+            name=name,
+            category=self.category,
+            collection=self.collection,
+            local_status=AssetStates.AVAILABLE,
+            location=self.shelf,
+        )
+        AssetPropertyValue.objects.create(
+            asset=asset, property=self.maker, value="Stradivari"
+        )
+        for number in range(related_count):
+            Attachment.objects.create(
+                asset=asset,
+                attachment=ContentFile(b"%PDF", name=f"{number}.pdf"),
+            )
+            StatusChange.objects.create(
+                asset=asset,
+                new_status=AssetStates.AVAILABLE,
+                status_date=date(2024, 1, number + 1),
+            )
+            Location.objects.create(name=f"Box {name}{number}", parent=self.shelf)
+        return asset
+
+    def _count_queries(self, asset):
+        url = reverse("inventory_frontend:detail", args=[asset.pk])
+        # Fill the caches of the reference data
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_query_count_is_constant(self):
+        """Test the number of queries does not grow with the related objects."""
+        few, _ = self._count_queries(self._create_asset("V1", 1))
+        many, response = self._count_queries(self._create_asset("V2", 8))
+
+        self.assertEqual(few, many)
+        self.assertLessEqual(many, 8)
+        self.assertContains(response, "Building › Shelf")
+        self.assertContains(response, "Stradivari")
+
+    def test_caches_are_cleared(self):
+        """Test changing locations and properties clears their cached data."""
+        self.assertEqual(len(get_locations()), 2)
+        Location.objects.create(name="Attic")
+        self.assertEqual(len(get_locations()), 3)
+
+        asset = self._create_asset("V1", 0)
+        url = reverse("inventory_frontend:detail", args=[asset.pk])
+        self.client.get(url)
+
+        length = AssetProperty.objects.create(name="Length", property_type="number")
+        length.categories.add(self.category)
+        properties = self.client.get(url).context["asset_properties"]
+        self.assertEqual(
+            [data["property"].name for data in properties], ["Length", "Maker"]
+        )
+
+    def test_stale_locations_cache(self):
+        """Test a location missing from the cached locations is still shown."""
+        asset = self._create_asset("V1", 0)
+        cache.set(LOCATIONS_CACHE_KEY, [self.building], LOCATIONS_CACHE_TIMEOUT)
+
+        url = reverse("inventory_frontend:detail", args=[asset.pk])
+        response = self.client.get(url)
+
+        self.assertEqual(response.context["asset"].location, self.shelf)
+        self.assertContains(response, "Building › Shelf")
@@ -0,0 +1,223 @@
+"""Test uploading attachments directly to storage and processing them."""
+
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from inventory.models.asset import Asset
+from inventory.models.attachment import Attachment
+from inventory.models.attachment_upload import AttachmentUpload, AttachmentUploadStates
+from inventory.tasks import process_attachment_upload
+from inventory.tests.utils import (
+    TemporaryMediaRootMixin,
+    create_category,
+    create_collection,
+    login_superuser,
+)
+from inventory.uploads import (
+    ATTACHMENT_UPLOAD_TIMEOUT,
+    queue_direct_uploads,
+    read_upload_token,
+)
+
+
+def make_jpeg():
+    buffer = BytesIO()
+    Image.new("RGB", (600, 300), (200, 30, 30)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+class DirectUploadTest(TemporaryMediaRootMixin, TestCase):
+    """Test cases for the direct upload flow with local storage."""
+
+    def setUp(self):
+        """Set up the test case."""
+        super().setUp()
+        category = create_category()
+        collection = create_collection()
+        self.asset = Asset.objects.create(
+            name="V1", category=category, collection=collection
+        )
+        Attachment.objects.create(
+            asset=self.asset,
+            attachment=SimpleUploadedFile("existing.pdf", b"%PDF"),
+            order=4,
+        )
+        login_superuser(self.client)
+
+    def _upload(self, name, content=b"content"):
+        target = self.client.post(
+            reverse(
+                "inventory_frontend:attachment_upload_target", args=[self.asset.pk]
+            ),
+            {"name": name, "size": len(content), "type": "image/jpeg"},
+            content_type="application/json",
+        ).json()
+        self.assertTrue(target["success"])
+        response = self.client.post(
+            target["url"],
+            {**target["fields"], "file": SimpleUploadedFile(name, content)},
+        )
+        self.assertEqual(response.status_code, 201)
+        return target["token"]
+
+    def _process_all(self):
+        for upload in AttachmentUpload.objects.order_by("pk"):
+            process_attachment_upload.call(upload_id=upload.pk)
+
+    def test_upload_queue_and_process(self):
+        """Test files are processed into attachments after the existing ones."""
+        tokens = [
+            self._upload(f"photo.{number}.jpg", make_jpeg()) for number in range(3)
+        ]
+
+        with mock.patch("inventory.tasks.process_attachment_upload") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse("inventory_frontend:detail", args=[self.asset.pk]),
+                    {"filepond": tokens},
+                )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(task.enqueue.call_count, 3)
+        self.assertFalse(self.asset.attachments.exclude(order=4).exists())
+
+        uploads = list(AttachmentUpload.objects.order_by("pk"))
+        status_url = reverse(
+            "inventory_frontend:attachment_upload_status", args=[self.asset.pk]
+        )
+        ids = ",".join(str(upload.pk) for upload in uploads)
+        status = self.client.get(status_url, {"ids": ids}).json()
+        self.assertFalse(status["finished"])
+        self.assertEqual(
+            [upload["status"] for upload in status["uploads"]], ["pending"] * 3
+        )
+
+        self._process_all()
+
+        status = self.client.get(status_url, {"ids": ids}).json()
+        self.assertTrue(status["finished"])
+        attachments = list(self.asset.attachments.exclude(order=4))
+        self.assertEqual([attachment.order for attachment in attachments], [5, 6, 7])
+        self.assertTrue(attachments[0].filename.startswith("V1-photo.0-"))
+        self.assertEqual(
+            set(attachments[0].renditions),
+            {"thumbnail", "thumbnail_webp", "medium", "medium_webp"},
+        )
+
+    def test_queue_is_batched(self):
+        """Test queueing more files does not run more queries."""
+        few = [self._upload(f"a{number}.pdf") for number in range(2)]
+        many = [self._upload(f"b{number}.pdf") for number in range(6)]
+
+        with CaptureQueriesContext(connection) as few_queries:
+            queue_direct_uploads(self.asset, few)
+        with CaptureQueriesContext(connection) as many_queries:
+            uploads, errors = queue_direct_uploads(self.asset, many)
+
+        self.assertEqual(len(few_queries), len(many_queries))
+        self.assertEqual([upload.order for upload in uploads], [7, 8, 9, 10, 11, 12])
+        self.assertEqual(errors, [])
+
+    def test_invalid_image_fails(self):
+        """Test a file that is not a valid image is reported as failed."""
+        token = self._upload("photo.jpg", b"not an image")
+        upload = queue_direct_uploads(self.asset, [token])[0][0]
+        self._process_all()
+
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, AttachmentUploadStates.FAILED)
+        self.assertIn("not a valid image", upload.error)
+        self.assertIsNone(upload.attachment)
+
+    def test_upload_names_are_cleaned(self):
+        """Test client file names cannot leave the directory or overflow the column."""
+        cases = {
+            "../../settings.py": "V1-settings-",
+            "C:\\Users\\me\\my photo.jpg": "V1-my_photo-",
+            "a" * 300 + ".pdf": "V1-aaaa",
+        }
+        for filename, prefix in cases.items():
+            with self.subTest(filename=filename):
+                name = read_upload_token(self._upload(filename))
+                self.assertTrue(
+                    name.startswith(f"inventory/attachments/{self.asset.pk}/{prefix}")
+                )
+                self.assertLessEqual(len(name), 255)
+                self.assertNotIn("..", name)
+
+    def test_invalid_upload_target_requests(self):
+        """Test invalid names and sizes are rejected with a bad request."""
+        url = reverse(
+            "inventory_frontend:attachment_upload_target", args=[self.asset.pk]
+        )
+        for data in [
+            {"name": "photo.jpg", "size": "large"},
+            {"name": "photo.jpg", "size": [1]},
+            {"name": "photo.jpg", "size": 0},
+            {"name": "..", "size": 10},
+            {"name": "a." + "b" * 300, "size": 10},
+            ["photo.jpg"],
+        ]:
+            with self.subTest(data=data):
+                response = self.client.post(url, data, content_type="application/json")
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()["success"])
+
+    def test_decompression_bomb_fails(self):
+        """Test an image with too many pixels is reported as failed."""
+        token = self._upload("photo.jpg", make_jpeg())
+        upload = queue_direct_uploads(self.asset, [token])[0][0]
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 10):
+            self._process_all()
+
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, AttachmentUploadStates.FAILED)
+        self.assertIn("too many pixels", upload.error)
+
+    def test_stale_processing_uploads_fail(self):
+        """Test uploads that are processing for too long are reported as failed."""
+        tokens = [self._upload("a.pdf"), self._upload("b.pdf")]
+        uploads = queue_direct_uploads(self.asset, tokens)[0]
+        AttachmentUpload.objects.update(status=AttachmentUploadStates.PROCESSING)
+        AttachmentUpload.objects.filter(pk=uploads[0].pk).update(
+            updated_at=timezone.now() - ATTACHMENT_UPLOAD_TIMEOUT - timedelta(minutes=1)
+        )
+
+        status = self.client.get(
+            reverse(
+                "inventory_frontend:attachment_upload_status", args=[self.asset.pk]
+            ),
+            {"ids": ",".join(str(upload.pk) for upload in uploads)},
+        ).json()
+
+        self.assertEqual(
+            [upload["status"] for upload in status["uploads"]],
+            [AttachmentUploadStates.FAILED, AttachmentUploadStates.PROCESSING],
+        )
+        self.assertFalse(status["finished"])
+
+    def test_rejects_invalid_tokens(self):
+        """Test forged, foreign and repeated uploads are not queued."""
+        token = self._upload("photo.pdf")
+        other = Asset.objects.create(
+            name="V2", category=self.asset.category, collection=self.asset.collection
+        )
+
+        self.assertEqual(queue_direct_uploads(other, [token])[0], [])
+        self.assertEqual(queue_direct_uploads(self.asset, [token + "x"])[0], [])
+        self.assertEqual(len(queue_direct_uploads(self.asset, [token, token])[0]), 1)
+        self.assertEqual(queue_direct_uploads(self.asset, [token])[0], [])
+
+        response = self.client.post(
+            reverse("inventory_frontend:attachment_direct_upload"),
+            {"token": token, "file": SimpleUploadedFile("photo.pdf", b"again")},
+        )
+        self.assertEqual(response.status_code, 400)
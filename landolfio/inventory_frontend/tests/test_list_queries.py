@@ -0,0 +1,79 @@
+"""Test the number of queries used to render the asset list."""
+
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from inventory.models.asset import Asset
+from inventory.models.asset_property import AssetProperty, AssetPropertyValue
+from inventory.models.attachment import Attachment
+from inventory.models.location import Location
+from inventory.models.status_type import StatusType
+from inventory.tests.utils import (
+    TemporaryMediaRootMixin,
+    create_category,
+    create_collection,
+    login_superuser,
+)
+
+
+class AssetListQueriesTest(TemporaryMediaRootMixin, TestCase):
+    """Test the asset list does not run queries per asset."""
+
+    def setUp(self):
+        """Set up the test case."""
+        super().setUp()
+        StatusType.objects.create(slug="available", name="Available")
+        self.category = create_category()
+        self.collection = create_collection()
+        self.property = AssetProperty.objects.create(name="Maker")
+        self.property.categories.add(self.category)
+        building = Location.objects.create(name="Building")
+        self.location = Location.objects.create(name="Shelf", parent=building)
+
+        login_superuser(self.client)
+
+    def _create_assets(self, count):
+        for number in range(Asset.objects.count(), count):
+            asset = Asset.objects.create(
+                name=f"V{number}",
+                category=self.category,
+                collection=self.collection,
+                location=self.location,
+                local_status="available",
+            )
+            AssetPropertyValue.objects.create(
+                asset=asset, property=self.property, value="Stradivarius"
+            )
+            for order in range(2):
+                Attachment.objects.create(
+                    asset=asset,
+                    attachment=ContentFile(b"%PDF-1.4", name=f"{number}-{order}.pdf"),
+                    order=order,
+                )
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("inventory_frontend:list"))
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_query_count_is_independent_of_page_size(self):
+        """Test rendering more assets on a page does not run more queries."""
+        self._create_assets(2)
+        few = self._count_queries()
+        self._create_assets(6)
+        self.assertEqual(
+            len(self.client.get(reverse("inventory_frontend:list")).context["assets"]),
+            6,
+        )
+        self.assertEqual(self._count_queries(), few)
+
+    def test_renders_cover_and_attachment_count(self):
+        """Test the prefetched attachments still show the cover and count."""
+        self._create_assets(1)
+        response = self.client.get(reverse("inventory_frontend:list"))
+        self.assertContains(response, "Building › Shelf")
+        self.assertContains(response, "fa-camera")
@@ -0,0 +1,87 @@
+"""Test keyset pagination of the asset list."""
+
+from django.test import TestCase
+from django.urls import reverse
+
+from inventory.models.asset import Asset
+from inventory.tests.utils import create_category, create_collection, login_superuser
+from inventory_frontend.pagination import KeysetPaginator
+
+
+class KeysetPaginatorTest(TestCase):
+    """Test cases for the KeysetPaginator."""
+
+    def setUp(self):
+        """Set up the test case."""
+        category = create_category()
+        collection = create_collection()
+        for number in range(7):
+            Asset.objects.create(
+                name=f"V{number}", category=category, collection=collection
+            )
+
+    def _walk(self, ordering):
+        paginator = KeysetPaginator(Asset.objects.all(), 3, ordering)
+        names = []
+        page = paginator.get_page(None)
+        pages = [page]
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor)
+            pages.append(page)
+        for page in pages:
+            names.extend(asset.name for asset in page)
+        return paginator, pages, names
+
+    def test_walks_all_rows_once(self):
+        """Test following next cursors yields every row exactly once in order."""
+        _, pages, names = self._walk(["-name"])
+        self.assertEqual(names, [f"V{n}" for n in range(6, -1, -1)])
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertFalse(pages[0].has_previous())
+        self.assertTrue(pages[-1].has_previous())
+
+    def test_mixed_direction_ordering(self):
+        """Test ordering on a shared timestamp falls back to the next key."""
+        Asset.objects.update(created_at=Asset.objects.first().created_at)
+        _, _, names = self._walk(["-created_at", "name"])
+        self.assertEqual(names, [f"V{n}" for n in range(7)])
+
+    def test_previous_cursor(self):
+        """Test going back returns the preceding page."""
+        paginator, pages, _ = self._walk(["name"])
+        previous = paginator.get_page(pages[2].previous_cursor)
+        self.assertEqual([asset.name for asset in previous], ["V3", "V4", "V5"])
+        self.assertTrue(previous.has_previous())
+        self.assertTrue(previous.has_next())
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Test an invalid cursor falls back to the first page."""
+        paginator = KeysetPaginator(Asset.objects.all(), 3, ["name"])
+        page = paginator.get_page("not-a-cursor")
+        self.assertEqual([asset.name for asset in page], ["V0", "V1", "V2"])
+
+    def test_count(self):
+        """Test the count, which is exact on databases without estimates."""
+        paginator = KeysetPaginator(Asset.objects.all(), 3, ["name"])
+        self.assertEqual(paginator.count, 7)
+
+    def test_list_view_cursor_mode(self):
+        """Test the list view and its infinite scroll endpoint in cursor mode."""
+        login_superuser(self.client)
+        url = reverse("inventory_frontend:list")
+
+        response = self.client.get(
+            url, {"pagination": "cursor", "sort": "name", "q": "V"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [asset.name for asset in response.context["assets"]],
+            [f"V{n}" for n in range(7)],
+        )
+        self.assertNotIn("next_page_url", response.context)
+
+        partial = self.client.get(
+            url, {"pagination": "cursor", "sort": "name", "partial": "1", "q": "V"}
+        ).json()
+        self.assertIn("V0", partial["grid_html"])
+        self.assertIsNone(partial["next_url"])
@@ -0,0 +1,103 @@
+"""Test the streaming ZIP download of attachments."""
+
+import io
+import os
+import tracemalloc
+import zipfile
+
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from django.urls import reverse
+
+from inventory.models.asset import Asset
+from inventory.models.attachment import Attachment
+from inventory.tests.utils import (
+    TemporaryMediaRootMixin,
+    create_category,
+    create_collection,
+    login_superuser,
+)
+from inventory_frontend.zipstream import stream_zip, unique_archive_names
+
+FILE_SIZE = 4 * 1024 * 1024
+
+
+class StreamZipTest(TemporaryMediaRootMixin, TestCase):
+    """Test cases for streaming attachment bundles."""
+
+    def setUp(self):
+        """Set up the test case."""
+        super().setUp()
+        category = create_category()
+        collection = create_collection()
+        self.asset = Asset.objects.create(
+            name="V1", category=category, collection=collection
+        )
+
+    def _create_attachment(self, name, content):
+        return Attachment.objects.create(
+            asset=self.asset, attachment=ContentFile(content, name=name)
+        )
+
+    def _peak_memory(self, attachments):
+        files = [
+            (attachment.filename, attachment.attachment) for attachment in attachments
+        ]
+        tracemalloc.start()
+        try:
+            size = sum(len(chunk) for chunk in stream_zip(files))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(size, FILE_SIZE * len(attachments) // 2)
+        return peak
+
+    def test_peak_memory_is_flat(self):
+        """Test memory use does not grow with the size of the bundle."""
+        attachments = [
+            self._create_attachment(f"scan{number}.dat", os.urandom(FILE_SIZE))
+            for number in range(6)
+        ]
+        small = self._peak_memory(attachments[:2])
+        large = self._peak_memory(attachments)
+        self.assertLess(small, FILE_SIZE // 4)
+        self.assertLess(large, FILE_SIZE // 4)
+
+    def test_archive_contents(self):
+        """Test entries are complete and images are stored without deflating."""
+        photo = self._create_attachment("photo.jpg", b"\xff\xd8" + b"x" * 1000)
+        notes = self._create_attachment("notes.txt", b"hello " * 1000)
+        files = [("photo.jpg", photo.attachment), ("notes.txt", notes.attachment)]
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_zip(files))))
+
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.getinfo("photo.jpg").compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(
+            archive.getinfo("notes.txt").compress_type, zipfile.ZIP_DEFLATED
+        )
+        self.assertEqual(archive.read("notes.txt"), b"hello " * 1000)
+
+    def test_unique_archive_names(self):
+        """Test duplicate file names are numbered."""
+        self.assertEqual(
+            list(unique_archive_names(["a.jpg", "a.jpg", "b.jpg", "a.jpg"])),
+            ["a.jpg", "a (2).jpg", "b.jpg", "a (3).jpg"],
+        )
+
+    def test_download_view_streams(self):
+        """Test the download view streams the selected attachments."""
+        first = self._create_attachment("one.pdf", b"%PDF-1.4 one")
+        second = self._create_attachment("two.pdf", b"%PDF-1.4 two")
+        login_superuser(self.client)
+
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                reverse(
+                    "inventory_frontend:attachment_download_zip", args=[self.asset.pk]
+                ),
+                {"attachment_ids": [first.pk, second.pk]},
+                content_type="application/json",
+            )
+        self.assertTrue(response.streaming)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), [first.filename, second.filename])
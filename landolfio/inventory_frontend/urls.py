@@ -8,6 +8,7 @@ from .views import (
     AssetDeleteView,
     AssetDetailView,
     AssetDisposeMoneybirdView,
+    AssetFinancialPanelView,
     AssetLinkMoneybirdView,
     AssetListView,
     AssetRefreshMoneybirdView,
@@ -16,11 +17,16 @@ from .views import (
     AssetUpdateMoneybirdView,
     AssetUpdateView,
     AttachmentDeleteView,
+    AttachmentDirectUploadView,
     AttachmentDownloadView,
     AttachmentDownloadZipView,
     AttachmentReorderView,
+    AttachmentUploadStatusView,
+    AttachmentUploadTargetView,
+    BulkMoneybirdAssetJobView,
     BulkStatusChangeView,
     ContactAutocompleteView,
+    MoneybirdAssetJobStatusView,
     PropertyValueAutocompleteView,
     PublicIndexView,
 )
@@ -44,6 +50,11 @@ urlpatterns = [
         name="contact_autocomplete",
     ),
     path("<uuid:pk>/", AssetDetailView.as_view(), name="detail"),
+    path(
+        "<uuid:pk>/financial/",
+        AssetFinancialPanelView.as_view(),
+        name="financial_panel",
+    ),
     path("create/", AssetCreateView.as_view(), name="create"),
     path("asset/<uuid:pk>/update/", AssetUpdateView.as_view(), name="update"),
     path("asset/<uuid:pk>/delete/", AssetDeleteView.as_view(), name="delete"),
@@ -62,6 +73,21 @@ urlpatterns = [
         AttachmentReorderView.as_view(),
         name="attachment_reorder",
     ),
+    path(
+        "<uuid:asset_pk>/attachments/upload-target/",
+        AttachmentUploadTargetView.as_view(),
+        name="attachment_upload_target",
+    ),
+    path(
+        "<uuid:asset_pk>/attachments/upload-status/",
+        AttachmentUploadStatusView.as_view(),
+        name="attachment_upload_status",
+    ),
+    path(
+        "attachments/direct-upload/",
+        AttachmentDirectUploadView.as_view(),
+        name="attachment_direct_upload",
+    ),
     path(
         "<uuid:asset_pk>/attachments/download-zip/",
         AttachmentDownloadZipView.as_view(),
@@ -102,4 +128,14 @@ urlpatterns = [
         AssetDisposeMoneybirdView.as_view(),
         name="dispose_moneybird",
     ),
+    path(
+        "moneybird-jobs/status/",
+        MoneybirdAssetJobStatusView.as_view(),
+        name="moneybird_job_status",
+    ),
+    path(
+        "bulk-moneybird/",
+        BulkMoneybirdAssetJobView.as_view(),
+        name="bulk_moneybird",
+    ),
 ]
@@ -1,55 +1,69 @@
 import json
+import uuid
 from datetime import date
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models import Count, Max, OuterRef, Prefetch, Q, Subquery
-from django.http import JsonResponse
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Prefetch, Q
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import CreateView, DetailView, ListView, TemplateView
 from django.views.generic.edit import DeleteView, UpdateView
-from django_drf_filepond.api import store_upload
-from django_drf_filepond.models import TemporaryUpload
 
 from accounting.models.contact import Contact
 from inventory.models.asset import Asset, AssetStates
-from inventory.models.asset_property import AssetProperty, AssetPropertyValue
-from inventory.models.attachment import Attachment, attachments_directory_path
+from inventory.models.asset_property import (
+    AssetProperty,
+    AssetPropertyValue,
+    get_category_properties,
+    parse_numeric_value,
+)
+from inventory.models.attachment import Attachment
+from inventory.models.attachment_upload import AttachmentUpload, AttachmentUploadStates
 from inventory.models.category import Category
 from inventory.models.collection import Collection
-from inventory.models.location import Location
+from inventory.models.location import (
+    Location,
+    clear_locations_cache,
+    get_locations,
+)
+from inventory.models.moneybird_asset_job import (
+    MoneybirdAssetActions,
+    MoneybirdAssetJob,
+    MoneybirdAssetJobStates,
+)
 from inventory.models.remarks import Remark
-from inventory.models.status_change import StatusChange
-from inventory_frontend.forms import AssetForm, BulkStatusChangeForm, StatusChangeForm
-
-
-def get_locations_hierarchical():
-    """Get locations sorted hierarchically by order field recursively."""
-    all_locations = list(Location.objects.all())
-    location_dict = {loc.id: loc for loc in all_locations}
-
-    # Get ancestry chain order values for sorting
-    def get_order_chain(location):
-        """Returns tuple of order values from root to this location."""
-        chain = []
-        current = location
-        while current:
-            chain.insert(
-                0, (current.order if current.order is not None else 999999, current.id)
-            )
-            if current.parent_id and not current.display_as_root:
-                current = location_dict.get(current.parent_id)
-            else:
-                break
-        return tuple(chain)
-
-    # Sort all locations by their ancestry chain
-    sorted_locations = sorted(all_locations, key=get_order_chain)
-    return sorted_locations
+from inventory.models.status_change import StatusChange, annotate_current_status
+from inventory.moneybird_jobs import fail_stale_moneybird_jobs, queue_moneybird_jobs
+from inventory.services import bulk_change_status, save_property_values
+from inventory.uploads import (
+    DirectUploadError,
+    create_direct_upload,
+    fail_stale_uploads,
+    queue_direct_uploads,
+    save_local_upload,
+)
+from inventory_frontend.autocomplete import (
+    asset_autocomplete,
+    contact_autocomplete,
+    property_value_autocomplete,
+)
+from inventory_frontend.forms import (
+    AssetForm,
+    BulkMoneybirdActionForm,
+    BulkStatusChangeForm,
+    StatusChangeForm,
+)
+from inventory_frontend.pagination import KeysetPaginator
+from inventory_frontend.zipstream import stream_zip, unique_archive_names
 
 
 class PublicIndexView(TemplateView):
@@ -143,6 +157,83 @@ class AssetListView(LoginRequiredMixin, ListView):
     context_object_name = "assets"
     model = Asset
     paginate_by = 12
+    sort_orderings = {
+        "newest": ("-created_at", "name"),
+        "oldest": ("created_at", "name"),
+        "name": ("name",),
+        "-name": ("-name",),
+    }
+    default_sort = "newest"
+
+    def get(self, request, *args, **kwargs):
+        if self.request.GET.get("partial") and self.uses_keyset_pagination():
+            return self.render_partial_page()
+        return super().get(request, *args, **kwargs)
+
+    def get_ordering(self):
+        """Return the ordering for the sort selected via GET parameter."""
+        sort = self.request.GET.get("sort", self.default_sort)
+        return self.sort_orderings.get(sort, self.sort_orderings[self.default_sort])
+
+    def uses_keyset_pagination(self):
+        """Whether to paginate with cursors instead of page numbers."""
+        return (
+            self.request.GET.get("pagination") == "cursor"
+            or "cursor" in self.request.GET
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """Paginate using keyset cursors when requested, page numbers otherwise."""
+        if not self.uses_keyset_pagination():
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(
+            queryset,
+            page_size,
+            self.get_ordering(),
+            approximate=self.request.GET.get("count") != "exact",
+        )
+        page = paginator.get_page(self.request.GET.get("cursor"))
+        return paginator, page, page.object_list, False
+
+    def get_cursor_url(self, cursor, **extra):
+        """Return the URL of the current listing at another cursor."""
+        params = self.request.GET.copy()
+        params.pop("page", None)
+        params["pagination"] = "cursor"
+        params["cursor"] = cursor
+        for key, value in extra.items():
+            params[key] = value
+        return f"{self.request.path}?{params.urlencode()}"
+
+    def render_partial_page(self):
+        """Render the next batch of assets for infinite scrolling."""
+        self.object_list = self.get_queryset()
+        _, page, assets, _ = self.paginate_queryset(
+            self.object_list, self.get_paginate_by(self.object_list)
+        )
+        context = {
+            "assets": assets,
+            "all_properties": self._get_properties_with_current_values(),
+        }
+        grid_html = "".join(
+            render_to_string(
+                "partials/asset_card.html", {**context, "asset": asset}, self.request
+            )
+            for asset in assets
+        )
+        table_html = "".join(
+            render_to_string(
+                "partials/asset_row.html", {**context, "asset": asset}, self.request
+            )
+            for asset in assets
+        )
+        next_url = None
+        if page.has_next():
+            next_url = self.get_cursor_url(page.next_cursor, partial="1")
+        return JsonResponse(
+            {"grid_html": grid_html, "table_html": table_html, "next_url": next_url}
+        )
 
     def get_paginate_by(self, queryset):
         """Allow user to specify page size via GET parameter."""
@@ -179,17 +270,7 @@ class AssetListView(LoginRequiredMixin, ListView):
                 is_archived=False
             ).values_list("slug", flat=True)
 
-            latest_status = (
-                StatusChange.objects.filter(
-                    asset=OuterRef("pk"), new_status__isnull=False
-                )
-                .order_by("-status_date", "-created_at")
-                .values("new_status")[:1]
-            )
-
-            queryset = queryset.annotate(
-                latest_status_from_changes=Subquery(latest_status)
-            )
+            queryset = annotate_current_status(queryset)
 
             queryset = queryset.filter(
                 Q(latest_status_from_changes__in=non_archived_statuses)
@@ -227,17 +308,7 @@ class AssetListView(LoginRequiredMixin, ListView):
             statuses = [stat for stat in statuses if stat.strip()]
             if statuses:
                 # Annotate each asset with its latest status from StatusChanges
-                latest_status = (
-                    StatusChange.objects.filter(
-                        asset=OuterRef("pk"), new_status__isnull=False
-                    )
-                    .order_by("-status_date", "-created_at")
-                    .values("new_status")[:1]
-                )
-
-                queryset = queryset.annotate(
-                    latest_status_from_changes=Subquery(latest_status)
-                )
+                queryset = annotate_current_status(queryset)
 
                 # Filter where either the latest status change matches OR
                 # no status changes exist and local_status matches
@@ -298,17 +369,7 @@ class AssetListView(LoginRequiredMixin, ListView):
 
             if need_status_annotation:
                 # Annotate with latest status if not already done
-                if "latest_status_from_changes" not in queryset.query.annotations:
-                    latest_status = (
-                        StatusChange.objects.filter(
-                            asset=OuterRef("pk"), new_status__isnull=False
-                        )
-                        .order_by("-status_date", "-created_at")
-                        .values("new_status")[:1]
-                    )
-                    queryset = queryset.annotate(
-                        latest_status_from_changes=Subquery(latest_status)
-                    )
+                queryset = annotate_current_status(queryset)
 
                 # Add effective_status annotation if not already done
                 if "effective_status" not in queryset.query.annotations:
@@ -396,55 +457,13 @@ class AssetListView(LoginRequiredMixin, ListView):
         for property_filter in property_filters:
             queryset = queryset.filter(property_filter)
 
-        # Apply numeric range filters separately
-        queryset = self._apply_numeric_range_filters(queryset)
-
-        return queryset.select_related("category", "location", "collection", "size")
-
-    def _apply_numeric_range_filters(self, queryset):
-        """Apply numeric range filters using proper numeric comparison."""
-        from django.db.models import DecimalField
-        from django.db.models.functions import Cast
-
-        for param_name, param_values in self.request.GET.lists():
-            if param_name.endswith(("_min", "_max")):
-                try:
-                    property_slug = param_name.replace("_min", "").replace("_max", "")
-                    property_obj = AssetProperty.objects.get(slug=property_slug)
-
-                    if property_obj.property_type == "number":
-                        range_type = "min" if param_name.endswith("_min") else "max"
-
-                        for param_value in param_values:
-                            if param_value.strip():
-                                numeric_value = float(param_value)
-
-                                # Apply range filter using Cast for proper numeric comparison
-                                if range_type == "min":
-                                    queryset = queryset.filter(
-                                        property_values__property=property_obj,
-                                        property_values__value__regex=r"^[0-9]+\.?[0-9]*$",
-                                    ).extra(
-                                        where=[
-                                            "CAST(inventory_assetpropertyvalue.value AS DECIMAL(10,2)) >= %s"
-                                        ],
-                                        params=[numeric_value],
-                                    )
-                                else:  # max
-                                    queryset = queryset.filter(
-                                        property_values__property=property_obj,
-                                        property_values__value__regex=r"^[0-9]+\.?[0-9]*$",
-                                    ).extra(
-                                        where=[
-                                            "CAST(inventory_assetpropertyvalue.value AS DECIMAL(10,2)) <= %s"
-                                        ],
-                                        params=[numeric_value],
-                                    )
-                                break
-                except (ValueError, TypeError, AssetProperty.DoesNotExist):
-                    continue
+        # Lets current_status and the status badges render without a query per row
+        queryset = annotate_current_status(queryset)
 
-        return queryset
+        # Location names include their parents, so follow the usual nesting depth
+        return queryset.select_related(
+            "category", "location__parent__parent", "collection", "size"
+        ).prefetch_related("attachments", "property_values__property")
 
     def _parse_property_parameters(self):
         """Parse property-related parameters from the request."""
@@ -478,7 +497,10 @@ class AssetListView(LoginRequiredMixin, ListView):
 
         for param_value in param_values:
             if param_value.strip():
-                property_params[property_id][range_type] = float(param_value)
+                numeric_value = parse_numeric_value(param_value)
+                if numeric_value is None:
+                    raise ValueError(f"Invalid numeric value: {param_value}")
+                property_params[property_id][range_type] = numeric_value
                 break
 
     def _handle_property_param(self, param_name, param_values, property_params):
@@ -514,23 +536,20 @@ class AssetListView(LoginRequiredMixin, ListView):
         return filters
 
     def _build_numeric_filter(self, property_id, params):
-        """Build filter for numeric properties."""
+        """Build filter for numeric properties on the typed numeric column."""
         has_min = "min" in params
         has_max = "max" in params
 
         if not (has_min or has_max):
             return None
 
-        # Base filter for valid numeric values
-        base_filter = (
-            Q(property_values__property_id=property_id)
-            & Q(property_values__value__regex=r"^[0-9]+\.?[0-9]*$")
-            & ~Q(property_values__value="")
-        )
-
-        # For range filtering, we need to do post-processing since we store numeric values as strings
-        # We'll return the base filter and let the get_queryset method handle the range logic
-        return base_filter
+        # All conditions go into a single Q so they apply to the same joined row
+        conditions = {"property_values__property_id": property_id}
+        if has_min:
+            conditions["property_values__numeric_value__gte"] = params["min"]
+        if has_max:
+            conditions["property_values__numeric_value__lte"] = params["max"]
+        return Q(**conditions)
 
     def _build_dropdown_filter(self, property_id, params):
         """Build filter for dropdown properties."""
@@ -643,6 +662,19 @@ class AssetListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
+        context["sort"] = self.request.GET.get("sort", self.default_sort)
+        context["keyset_pagination"] = self.uses_keyset_pagination()
+        if context["keyset_pagination"]:
+            page = context["page_obj"]
+            context["count_is_approximate"] = page.paginator.approximate
+            if page.has_next():
+                context["next_page_url"] = self.get_cursor_url(page.next_cursor)
+                context["next_partial_url"] = self.get_cursor_url(
+                    page.next_cursor, partial="1"
+                )
+            if page.has_previous():
+                context["previous_page_url"] = self.get_cursor_url(page.previous_cursor)
+
         # Get base queryset for filtered counts
         base_qs = self.get_queryset()
 
@@ -767,25 +799,71 @@ class AssetDetailView(LoginRequiredMixin, DetailView):
     context_object_name = "asset"
 
     def get_queryset(self):
-        return (
+        # Everything the page renders is loaded up front, so the number of
+        # queries does not grow with the attachments, status changes or
+        # properties of the asset
+        return annotate_current_status(
             super()
             .get_queryset()
-            .select_related("category", "location", "collection", "size")
+            .select_related("category", "collection", "size")
+            .prefetch_related(
+                "attachments",
+                "property_values",
+                Prefetch(
+                    "status_changes",
+                    queryset=StatusChange.objects.select_related("contact"),
+                ),
+                Prefetch(
+                    "attachment_uploads",
+                    queryset=AttachmentUpload.objects.filter(
+                        status__in=[
+                            AttachmentUploadStates.PENDING,
+                            AttachmentUploadStates.PROCESSING,
+                        ]
+                    ),
+                    to_attr="pending_uploads",
+                ),
+                Prefetch(
+                    "moneybird_jobs",
+                    queryset=MoneybirdAssetJob.objects.filter(
+                        status__in=[
+                            MoneybirdAssetJobStates.PENDING,
+                            MoneybirdAssetJobStates.RUNNING,
+                        ]
+                    ),
+                    to_attr="pending_moneybird_jobs",
+                ),
+            )
+        )
+
+    @staticmethod
+    def _find_location(locations, location_id):
+        return next(
+            (location for location in locations if location.pk == location_id), None
         )
 
     def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
         asset = self.object
+        locations = get_locations()
+
+        # Use the cached locations, their parents are already linked
+        if asset.location_id:
+            location = self._find_location(locations, asset.location_id)
+            if location is None:
+                # The cache is stale (e.g. written by another process), reload it
+                clear_locations_cache()
+                locations = get_locations()
+                location = self._find_location(locations, asset.location_id)
+            if location is not None:
+                asset.location = location
 
-        # Refresh from Moneybird if linked
-        if asset.moneybird_asset_id:
-            try:
-                asset.refresh_from_moneybird()
-            except Exception as e:
-                messages.warning(
-                    self.request,
-                    f"Failed to refresh asset data from Moneybird: {str(e)}",
-                )
+        context = super().get_context_data(**kwargs)
+
+        # Render the stored Moneybird data, and refresh it in the background
+        # when it is stale, the page then fetches the updated financial panel
+        context["moneybird_refresh_pending"] = asset.moneybird_data_is_stale
+        if asset.moneybird_data_is_stale:
+            asset.schedule_moneybird_refresh()
 
         # Add financial data
         context["financial_data"] = {
@@ -820,27 +898,29 @@ class AssetDetailView(LoginRequiredMixin, DetailView):
             (AssetStates.PLACEHOLDER, AssetStates.PLACEHOLDER.label),
             (AssetStates.TO_BE_DELIVERED, AssetStates.TO_BE_DELIVERED.label),
         ]
-        context["locations"] = get_locations_hierarchical()
+        context["locations"] = locations
 
         context["journal_history"] = []
 
-        # Add asset properties
-        category_properties = AssetProperty.objects.filter(
-            categories=asset.category
-        ).order_by("order", "name")
+        # Uploads still being processed in the background, polled by the page
+        context["pending_uploads"] = asset.pending_uploads
+
+        # Moneybird actions still running in the background, polled by the page
+        context["pending_moneybird_jobs"] = asset.pending_moneybird_jobs
+        context["idempotency_key"] = uuid.uuid4().hex
+
+        # Add asset properties, the definitions come from the cache
+        category_properties = get_category_properties(asset.category_id)
 
         # Get existing property values for this asset
-        existing_values = {
-            pv.property_id: pv
-            for pv in AssetPropertyValue.objects.filter(asset=asset).select_related(
-                "property"
-            )
-        }
+        existing_values = {pv.property_id: pv for pv in asset.property_values.all()}
 
         # Create a list of properties with their current values
         properties_with_values = []
         for prop in category_properties:
             value_obj = existing_values.get(prop.id)
+            if value_obj:
+                value_obj.property = prop
             properties_with_values.append(
                 {
                     "property": prop,
@@ -1026,7 +1106,12 @@ class AssetDetailView(LoginRequiredMixin, DetailView):
                 updated_items.append("listing price (cleared)")
 
             # Handle property updates
-            updated_properties = self._update_asset_properties(asset, data)
+            try:
+                updated_properties = self._update_asset_properties(asset, data)
+            except ValidationError as e:
+                for message in e.messages:
+                    messages.error(request, message)
+                return redirect(request.path)
             updated_items.extend(updated_properties)
 
             # Save asset changes
@@ -1042,93 +1127,29 @@ class AssetDetailView(LoginRequiredMixin, DetailView):
 
             return redirect(request.path)
 
-        # Handle file uploads
-        try:
-            filepond_ids = data.getlist("filepond")
-        except KeyError:
-            filepond_ids = []
+        # Queue the files the browser uploaded directly to storage for processing
+        tokens = [token for token in data.getlist("filepond") if token]
+        uploads, errors = queue_direct_uploads(asset, tokens)
+        for error in errors:
+            messages.error(request, error)
 
-        if not isinstance(filepond_ids, list):
-            filepond_ids = []
-
-        stored_uploads = []
-        for upload_id in filepond_ids:
-            if upload_id == "":
-                continue
-
-            try:
-                tu = TemporaryUpload.objects.get(upload_id=upload_id)
-            except TemporaryUpload.DoesNotExist:
-                messages.error(request, f"Upload with id {upload_id} does not exist")
-                continue
-
-            # Get the next order value for this asset
-            max_order = asset.attachments.aggregate(Max("order"))["order__max"] or 0
-
-            attachment = Attachment(asset=asset, order=max_order + 1)
-            try:
-                stored_upload = store_upload(
-                    upload_id, attachments_directory_path(attachment, tu.upload_name)
-                )
-            except FileNotFoundError:
-                messages.error(
-                    request,
-                    f"Upload {tu.upload_name} is no longer available, please upload it again",
-                )
-                tu.delete()
-                continue
-            attachment.attachment = stored_upload.file
-            attachment.save()
-            stored_uploads.append(upload_id)
-
-        if stored_uploads:
-            messages.success(
-                request, f"Successfully uploaded {len(stored_uploads)} files"
-            )
+        if uploads:
+            messages.info(request, f"Processing {len(uploads)} uploaded files")
 
         return redirect(request.path)
 
     def _update_asset_properties(self, asset, data):
         """Update asset property values from form data."""
-        updated_properties = []
-        category_properties = AssetProperty.objects.filter(categories=asset.category)
-
-        for prop in category_properties:
-            field_name = f"property_{prop.slug}"
-            new_value = data.get(field_name, "").strip()
-
-            if new_value:
-                updated_properties.extend(
-                    self._set_property_value(asset, prop, new_value)
-                )
-            else:
-                updated_properties.extend(self._clear_property_value(asset, prop))
-
-        return updated_properties
-
-    def _set_property_value(self, asset, prop, new_value):
-        """Set or update a property value for an asset."""
-        property_value, created = AssetPropertyValue.objects.get_or_create(
-            asset=asset, property=prop, defaults={"value": new_value}
+        created, updated, deleted = save_property_values(
+            asset,
+            {
+                prop: data.get(f"property_{prop.slug}", "")
+                for prop in get_category_properties(asset.category_id)
+            },
         )
-
-        if created:
-            return [prop.name]
-        elif property_value.value != new_value:
-            property_value.value = new_value
-            property_value.save()
-            return [prop.name]
-
-        return []
-
-    def _clear_property_value(self, asset, prop):
-        """Clear/delete a property value for an asset."""
-        try:
-            property_value = AssetPropertyValue.objects.get(asset=asset, property=prop)
-            property_value.delete()
-            return [f"{prop.name} (cleared)"]
-        except AssetPropertyValue.DoesNotExist:
-            return []
+        return [
+            property_value.property.name for property_value in created + updated
+        ] + [f"{property_value.property.name} (cleared)" for property_value in deleted]
 
 
 class AssetCreateView(LoginRequiredMixin, CreateView):
@@ -1177,11 +1198,26 @@ class AssetCreateView(LoginRequiredMixin, CreateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["categories"] = Category.objects.all()
-        context["locations"] = get_locations_hierarchical()
+        context["locations"] = get_locations()
         context["collections"] = Collection.objects.all()
         return context
 
 
+class AssetFinancialPanelView(LoginRequiredMixin, View):
+    """Render the financial panel of an asset, polled while its data refreshes."""
+
+    def get(self, request, pk):
+        asset = get_object_or_404(Asset.objects.select_related("collection"), pk=pk)
+        return JsonResponse(
+            {
+                "html": render_to_string(
+                    "partials/financial_panel.html", {"asset": asset}, request
+                ),
+                "stale": asset.moneybird_data_is_stale,
+            }
+        )
+
+
 class AssetUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     model = Asset
     form_class = AssetForm
@@ -1224,60 +1260,55 @@ class AssetDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
         return super().get_success_url()
 
 
-class AssetAutocompleteView(LoginRequiredMixin, View):
-    def get(self, request, *args, **kwargs):
-        query = request.GET.get("q", "").strip()
+def serialize_asset_suggestion(asset):
+    return {
+        "id": str(asset.id),
+        "name": asset.name,
+        "category": asset.category.name_singular if asset.category else None,
+        "size": str(asset.size) if asset.size else None,
+        "location": str(asset.location) if asset.location else None,
+        "location_nr": asset.location_nr,
+        "created_at": (
+            asset.created_at.strftime("%d-%m-%Y") if asset.created_at else None
+        ),
+        "purchase_value": (
+            float(asset.purchase_value_asset) if asset.purchase_value_asset else 0
+        ),
+        "listing_price": float(asset.listing_price) if asset.listing_price else 0,
+        "is_disposed": asset.is_disposed,
+        "disposal_reason": asset.disposal_reason_display,
+        "current_status": asset.current_status,
+        "current_status_display": asset.current_status_display,
+    }
+
+
+def serialize_contact_suggestion(contact):
+    return {
+        "id": contact.id,
+        "name": str(contact),
+        "company_name": contact.company_name or "",
+        "first_name": contact.first_name or "",
+        "last_name": contact.last_name or "",
+    }
 
-        if len(query) < 2:
-            return JsonResponse([], safe=False)
 
-        assets = (
-            Asset.objects.filter(name__icontains=query)
-            .select_related("category", "size", "location")
-            .distinct()[:10]
+class AssetAutocompleteView(LoginRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        assets = annotate_current_status(
+            Asset.objects.select_related("category", "size", "location")
+        )
+        suggestions = asset_autocomplete.suggest(
+            assets, request.GET.get("q"), serialize_asset_suggestion
         )
-
-        suggestions = []
-        for asset in assets:
-            suggestions.append(
-                {
-                    "id": str(asset.id),
-                    "name": asset.name,
-                    "category": (
-                        asset.category.name_singular if asset.category else None
-                    ),
-                    "size": str(asset.size) if asset.size else None,
-                    "location": str(asset.location) if asset.location else None,
-                    "location_nr": asset.location_nr,
-                    "created_at": (
-                        asset.created_at.strftime("%d-%m-%Y")
-                        if asset.created_at
-                        else None
-                    ),
-                    "purchase_value": (
-                        float(asset.purchase_value_asset)
-                        if asset.purchase_value_asset
-                        else 0
-                    ),
-                    "listing_price": (
-                        float(asset.listing_price) if asset.listing_price else 0
-                    ),
-                    "is_disposed": asset.is_disposed,
-                    "disposal_reason": asset.disposal_reason_display,
-                    "current_status": asset.current_status,
-                    "current_status_display": asset.current_status_display,
-                }
-            )
-
         return JsonResponse(suggestions, safe=False)
 
 
 class PropertyValueAutocompleteView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
-        query = request.GET.get("query", request.GET.get("q", "")).strip()
+        query = request.GET.get("query", request.GET.get("q", ""))
         property_id = request.GET.get("property_id", "").strip()
 
-        if len(query) < 1 or not property_id:
+        if not property_id:
             return JsonResponse([], safe=False)
 
         try:
@@ -1290,44 +1321,26 @@ class PropertyValueAutocompleteView(LoginRequiredMixin, View):
             AssetPropertyValue.objects.filter(
                 property=property_obj,
                 asset__category__in=property_obj.categories.all(),  # Only from categories that use this property
-                value__icontains=query,
             )
-            .values_list("value", flat=True)
+            .exclude(value="")
+            .values("value")
             .distinct()
-            .order_by("value")[:10]
         )
-
-        suggestions = [{"value": value} for value in values if value]
-
+        suggestions = property_value_autocomplete.suggest(
+            values,
+            query,
+            lambda row: {"value": row["value"]},
+            scope=property_obj.slug,
+        )
         return JsonResponse(suggestions, safe=False)
 
 
 class ContactAutocompleteView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
-        query = request.GET.get("query", request.GET.get("q", "")).strip()
-
-        if len(query) < 2:
-            return JsonResponse([], safe=False)
-
-        contacts = Contact.objects.filter(
-            Q(company_name__icontains=query)
-            | Q(first_name__icontains=query)
-            | Q(last_name__icontains=query)
-        ).distinct()[:10]
-
-        suggestions = []
-        for contact in contacts:
-            display_name = str(contact)  # Uses the __str__ method
-            suggestions.append(
-                {
-                    "id": contact.id,
-                    "name": display_name,
-                    "company_name": contact.company_name or "",
-                    "first_name": contact.first_name or "",
-                    "last_name": contact.last_name or "",
-                }
-            )
-
+        query = request.GET.get("query", request.GET.get("q", ""))
+        suggestions = contact_autocomplete.suggest(
+            Contact.objects.all(), query, serialize_contact_suggestion
+        )
         return JsonResponse(suggestions, safe=False)
 
 
@@ -1369,10 +1382,79 @@ class AttachmentReorderView(LoginRequiredMixin, View):
             return JsonResponse({"success": False, "error": str(e)})
 
 
+class AttachmentUploadTargetView(LoginRequiredMixin, View):
+    """Return where the browser should upload a new attachment to."""
+
+    def post(self, request, asset_pk):
+        asset = get_object_or_404(Asset, pk=asset_pk)
+
+        try:
+            data = json.loads(request.body)
+            if not isinstance(data, dict):
+                raise ValueError("Invalid upload request")
+            size = data.get("size")
+            upload = create_direct_upload(
+                asset,
+                str(data["name"]),
+                request.build_absolute_uri(
+                    reverse("inventory_frontend:attachment_direct_upload")
+                ),
+                size=None if size is None else int(size),
+                content_type=data.get("type"),
+            )
+        except (TypeError, ValueError, KeyError, DirectUploadError) as e:
+            return JsonResponse({"success": False, "error": str(e)}, status=400)
+
+        return JsonResponse({"success": True, **upload})
+
+
+# The signed token in the form authorizes the upload, like a presigned S3 POST
+@method_decorator(csrf_exempt, name="dispatch")
+class AttachmentDirectUploadView(LoginRequiredMixin, View):
+    """Store a direct upload when the storage backend is not S3."""
+
+    def post(self, request):
+        file = request.FILES.get("file")
+        if file is None:
+            return JsonResponse({"success": False, "error": "No file"}, status=400)
+
+        try:
+            save_local_upload(request.POST.get("token", ""), file)
+        except DirectUploadError as e:
+            return JsonResponse({"success": False, "error": str(e)}, status=400)
+
+        return JsonResponse({"success": True}, status=201)
+
+
+class AttachmentUploadStatusView(LoginRequiredMixin, View):
+    """Return the processing status of uploads of an asset."""
+
+    def get(self, request, asset_pk):
+        asset = get_object_or_404(Asset, pk=asset_pk)
+        ids = [pk for pk in request.GET.get("ids", "").split(",") if pk.isdigit()]
+        fail_stale_uploads(asset.attachment_uploads.filter(pk__in=ids))
+        uploads = asset.attachment_uploads.filter(pk__in=ids)
+
+        return JsonResponse(
+            {
+                "uploads": [
+                    {
+                        "id": upload.pk,
+                        "filename": upload.filename,
+                        "status": upload.status,
+                        "status_display": upload.get_status_display(),
+                        "error": upload.error,
+                        "attachment_id": upload.attachment_id,
+                    }
+                    for upload in uploads
+                ],
+                "finished": all(upload.is_finished for upload in uploads),
+            }
+        )
+
+
 class AttachmentDownloadView(LoginRequiredMixin, View):
     def get(self, request, asset_pk, attachment_pk):
-        from django.http import FileResponse
-
         asset = get_object_or_404(Asset, pk=asset_pk)
         attachment = get_object_or_404(Attachment, pk=attachment_pk, asset=asset)
 
@@ -1388,12 +1470,6 @@ class AttachmentDownloadView(LoginRequiredMixin, View):
 
 class AttachmentDownloadZipView(LoginRequiredMixin, View):
     def post(self, request, asset_pk):
-        import io
-        import os
-        import zipfile
-
-        from django.http import HttpResponse
-
         asset = get_object_or_404(Asset, pk=asset_pk)
 
         try:
@@ -1405,33 +1481,26 @@ class AttachmentDownloadZipView(LoginRequiredMixin, View):
                     {"success": False, "error": "No attachments selected"}
                 )
 
-            if len(attachment_ids) == 1:
-                attachment = get_object_or_404(
-                    Attachment, pk=attachment_ids[0], asset=asset
+            attachments = list(asset.attachments.filter(pk__in=attachment_ids))
+            if not attachments:
+                return JsonResponse(
+                    {"success": False, "error": "No attachments selected"}
                 )
+
+            if len(attachments) == 1:
+                attachment = attachments[0]
                 file_handle = attachment.attachment.open("rb")
                 response = FileResponse(
                     file_handle, as_attachment=True, filename=attachment.filename
                 )
                 return response
 
-            zip_buffer = io.BytesIO()
-
-            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-                for attachment_id in attachment_ids:
-                    try:
-                        attachment = Attachment.objects.get(
-                            pk=attachment_id, asset=asset
-                        )
-                        filename = os.path.basename(attachment.attachment.name)
-                        with attachment.attachment.open("rb") as f:
-                            zip_file.writestr(filename, f.read())
-                    except (Attachment.DoesNotExist, FileNotFoundError):
-                        continue
-
-            zip_buffer.seek(0)
-            response = HttpResponse(
-                zip_buffer.getvalue(), content_type="application/zip"
+            names = unique_archive_names(
+                attachment.filename for attachment in attachments
+            )
+            files = zip(names, (attachment.attachment for attachment in attachments))
+            response = StreamingHttpResponse(
+                stream_zip(files), content_type="application/zip"
             )
             response["Content-Disposition"] = (
                 f'attachment; filename="{asset.name}_attachments.zip"'
@@ -1443,123 +1512,46 @@ class AttachmentDownloadZipView(LoginRequiredMixin, View):
             return JsonResponse({"success": False, "error": str(e)})
 
 
-class AssetCreateMoneybirdView(LoginRequiredMixin, View):
-    def post(self, request, pk):
-        asset = get_object_or_404(Asset, pk=pk)
-
-        # Check if asset is already linked to Moneybird
-        if asset.moneybird_asset_id:
-            messages.warning(
-                request, f'Asset "{asset.name}" is already linked to Moneybird.'
-            )
-            return redirect(
-                request.META.get("HTTP_REFERER", reverse("inventory_frontend:list"))
-            )
-
-        # Check if required fields are present
-        if not asset.start_date or not asset.purchase_value_asset:
-            messages.error(
-                request,
-                f'Asset "{asset.name}" is missing required fields (start date and purchase value) for Moneybird creation.',
-            )
-            return redirect(
-                request.META.get("HTTP_REFERER", reverse("inventory_frontend:list"))
-            )
-
-        try:
-            asset.create_on_moneybird()
-            messages.success(
-                request,
-                f'Asset "{asset.name}" has been successfully created on Moneybird.',
-            )
-        except Exception as e:
-            messages.error(
-                request, f'Failed to create asset "{asset.name}" on Moneybird: {str(e)}'
-            )
+class MoneybirdAssetJobView(LoginRequiredMixin, View):
+    """Queue an action on the Moneybird asset of an asset, run in the background."""
 
-        return redirect(
-            request.META.get("HTTP_REFERER", reverse("inventory_frontend:list"))
-        )
+    action = None
 
+    def get_parameters(self, request):
+        return {}
 
-class AssetLinkMoneybirdView(LoginRequiredMixin, View):
     def post(self, request, pk):
         asset = get_object_or_404(Asset, pk=pk)
+        # The form carries a key, so submitting it twice queues the action once
+        idempotency_key = request.POST.get("idempotency_key") or uuid.uuid4().hex
 
-        # Check if asset is already linked to Moneybird
-        if asset.moneybird_asset_id:
-            messages.warning(
-                request, f'Asset "{asset.name}" is already linked to Moneybird.'
-            )
-            return redirect(
-                request.META.get(
-                    "HTTP_REFERER",
-                    reverse("inventory_frontend:detail", kwargs={"pk": pk}),
-                )
+        jobs, errors = queue_moneybird_jobs(
+            [asset], self.action, idempotency_key, self.get_parameters(request)
+        )
+        for error in errors:
+            messages.error(request, error)
+        for job in jobs:
+            messages.info(
+                request,
+                f'{job.get_action_display().capitalize()} for asset "{asset.name}" has been queued.',
             )
 
-        # Get the Moneybird asset ID from form
-        moneybird_asset_id = request.POST.get("moneybird_asset_id")
-        if not moneybird_asset_id:
-            messages.error(request, "Please provide a valid Moneybird Asset ID.")
-            return redirect(
-                request.META.get(
-                    "HTTP_REFERER",
-                    reverse("inventory_frontend:detail", kwargs={"pk": pk}),
-                )
+        return redirect(
+            request.META.get(
+                "HTTP_REFERER", reverse("inventory_frontend:detail", kwargs={"pk": pk})
             )
+        )
 
-        try:
-            # Convert to integer and validate
-            moneybird_asset_id = int(moneybird_asset_id)
-
-            # Check if this Moneybird ID is already linked to another asset
-            existing_asset = Asset.objects.filter(
-                moneybird_asset_id=moneybird_asset_id
-            ).first()
-            if existing_asset and existing_asset != asset:
-                messages.error(
-                    request,
-                    f'Moneybird Asset ID {moneybird_asset_id} is already linked to asset "{existing_asset.name}".',
-                )
-                return redirect(
-                    request.META.get(
-                        "HTTP_REFERER",
-                        reverse("inventory_frontend:detail", kwargs={"pk": pk}),
-                    )
-                )
 
-            # Link the asset
-            asset.moneybird_asset_id = moneybird_asset_id
-            asset.save(update_fields=["moneybird_asset_id"])
+class AssetCreateMoneybirdView(MoneybirdAssetJobView):
+    action = MoneybirdAssetActions.CREATE
 
-            # Try to refresh data from Moneybird
-            try:
-                asset.refresh_from_moneybird()
-                messages.success(
-                    request,
-                    f'Asset "{asset.name}" has been successfully linked to Moneybird Asset {moneybird_asset_id} and data has been refreshed.',
-                )
-            except Exception as refresh_error:
-                messages.warning(
-                    request,
-                    f'Asset "{asset.name}" has been linked to Moneybird Asset {moneybird_asset_id}, but failed to refresh data: {str(refresh_error)}',
-                )
 
-        except ValueError:
-            messages.error(
-                request, "Please provide a valid numeric Moneybird Asset ID."
-            )
-        except Exception as e:
-            messages.error(
-                request, f'Failed to link asset "{asset.name}" to Moneybird: {str(e)}'
-            )
+class AssetLinkMoneybirdView(MoneybirdAssetJobView):
+    action = MoneybirdAssetActions.LINK
 
-        return redirect(
-            request.META.get(
-                "HTTP_REFERER", reverse("inventory_frontend:detail", kwargs={"pk": pk})
-            )
-        )
+    def get_parameters(self, request):
+        return {"moneybird_asset_id": request.POST.get("moneybird_asset_id")}
 
 
 class AssetUnlinkMoneybirdView(LoginRequiredMixin, View):
@@ -1636,156 +1628,98 @@ class AssetDeleteMoneybirdView(LoginRequiredMixin, View):
         )
 
 
-class AssetRefreshMoneybirdView(LoginRequiredMixin, View):
-    def post(self, request, pk):
-        asset = get_object_or_404(Asset, pk=pk)
+class AssetRefreshMoneybirdView(MoneybirdAssetJobView):
+    action = MoneybirdAssetActions.REFRESH
 
-        # Check if asset is linked to Moneybird
-        if not asset.moneybird_asset_id:
-            messages.warning(
-                request, f'Asset "{asset.name}" is not linked to Moneybird.'
-            )
-            return redirect(
-                request.META.get(
-                    "HTTP_REFERER",
-                    reverse("inventory_frontend:detail", kwargs={"pk": pk}),
-                )
-            )
-
-        try:
-            asset.refresh_from_moneybird()
-            messages.success(
-                request,
-                f'Asset "{asset.name}" has been successfully refreshed from Moneybird.',
-            )
-        except Exception as e:
-            messages.error(
-                request,
-                f'Failed to refresh asset "{asset.name}" from Moneybird: {str(e)}',
-            )
 
-        return redirect(
-            request.META.get(
-                "HTTP_REFERER", reverse("inventory_frontend:detail", kwargs={"pk": pk})
-            )
-        )
+class AssetUpdateMoneybirdView(MoneybirdAssetJobView):
+    action = MoneybirdAssetActions.UPDATE
 
 
-class AssetUpdateMoneybirdView(LoginRequiredMixin, View):
-    def post(self, request, pk):
-        asset = get_object_or_404(Asset, pk=pk)
+class AssetDisposeMoneybirdView(MoneybirdAssetJobView):
+    action = MoneybirdAssetActions.DISPOSE
 
-        # Check if asset is linked to Moneybird
-        if not asset.moneybird_asset_id:
-            messages.warning(
-                request, f'Asset "{asset.name}" is not linked to Moneybird.'
-            )
-            return redirect(
-                request.META.get(
-                    "HTTP_REFERER",
-                    reverse("inventory_frontend:detail", kwargs={"pk": pk}),
-                )
-            )
+    def get_parameters(self, request):
+        return {
+            "disposal_reason": request.POST.get("disposal_reason"),
+            "disposal_date": request.POST.get("disposal_date"),
+        }
 
-        try:
-            asset.update_on_moneybird()
-            messages.success(
-                request,
-                f'Asset "{asset.name}" has been successfully updated on Moneybird with current local data.',
-            )
-        except Exception as e:
-            messages.error(
-                request, f'Failed to update asset "{asset.name}" on Moneybird: {str(e)}'
-            )
 
-        return redirect(
-            request.META.get(
-                "HTTP_REFERER", reverse("inventory_frontend:detail", kwargs={"pk": pk})
-            )
+class MoneybirdAssetJobStatusView(LoginRequiredMixin, View):
+    """Return the status of queued Moneybird actions."""
+
+    def get(self, request):
+        ids = [pk for pk in request.GET.get("ids", "").split(",") if pk.isdigit()]
+        fail_stale_moneybird_jobs(MoneybirdAssetJob.objects.filter(pk__in=ids))
+        jobs = MoneybirdAssetJob.objects.filter(pk__in=ids).select_related("asset")
+
+        return JsonResponse(
+            {
+                "jobs": [
+                    {
+                        "id": job.pk,
+                        "asset": str(job.asset_id),
+                        "asset_name": job.asset.name,
+                        "action": job.action,
+                        "action_display": job.get_action_display(),
+                        "status": job.status,
+                        "status_display": job.get_status_display(),
+                        "message": job.message,
+                    }
+                    for job in jobs
+                ],
+                "finished": all(job.is_finished for job in jobs),
+            }
         )
 
 
-class AssetDisposeMoneybirdView(LoginRequiredMixin, View):
-    def post(self, request, pk):
-        asset = get_object_or_404(Asset, pk=pk)
-
-        # Check if asset is linked to Moneybird
-        if not asset.moneybird_asset_id:
-            messages.warning(
-                request, f'Asset "{asset.name}" is not linked to Moneybird.'
-            )
-            return redirect(
-                request.META.get(
-                    "HTTP_REFERER",
-                    reverse("inventory_frontend:detail", kwargs={"pk": pk}),
-                )
-            )
-
-        # Check if asset is already disposed
-        if asset.is_disposed:
-            messages.warning(request, f'Asset "{asset.name}" is already disposed.')
-            return redirect(
-                request.META.get(
-                    "HTTP_REFERER",
-                    reverse("inventory_frontend:detail", kwargs={"pk": pk}),
-                )
-            )
-
-        # Get disposal reason from form
-        disposal_reason = request.POST.get("disposal_reason")
-        if not disposal_reason or disposal_reason not in [
-            "out_of_use",
-            "divested",
-        ]:
-            messages.error(request, "Invalid disposal reason.")
-            return redirect(
-                request.META.get(
-                    "HTTP_REFERER",
-                    reverse("inventory_frontend:detail", kwargs={"pk": pk}),
-                )
-            )
-
-        # Get disposal date from form
-        disposal_date_str = request.POST.get("disposal_date")
-        if not disposal_date_str:
-            messages.error(request, "Disposal date is required.")
-            return redirect(
-                request.META.get(
-                    "HTTP_REFERER",
-                    reverse("inventory_frontend:detail", kwargs={"pk": pk}),
-                )
-            )
+class BulkMoneybirdAssetJobView(LoginRequiredMixin, View):
+    """Queue the same Moneybird action for many assets in one submission."""
 
-        try:
-            from datetime import datetime
+    def post(self, request):
+        form = BulkMoneybirdActionForm(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return redirect("inventory_frontend:bulk_update")
 
-            disposal_date = datetime.strptime(disposal_date_str, "%Y-%m-%d").date()
+        asset_ids = form.cleaned_data["asset_ids"]
+        assets = Asset.objects.in_bulk(asset_ids)
+        missing = [str(asset_id) for asset_id in asset_ids if asset_id not in assets]
+        if missing:
+            messages.warning(request, f"Assets not found: {', '.join(missing)}")
 
-            if disposal_reason == "divested":
-                # For divested, use divestment value change which automatically creates disposal
-                asset.create_divestment_value_change_on_moneybird(disposal_date)
-                messages.success(
-                    request,
-                    f'Asset "{asset.name}" has been successfully divested on Moneybird.',
-                )
-            else:
-                # For out_of_use, use fully depreciate which automatically creates an "out-of-use" disposal
-                description = f"Full depreciation - out of use"
-                asset.fully_depreciate_on_moneybird(disposal_date, description)
-                messages.success(
-                    request,
-                    f'Asset "{asset.name}" has been successfully disposed on Moneybird as out of use.',
-                )
-        except Exception as e:
-            messages.error(
-                request,
-                f'Failed to dispose asset "{asset.name}" on Moneybird: {str(e)}',
+        asset_parameters = {
+            asset_id: {"moneybird_asset_id": moneybird_asset_id}
+            for asset_id, moneybird_asset_id in zip(
+                asset_ids, form.cleaned_data["moneybird_asset_ids"]
             )
+        }
+        jobs, errors = queue_moneybird_jobs(
+            [assets[asset_id] for asset_id in asset_ids if asset_id in assets],
+            form.cleaned_data["action"],
+            form.cleaned_data["idempotency_key"],
+            parameters={
+                "disposal_reason": form.cleaned_data["disposal_reason"],
+                "disposal_date": (
+                    form.cleaned_data["disposal_date"].isoformat()
+                    if form.cleaned_data["disposal_date"]
+                    else None
+                ),
+            },
+            asset_parameters=asset_parameters,
+        )
+        for error in errors:
+            messages.error(request, error)
+        if jobs:
+            messages.info(request, f"Queued {len(jobs)} Moneybird action(s)")
 
         return redirect(
-            request.META.get(
-                "HTTP_REFERER", reverse("inventory_frontend:detail", kwargs={"pk": pk})
-            )
+            reverse("inventory_frontend:bulk_update")
+            + "?moneybird_jobs="
+            + ",".join(str(job.pk) for job in jobs)
         )
 
 
@@ -1796,6 +1730,17 @@ class BulkStatusChangeView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         context["form"] = BulkStatusChangeForm()
         context["asset_states"] = AssetStates.choices
+        context["moneybird_form"] = BulkMoneybirdActionForm()
+
+        # Moneybird actions queued by the last submission, polled by the page
+        job_ids = [
+            pk
+            for pk in self.request.GET.get("moneybird_jobs", "").split(",")
+            if pk.isdigit()
+        ]
+        context["moneybird_jobs"] = MoneybirdAssetJob.objects.filter(
+            pk__in=job_ids
+        ).select_related("asset")
         return context
 
     def post(self, request, *args, **kwargs):
@@ -1832,25 +1777,15 @@ class BulkStatusChangeView(LoginRequiredMixin, TemplateView):
                 except Contact.DoesNotExist:
                     pass
 
-            # Create status changes for all selected assets
-            created_count = 0
-            failed_assets = []
-
-            for asset_id in asset_ids:
-                try:
-                    asset = Asset.objects.get(id=asset_id)
-                    StatusChange.objects.create(
-                        asset=asset,
-                        status_date=status_date,
-                        new_status=new_status,
-                        comments=comments,
-                        contact=contact,
-                    )
-                    created_count += 1
-                except Asset.DoesNotExist:
-                    failed_assets.append(asset_id)
-                except Exception as e:
-                    failed_assets.append(f"{asset_id} ({str(e)})")
+            status_changes, failures = bulk_change_status(
+                asset_ids,
+                status_date,
+                new_status=new_status,
+                comments=comments,
+                contact=contact,
+            )
+            created_count = len(status_changes)
+            failed_assets = [f"{asset_id} ({reason})" for asset_id, reason in failures]
 
             # Show success/error messages
             if created_count > 0:
@@ -0,0 +1,103 @@
+import os
+import time
+import zipfile
+
+ZIP_CHUNK_SIZE = 64 * 1024
+
+# Formats that are already compressed, deflating them only costs CPU time
+STORED_EXTENSIONS = (
+    "jpg",
+    "jpeg",
+    "png",
+    "gif",
+    "webp",
+    "heic",
+    "pdf",
+    "zip",
+    "mp4",
+    "mov",
+)
+
+
+class _ZipStreamBuffer:
+    """
+    Write-only, unseekable file object that collects the output of a ZipFile.
+
+    ZipFile detects that it cannot seek and writes data descriptors after each
+    entry instead, so every byte can be handed out as soon as it is written.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def get_compress_type(name):
+    """Return the ZIP compression method for a file name."""
+    if name.rsplit(".", 1)[-1].lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def unique_archive_names(names):
+    """Make archive names unique by numbering duplicates, like 'photo (2).jpg'."""
+    seen = set()
+    for name in names:
+        root, extension = os.path.splitext(name)
+        candidate = name
+        number = 1
+        while candidate in seen:
+            number += 1
+            candidate = f"{root} ({number}){extension}"
+        seen.add(candidate)
+        yield candidate
+
+
+def stream_zip(files, chunk_size=ZIP_CHUNK_SIZE):
+    """
+    Generate a ZIP archive of stored files in chunks.
+
+    Takes an iterable of (archive name, FieldFile) pairs. Files are read from
+    storage chunk by chunk, so memory use does not depend on the size of the
+    files or the number of them. Files missing from storage are skipped.
+    """
+    return (chunk for chunk in _generate_zip(files, chunk_size) if chunk)
+
+
+def _generate_zip(files, chunk_size):
+    buffer = _ZipStreamBuffer()
+    date_time = time.localtime()[:6]
+
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        for name, field_file in files:
+            try:
+                source = field_file.open("rb")
+            except FileNotFoundError:
+                continue
+
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = get_compress_type(name)
+            with source, zip_file.open(info, "w", force_zip64=True) as entry:
+                for chunk in iter(lambda: source.read(chunk_size), b""):
+                    entry.write(chunk)
+                    yield buffer.drain()
+            yield buffer.drain()
+
+    yield buffer.drain()
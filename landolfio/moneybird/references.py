@@ -0,0 +1,98 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from moneybird.resource_types import (
+    MoneybirdResource,
+    MoneybirdResourceId,
+    MoneybirdResourceType,
+    SynchronizableMoneybirdResourceType,
+)
+
+_active_resolver = ContextVar("moneybird_reference_resolver", default=None)
+
+
+class MoneybirdReferenceResolver:
+    """
+    Resolves the resources referenced by a batch of Moneybird resources.
+
+    Resource types declare the fields that refer to other resources in their
+    references attribute. The resolver collects the referenced ids of all
+    resources in a batch, loads the ones that exist locally with one query per
+    referenced resource type and fetches the missing ones from Moneybird with
+    one synchronization request per 100 ids, instead of a lookup (and possibly
+    an API request) for every resource.
+    """
+
+    def __init__(self, sync):
+        self.sync = sync
+        self._resolved = {}
+
+    def resolve(self, resource_type, resources: list[MoneybirdResource]):
+        ids = {}
+        for resource in resources:
+            for key, reference_type in resource_type.references.items():
+                resource_id = resource.get(key)
+                if resource_id:
+                    ids.setdefault(reference_type, set()).add(
+                        MoneybirdResourceId(resource_id)
+                    )
+
+        for reference_type, reference_ids in ids.items():
+            resolved = self._resolved.setdefault(reference_type, {})
+            for obj in reference_type.get_queryset().filter(
+                moneybird_id__in=reference_ids
+            ):
+                resolved[MoneybirdResourceId(obj.moneybird_id)] = obj
+
+            missing = [
+                resource_id
+                for resource_id in reference_ids
+                if resource_id not in resolved
+            ]
+            if missing and issubclass(
+                reference_type, SynchronizableMoneybirdResourceType
+            ):
+                logging.info(
+                    f"Fetching {len(missing)} new {reference_type.entity_type_name} resources"
+                )
+                for data in self.sync.get_resources_by_id(reference_type, missing):
+                    resolved[MoneybirdResourceId(data["id"])] = (
+                        reference_type.create_from_moneybird(data)
+                    )
+        return self
+
+    def get(self, resource_type, resource_id):
+        resource_id = MoneybirdResourceId(resource_id)
+        resolved = self._resolved.setdefault(resource_type, {})
+        if resource_id not in resolved:
+            # Not part of the batch, or it cannot be fetched in bulk
+            resolved[resource_id] = resource_type.get_or_create_from_moneybird_data(
+                resource_id
+            )
+        return resolved[resource_id]
+
+
+@contextmanager
+def resolving(resolver: MoneybirdReferenceResolver):
+    """Use the resolver for get_reference within the block."""
+    token = _active_resolver.set(resolver)
+    try:
+        yield resolver
+    finally:
+        _active_resolver.reset(token)
+
+
+def get_reference(resource_type: MoneybirdResourceType, resource_id):
+    """
+    Return the local object of a resource referenced by another resource.
+
+    Within a synchronization the objects come from the active resolver,
+    otherwise (such as for a webhook) the object is looked up or created.
+    """
+    if not resource_id:
+        return None
+    resolver = _active_resolver.get()
+    if resolver is None:
+        return resource_type.get_or_create_from_moneybird_data(resource_id)
+    return resolver.get(resource_type, resource_id)
@@ -39,6 +39,9 @@ class MoneybirdResourceType:
     can_do_full_sync = True
     paginated = False
     pagination_size = None
+    # Keys in the resource data that refer to other resources, with their resource
+    # type, so a synchronization can resolve them in bulk (see moneybird.references)
+    references = {}
 
     @staticmethod
     def diff_resources(
@@ -3,6 +3,7 @@ import threading
 from typing import Generator
 
 from moneybird.administration import Administration, get_moneybird_administration
+from moneybird.references import MoneybirdReferenceResolver, resolving
 from moneybird.resource_types import (
     MoneybirdResourceId,
     MoneybirdResourceType,
@@ -45,22 +46,34 @@ class MoneybirdSync:
         )
         return response
 
-    def get_resources_by_id(
+    def get_resource_chunks_by_id(
         self,
         resource_type: SynchronizableMoneybirdResourceType,
         ids: list[MoneybirdResourceId],
     ):
-        """Get an iterator over all resources of a given type."""
-        if len(ids) == 0:
-            return []
-        for id_chunk in self.__chunks(ids, MAX_REQUEST_SIZE):
+        """Get an iterator over lists of resources of a given type, one per request."""
+        for id_chunk in self.__chunks(list(ids), MAX_REQUEST_SIZE):
             try:
-                response = self._get_resources_by_id_paginated(resource_type, id_chunk)
-                yield from response
+                yield self._get_resources_by_id_paginated(resource_type, id_chunk)
             except Administration.Throttled:
                 logging.warning("Throttled, stopping sync")
                 break
 
+    def get_resources_by_id(
+        self,
+        resource_type: SynchronizableMoneybirdResourceType,
+        ids: list[MoneybirdResourceId],
+    ):
+        """Get an iterator over all resources of a given type."""
+        for resources in self.get_resource_chunks_by_id(resource_type, ids):
+            yield from resources
+
+    def resolve_references(self, resource_type: MoneybirdResourceType, resources: list):
+        """Resolve the resources referenced by a batch of resources in bulk."""
+        return resolving(
+            MoneybirdReferenceResolver(self).resolve(resource_type, resources)
+        )
+
     def get_all_resources_paginated(self, resource_type: MoneybirdResourceType):
         params = resource_type.get_all_resources_api_endpoint_params()
         if params is None:
@@ -100,22 +113,27 @@ class MoneybirdSync:
 
         resource_type.queryset_delete_from_moneybird(resources_to_sync.removed)
 
-        new_resources = self.get_resources_by_id(resource_type, resources_to_sync.added)
-        for resource in new_resources:
-            resource_type.create_from_moneybird(resource)
+        for resources in self.get_resource_chunks_by_id(
+            resource_type, resources_to_sync.added
+        ):
+            with self.resolve_references(resource_type, resources):
+                for resource in resources:
+                    resource_type.create_from_moneybird(resource)
 
-        updated_resources = self.get_resources_by_id(
+        for resources in self.get_resource_chunks_by_id(
             resource_type, resources_to_sync.changed
-        )
-        for resource in updated_resources:
-            resource_type.update_from_moneybird(resource)
+        ):
+            with self.resolve_references(resource_type, resources):
+                for resource in resources:
+                    resource_type.update_from_moneybird(resource)
 
     def sync_naive(self, resource_type: MoneybirdResourceType):
         local_versions = resource_type.get_local_versions()
         resources = self.get_all_resources(resource_type)
         changes = MoneybirdResourceType.diff_resources(local_versions, resources)
         logging.info(f"Updating {resource_type.__name__} resources with changes")
-        resource_type.update_resources(changes)
+        with self.resolve_references(resource_type, changes.added + changes.changed):
+            resource_type.update_resources(changes)
 
     def sync_resource_type(self, resource_type: MoneybirdResourceType):
         """Perform a full sync of a resource type."""
@@ -17,6 +17,7 @@ class NewCustomerAdmin(TicketAdmin):
     readonly_fields = TicketAdmin.readonly_fields + [
         "ticket_type",
         "sepa_mandate_sent",
+        "mandate_url",
     ]
 
     fieldsets = (
@@ -29,7 +30,8 @@ class NewCustomerAdmin(TicketAdmin):
                         (
                             "wants_sepa_mandate",
                             "sepa_mandate_sent",
-                        )
+                        ),
+                        "mandate_url",
                     )
                 },
             ),
@@ -37,6 +39,11 @@ class NewCustomerAdmin(TicketAdmin):
         + TicketAdmin.fieldsets[1:]
     )
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if obj.contact and not obj.contact.is_synced_with_moneybird:
+            obj.process_in_background()
+
     object_actions_after_fieldsets = [
         "send_sepa_mandate_request",
         "view_contact_on_moneybird",
@@ -0,0 +1,27 @@
+# Generated by Django 6.1.2 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("new_customers", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newcustomer",
+            name="mandate_url",
+            field=models.URLField(
+                blank=True, max_length=2048, null=True, verbose_name="SEPA mandate URL"
+            ),
+        ),
+        migrations.AddField(
+            model_name="newcustomer",
+            name="mandate_url_failed",
+            field=models.BooleanField(
+                default=False, verbose_name="SEPA mandate URL could not be retrieved"
+            ),
+        ),
+    ]
@@ -1,8 +1,6 @@
-from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
-from moneybird.administration import MoneybirdNotConfiguredError
 from tickets.models import Ticket, TicketType
 
 
@@ -17,6 +15,12 @@ class NewCustomer(Ticket):
     sepa_mandate_sent = models.BooleanField(
         default=False, verbose_name=_("SEPA mandate request was sent")
     )
+    mandate_url = models.URLField(
+        max_length=2048, blank=True, null=True, verbose_name=_("SEPA mandate URL")
+    )
+    mandate_url_failed = models.BooleanField(
+        default=False, verbose_name=_("SEPA mandate URL could not be retrieved")
+    )
 
     def save(
         self, force_insert=False, force_update=False, using=None, update_fields=None
@@ -24,14 +28,6 @@ class NewCustomer(Ticket):
         if not self.ticket_type:
             self.ticket_type = get_customer_ticket_type()
 
-        try:
-            if self.contact and not self.contact.is_synced_with_moneybird:
-                self.contact.push_to_moneybird()
-        except MoneybirdNotConfiguredError as e:
-            # Allow Moneybird to be disabled in development
-            if not settings.DEBUG:
-                raise e
-
         super().save(
             force_insert=force_insert,
             force_update=force_update,
@@ -39,6 +35,19 @@ class NewCustomer(Ticket):
             update_fields=update_fields,
         )
 
+    def process_in_background(self):
+        """
+        Push the contact to Moneybird and retrieve the SEPA mandate URL.
+
+        This talks to Moneybird, so it runs in a background task with retries,
+        once the current transaction has been committed.
+        """
+        from new_customers.tasks import process_new_customer
+
+        transaction.on_commit(
+            lambda: process_new_customer.enqueue(new_customer_id=self.pk)
+        )
+
     class Meta:
         verbose_name = _("new customer")
         verbose_name_plural = _("new customers")
@@ -3,6 +3,7 @@ from django.template import loader
 from django.utils.translation import gettext_lazy as _
 
 from accounting.models import Contact
+from accounting.services import find_duplicate_contact
 from new_customers.models import NewCustomer
 from website.email import send_email
 
@@ -21,6 +22,27 @@ def send_new_customer_notification(obj):
     )
 
 
+def push_new_customer_to_moneybird(obj):
+    """
+    Push the contact of a new customer to Moneybird and store its SEPA mandate URL.
+
+    Both steps are skipped when they were done before, so this can be retried.
+    """
+    contact = obj.contact
+    if contact is None:
+        return
+
+    if not contact.is_synced_with_moneybird:
+        contact.push_to_moneybird()
+
+    if obj.wants_sepa_mandate and not obj.mandate_url:
+        mandate_url = contact.get_payments_mandate_url()
+        if not mandate_url:
+            raise ValueError(f"Moneybird returned no SEPA mandate URL for {contact}")
+        obj.mandate_url = mandate_url
+        NewCustomer.objects.filter(pk=obj.pk).update(mandate_url=mandate_url)
+
+
 def send_sepa_mandate_request(obj):
     """Send a SEPA mandate request to the customer."""
     obj.contact.request_payments_mandate(
@@ -33,14 +55,4 @@ def send_sepa_mandate_request(obj):
 
 def detect_duplicate_contact(contact: Contact):
     """Detect duplicate contacts."""
-    all_contacts = Contact.objects.all()
-
-    if contact.id:
-        all_contacts = all_contacts.exclude(id=contact.id)
-
-    matching_contacts = all_contacts.filter(
-        email=contact.email, first_name=contact.first_name, last_name=contact.last_name
-    )
-    if matching_contacts.exists():
-        return matching_contacts.first()
-    return None
+    return find_duplicate_contact(contact)
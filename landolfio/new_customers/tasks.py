@@ -0,0 +1,82 @@
+import logging
+from datetime import timedelta
+
+from django.tasks import task
+from django.utils import timezone
+
+from moneybird.administration import MoneybirdNotConfiguredError
+from new_customers.models import NewCustomer
+from new_customers.services import (
+    push_new_customer_to_moneybird,
+    send_new_customer_notification,
+)
+
+logger = logging.getLogger(__name__)
+
+# A failing task is tried this many times in total, waiting twice as long
+# before each next attempt: 30 seconds, 1, 2 and 4 minutes
+NEW_CUSTOMER_TASK_ATTEMPTS = 5
+NEW_CUSTOMER_TASK_RETRY_DELAY = timedelta(seconds=30)
+
+
+def retry_later(task_to_retry, attempt, **kwargs):
+    """Enqueue the next attempt of a failed task, returns False if none are left."""
+    if attempt >= NEW_CUSTOMER_TASK_ATTEMPTS:
+        return False
+    run_after = timezone.now() + NEW_CUSTOMER_TASK_RETRY_DELAY * 2 ** (attempt - 1)
+    task_to_retry.using(run_after=run_after).enqueue(attempt=attempt + 1, **kwargs)
+    return True
+
+
+@task
+def process_new_customer(new_customer_id, attempt=1):
+    try:
+        new_customer = NewCustomer.objects.select_related("contact").get(
+            pk=new_customer_id
+        )
+    except NewCustomer.DoesNotExist:
+        return
+
+    try:
+        push_new_customer_to_moneybird(new_customer)
+    except MoneybirdNotConfiguredError:
+        # Moneybird can be disabled in development, retrying does not help
+        logger.warning(f"Moneybird is not configured, not processing {new_customer}")
+    except Exception as e:
+        logger.warning(
+            f"Failed to process new customer {new_customer_id} (attempt {attempt}): {e}"
+        )
+        if retry_later(process_new_customer, attempt, new_customer_id=new_customer_id):
+            return
+        logger.error(f"Giving up processing new customer {new_customer_id}")
+    else:
+        return
+
+    if new_customer.wants_sepa_mandate and not new_customer.mandate_url:
+        # The success page stops waiting for the mandate URL
+        NewCustomer.objects.filter(pk=new_customer_id).update(mandate_url_failed=True)
+
+
+@task
+def notify_new_customer(new_customer_id, attempt=1):
+    try:
+        new_customer = (
+            NewCustomer.objects.select_subclasses()
+            .select_related("contact")
+            .get(pk=new_customer_id)
+        )
+    except NewCustomer.DoesNotExist:
+        return
+
+    try:
+        send_new_customer_notification(new_customer)
+    except Exception as e:
+        logger.warning(
+            f"Failed to send notification for new customer {new_customer_id} (attempt {attempt}): {e}"
+        )
+        if not retry_later(
+            notify_new_customer, attempt, new_customer_id=new_customer_id
+        ):
+            logger.error(
+                f"Giving up sending notification for new customer {new_customer_id}"
+            )
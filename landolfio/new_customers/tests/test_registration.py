@@ -0,0 +1,95 @@
+"""Test registering as a new customer."""
+
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from accounting.models import Contact
+from new_customers.models import NewCustomer
+from new_customers.tasks import NEW_CUSTOMER_TASK_ATTEMPTS, process_new_customer
+
+REGISTRATION = {
+    "first_name": "Jan",
+    "last_name": "Jansen",
+    "address_1": "Straat 1",
+    "zip_code": "1234 AB",
+    "city": "Doesburg",
+    "country": "NL",
+    "phone": "0612345678",
+    "email": "jan@example.com",
+    "wants_sepa_mandate": "on",
+    "description": "",
+}
+
+
+class NewCustomerRegistrationTest(TestCase):
+    """Test cases for NewCustomerRegistrationView and its background tasks."""
+
+    def _register(self):
+        with mock.patch("new_customers.tasks.process_new_customer") as process:
+            with mock.patch("new_customers.views.notify_new_customer") as notify:
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.post(
+                        reverse("new_customers:new-customer"), REGISTRATION
+                    )
+        self.assertEqual(response.status_code, 200)
+        new_customer = NewCustomer.objects.get()
+        process.enqueue.assert_called_once_with(new_customer_id=new_customer.pk)
+        notify.enqueue.assert_called_once_with(new_customer_id=new_customer.pk)
+        return response, new_customer
+
+    @mock.patch.object(Contact, "get_payments_mandate_url")
+    @mock.patch.object(Contact, "push_to_moneybird")
+    def test_register(self, push_to_moneybird, get_payments_mandate_url):
+        """Test registering does not wait for Moneybird, and the page gets the URL later."""
+        response, new_customer = self._register()
+        push_to_moneybird.assert_not_called()
+        get_payments_mandate_url.assert_not_called()
+
+        status_url = response.context["mandate_url_status_url"]
+        self.assertEqual(
+            self.client.get(status_url).json(), {"ready": False, "mandate_url": None}
+        )
+
+        get_payments_mandate_url.return_value = "https://moneybird.com/mandate"
+        process_new_customer.call(new_customer_id=new_customer.pk)
+
+        push_to_moneybird.assert_called_once()
+        self.assertEqual(
+            self.client.get(status_url).json(),
+            {"ready": True, "mandate_url": "https://moneybird.com/mandate"},
+        )
+
+    def test_invalid_token(self):
+        """Test the status of a registration needs a signed token."""
+        _, new_customer = self._register()
+        url = reverse("new_customers:mandate-url", args=[str(new_customer.pk)])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    @mock.patch.object(
+        Contact, "push_to_moneybird", side_effect=ValueError("Moneybird is down")
+    )
+    def test_retries(self, push_to_moneybird):
+        """Test a failing task is retried later, until it gives up."""
+        response, new_customer = self._register()
+
+        with mock.patch("new_customers.tasks.process_new_customer") as retry:
+            process_new_customer.call(new_customer_id=new_customer.pk)
+        retry.using.return_value.enqueue.assert_called_once_with(
+            attempt=2, new_customer_id=new_customer.pk
+        )
+        new_customer.refresh_from_db()
+        self.assertFalse(new_customer.mandate_url_failed)
+
+        with mock.patch("new_customers.tasks.process_new_customer") as retry:
+            process_new_customer.call(
+                new_customer_id=new_customer.pk, attempt=NEW_CUSTOMER_TASK_ATTEMPTS
+            )
+        retry.using.assert_not_called()
+        new_customer.refresh_from_db()
+        self.assertTrue(new_customer.mandate_url_failed)
+        self.assertEqual(
+            self.client.get(response.context["mandate_url_status_url"]).json(),
+            {"ready": True, "mandate_url": None},
+        )
@@ -10,4 +10,9 @@ urlpatterns = [
         NewCustomerRegistrationView.as_view(),
         name="new-customer",
     ),
+    path(
+        "mandate/<str:token>/",
+        NewCustomerMandateUrlView.as_view(),
+        name="mandate-url",
+    ),
 ]
@@ -1,13 +1,21 @@
 import logging
 
 from django.contrib import messages
-from django.shortcuts import render
+from django.core import signing
+from django.db import transaction
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
+from django.views import View
 from django.views.generic import CreateView
 
 from new_customers.forms import NewContactForm, NewCustomerForm
 from new_customers.models import NewCustomer
-from new_customers.services import send_new_customer_notification
+from new_customers.tasks import notify_new_customer
+
+MANDATE_URL_SIGNING_SALT = "new_customers.mandate_url"
+MANDATE_URL_SIGNING_MAX_AGE = 60 * 60
 
 
 class NewCustomerRegistrationView(CreateView):
@@ -50,27 +58,48 @@ class NewCustomerRegistrationView(CreateView):
             messages.error(self.request, _("Something went wrong. Please contact us."))
             return self.form_invalid(form)
 
-        try:
-            # Notify the admin about the new customer
-            send_new_customer_notification(obj)
-        except Exception as e:
-            # If something went wrong during sending the email, log the error, but don't let the user know
-            logging.error(e)
+        # Talking to Moneybird and sending email happens in the background, so
+        # registering does not wait for them
+        obj.process_in_background()
+        transaction.on_commit(
+            lambda: notify_new_customer.enqueue(new_customer_id=obj.pk)
+        )
 
         if obj.wants_sepa_mandate:
-            # If the customer requested a SEPA mandate, show them a different success page
-            mandate_url = None
-            try:
-                mandate_url = obj.contact.get_payments_mandate_url()
-            except Exception as e:
-                logging.warning(
-                    f"Could not get SEPA mandate URL (possibly demo administration): {e}"
-                )
-
+            # If the customer requested a SEPA mandate, show them a different success
+            # page, which shows the mandate URL once it has been retrieved
+            token = signing.dumps(obj.pk, salt=MANDATE_URL_SIGNING_SALT)
             return render(
                 self.request,
                 "register-customer-success-sepa.html",
-                {"mandate_url": mandate_url},
+                {
+                    "mandate_url_status_url": reverse(
+                        "new_customers:mandate-url", args=[token]
+                    )
+                },
             )
 
         return render(self.request, "register-customer-success.html")
+
+
+class NewCustomerMandateUrlView(View):
+    """Report the SEPA mandate URL of a new customer once it has been retrieved."""
+
+    def get(self, request, token):
+        try:
+            pk = signing.loads(
+                token,
+                salt=MANDATE_URL_SIGNING_SALT,
+                max_age=MANDATE_URL_SIGNING_MAX_AGE,
+            )
+        except signing.BadSignature:
+            raise Http404
+        new_customer = get_object_or_404(NewCustomer, pk=pk)
+        return JsonResponse(
+            {
+                "ready": bool(
+                    new_customer.mandate_url or new_customer.mandate_url_failed
+                ),
+                "mandate_url": new_customer.mandate_url,
+            }
+        )
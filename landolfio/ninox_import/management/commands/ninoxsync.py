@@ -1,6 +1,8 @@
+import time
+
 from django.core.management import BaseCommand
 
-from ninox_import.ninox_sync import NinoxImporter
+from ninox_import.ninox_sync import NINOX_MEDIA_WORKERS, NinoxImporter
 
 
 class Command(BaseCommand):
@@ -13,8 +15,40 @@ class Command(BaseCommand):
             default=False,
             help="Do a quick sync without media files.",
         )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            dest="full",
+            default=False,
+            help="Also import the records that did not change since the last sync.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=NINOX_MEDIA_WORKERS,
+            help="Number of media files to download at the same time.",
+        )
 
     def handle(self, *args, **options):
         """Execute the command."""
-        NinoxImporter().full_sync(with_media=not (options["quick"]))
-        self.stdout.write(self.style.SUCCESS("Successfully synchronized with Ninox"))
+        start = time.monotonic()
+        stats = NinoxImporter(max_workers=options["workers"]).full_sync(
+            with_media=not (options["quick"]), full=options["full"]
+        )
+        duration = max(time.monotonic() - start, 0.001)
+
+        if stats["failed"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Could not download all files of {stats['failed']} records, "
+                    "they are tried again on the next sync."
+                )
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully synchronized with Ninox in {duration:.1f}s: "
+                f"{stats['records']} records imported ({stats['records'] / duration:.1f}/s), "
+                f"{stats['skipped']} unchanged, {stats['files']} files downloaded "
+                f"({stats['bytes'] / duration / 1024 / 1024:.1f} MB/s)."
+            )
+        )
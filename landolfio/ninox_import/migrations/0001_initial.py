@@ -0,0 +1,82 @@
+# Generated by Django 6.1.2 on 2026-10-19 12:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("inventory", "0031_moneybird_asset_jobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NinoxRecordState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("table_id", models.CharField(max_length=20, verbose_name="table id")),
+                (
+                    "record_id",
+                    models.CharField(max_length=20, verbose_name="record id"),
+                ),
+                (
+                    "modified_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="modified at"
+                    ),
+                ),
+                (
+                    "files",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Names of the files of the record that were imported",
+                        verbose_name="files",
+                    ),
+                ),
+                (
+                    "media_imported",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether all files of this version of the record were imported",
+                        verbose_name="media imported",
+                    ),
+                ),
+                (
+                    "synced_at",
+                    models.DateTimeField(auto_now=True, verbose_name="synced at"),
+                ),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="inventory.asset",
+                        verbose_name="asset",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ninox record state",
+                "verbose_name_plural": "Ninox record states",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("table_id", "record_id"), name="unique_ninox_record"
+                    )
+                ],
+            },
+        ),
+    ]
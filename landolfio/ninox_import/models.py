@@ -0,0 +1,44 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class NinoxRecordState(models.Model):
+    """The last imported version of a Ninox record, to skip it while it is unchanged."""
+
+    table_id = models.CharField(max_length=20, verbose_name=_("table id"))
+    record_id = models.CharField(max_length=20, verbose_name=_("record id"))
+    modified_at = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("modified at")
+    )
+    asset = models.ForeignKey(
+        "inventory.Asset",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("asset"),
+    )
+    files = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name=_("files"),
+        help_text=_("Names of the files of the record that were imported"),
+    )
+    media_imported = models.BooleanField(
+        default=False,
+        verbose_name=_("media imported"),
+        help_text=_("Whether all files of this version of the record were imported"),
+    )
+    synced_at = models.DateTimeField(auto_now=True, verbose_name=_("synced at"))
+
+    class Meta:
+        verbose_name = _("Ninox record state")
+        verbose_name_plural = _("Ninox record states")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["table_id", "record_id"], name="unique_ninox_record"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.table_id}/{self.record_id}"
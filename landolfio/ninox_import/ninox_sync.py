@@ -1,21 +1,54 @@
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from itertools import batched
 
 import bleach
 import requests
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from django.utils.text import slugify
-from django.utils.timezone import make_aware
+from django.utils.timezone import is_naive, make_aware
 from requests import HTTPError
+from requests.adapters import HTTPAdapter
 from requests.auth import AuthBase
 
 from inventory.models.asset import Asset, AssetStates
 from inventory.models.attachment import Attachment
 from inventory.models.category import Category, Size
 from inventory.models.collection import Collection
-from inventory.models.location import Location, LocationGroup
+from inventory.models.location import Location, clear_locations_cache
 from inventory.models.remarks import Remark
+from inventory.models.status_change import annotate_current_status
+from inventory.services import clear_asset_names_cache
+from ninox_import.models import NinoxRecordState
+
+NINOX_API_URL = "https://api.ninox.com"
+NINOX_RECORDS_PER_PAGE = 2000
+NINOX_REQUEST_TIMEOUT = 60
+
+# Changed records are written in batches of this size, each in one transaction
+NINOX_WRITE_BATCH_SIZE = 500
+
+# Media files are downloaded this many at a time, and kept in memory up to
+# the spool size before they are written to a temporary file
+NINOX_MEDIA_WORKERS = 4
+NINOX_MEDIA_CHUNK_SIZE = 64 * 1024
+NINOX_MEDIA_SPOOL_SIZE = 1024 * 1024
+
+# Asset fields that are set from a staged record
+NINOX_ASSET_FIELDS = {
+    "category",
+    "collection",
+    "location",
+    "listing_price",
+    "local_status",
+    "raw_data",
+}
 
 
 class TokenAuthentication(AuthBase):
@@ -31,11 +64,45 @@ class TokenAuthentication(AuthBase):
         return r
 
 
-def get_or_create_location(group_name, location_name):
-    location_group, _ = LocationGroup.objects.get_or_create(name=group_name)
-    return Location.objects.get_or_create(
-        name=location_name, location_group=location_group
-    )
+def get_or_create_by_name(model, defaults_by_name, **filters):
+    """Return the objects with the given names, creating the missing ones in bulk."""
+    objects = {
+        obj.name: obj
+        for obj in model.objects.filter(name__in=defaults_by_name, **filters)
+    }
+    missing = [
+        model(name=name, **filters, **defaults)
+        for name, defaults in defaults_by_name.items()
+        if name not in objects
+    ]
+    model.objects.bulk_create(missing)
+    objects.update((obj.name, obj) for obj in missing)
+    return objects
+
+
+def parse_record_datetime(value):
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed and is_naive(parsed):
+        parsed = make_aware(parsed)
+    return parsed
+
+
+def get_record_modified_at(record):
+    """Return when a Ninox record was last changed, or None if it is unknown."""
+    return parse_record_datetime(record.get("modifiedAt") or record.get("updatedAt"))
+
+
+def get_record_created_at(record):
+    return parse_record_datetime(record.get("createdAt") or record.get("updatedAt"))
+
+
+def get_record_remark(record):
+    remark = record["fields"].get("Notities")
+    if not remark:
+        return None
+    return bleach.clean(remark, tags=[], attributes={}, strip=True)
 
 
 class NinoxImporter:
@@ -47,34 +114,16 @@ class NinoxImporter:
     database_id = settings.NINOX_DATABASE_ID
 
     ninox_table_to_asset_category = {
-        "Cello's": Category.objects.get_or_create(
-            name="Cello's", name_singular="Cello"
-        ),
-        "Cellostokken": Category.objects.get_or_create(
-            name="Cellostokken", name_singular="Cellostok"
-        ),
-        "Violen": Category.objects.get_or_create(name="Violen", name_singular="Viool"),
-        "Vioolstokken": Category.objects.get_or_create(
-            name="Vioolstokken", name_singular="Vioolstok"
-        ),
-        "Altviolen": Category.objects.get_or_create(
-            name="Altviolen", name_singular="Altviool"
-        ),
-        "Altvioolstokken": Category.objects.get_or_create(
-            name="Altvioolstokken", name_singular="Altvioolstok"
-        ),
-        "Contrabassen": Category.objects.get_or_create(
-            name="Contrabassen", name_singular="Contrabas"
-        ),
-        "Contrabasstokken": Category.objects.get_or_create(
-            name="Contrabasstokken", name_singular="Contrabasstok"
-        ),
-        "Gamba's": Category.objects.get_or_create(
-            name="Gamba's", name_singular="Gamba"
-        ),
-        "Gambastokken": Category.objects.get_or_create(
-            name="Gambastokken", name_singular="Gambastok"
-        ),
+        "Cello's": ("Cello's", "Cello"),
+        "Cellostokken": ("Cellostokken", "Cellostok"),
+        "Violen": ("Violen", "Viool"),
+        "Vioolstokken": ("Vioolstokken", "Vioolstok"),
+        "Altviolen": ("Altviolen", "Altviool"),
+        "Altvioolstokken": ("Altvioolstokken", "Altvioolstok"),
+        "Contrabassen": ("Contrabassen", "Contrabas"),
+        "Contrabasstokken": ("Contrabasstokken", "Contrabasstok"),
+        "Gamba's": ("Gamba's", "Gamba"),
+        "Gambastokken": ("Gambastokken", "Gambastok"),
     }
 
     ninox_status_to_asset_status = {
@@ -92,102 +141,84 @@ class NinoxImporter:
     }
 
     ninox_collection_to_collection = {
-        "Zakelijk": Collection.objects.get_or_create(name="Zakelijk", commerce=True)[0],
-        "Prive": Collection.objects.get_or_create(name="Prive", commerce=False)[0],
-        "Consignatie": Collection.objects.get_or_create(
-            name="Consignatie", commerce=False
-        )[0],
-        "Zakelijk (S)": Collection.objects.get_or_create(
-            name="Schreeven", commerce=True
-        )[0],
-        "Algemene registratie": Collection.objects.get_or_create(
-            name="Overig", commerce=False
-        )[0],
+        "Zakelijk": ("Zakelijk", True),
+        "Prive": ("Prive", False),
+        "Consignatie": ("Consignatie", False),
+        "Zakelijk (S)": ("Schreeven", True),
+        "Algemene registratie": ("Overig", False),
     }
 
     ninox_category_to_category = {
-        "Cello": Category.objects.get_or_create(name="Cello's", name_singular="Cello"),
-        "Cellostok": Category.objects.get_or_create(
-            name="Cellostokken", name_singular="Cellostok"
-        ),
-        "Viool": Category.objects.get_or_create(name="Violen", name_singular="Viool"),
-        "Vioolstok": Category.objects.get_or_create(
-            name="Vioolstokken", name_singular="Vioolstok"
-        ),
-        "Altviool": Category.objects.get_or_create(
-            name="Altviolen", name_singular="Altviool"
-        ),
-        "Altvioolstok": Category.objects.get_or_create(
-            name="Altvioolstokken", name_singular="Altvioolstok"
-        ),
-        "Contrabas": Category.objects.get_or_create(
-            name="Contrabassen", name_singular="Contrabas"
-        ),
-        "Contrabasstok": Category.objects.get_or_create(
-            name="Contrabasstokken", name_singular="Contrabasstok"
-        ),
-        "Gamba": Category.objects.get_or_create(name="Gamba's", name_singular="Gamba"),
-        "Gambastok": Category.objects.get_or_create(
-            name="Gambastokken", name_singular="Gambastok"
-        ),
+        "Cello": ("Cello's", "Cello"),
+        "Cellostok": ("Cellostokken", "Cellostok"),
+        "Viool": ("Violen", "Viool"),
+        "Vioolstok": ("Vioolstokken", "Vioolstok"),
+        "Altviool": ("Altviolen", "Altviool"),
+        "Altvioolstok": ("Altvioolstokken", "Altvioolstok"),
+        "Contrabas": ("Contrabassen", "Contrabas"),
+        "Contrabasstok": ("Contrabasstokken", "Contrabasstok"),
+        "Gamba": ("Gamba's", "Gamba"),
+        "Gambastok": ("Gambastokken", "Gambastok"),
     }
 
     ninox_location_to_asset_location = {
-        "Boven": get_or_create_location("Opslag", "-"),
-        "Boven - Keuken": get_or_create_location("Boven", "Keuken"),
-        "Boven - Vleugelkamer": get_or_create_location("Boven", "Vleugelkamer"),
-        "Boven - Hal": get_or_create_location("Boven", "Hal"),
-        "Boven - Hal trap": get_or_create_location("Boven", "Hal trap"),
-        "Boven - Studeerkamer": get_or_create_location("Boven", "Studeerkamer"),
-        "Boven - Kleine kamer": get_or_create_location("Boven", "Kleine kamer"),
-        "Boven - Badkamer": get_or_create_location("Boven", "Badkamer"),
-        "Beneden - Schouw": get_or_create_location("Beneden", "Schouw"),
-        "Beneden - Muur schouw": get_or_create_location("Beneden", "Muur schouw"),
-        "Beneden - Muur schouw 1": get_or_create_location("Beneden", "Muur schouw"),
-        "Beneden - Muur schouw 2": get_or_create_location("Beneden", "Muur schouw"),
-        "Beneden - Muur schouw 3": get_or_create_location("Beneden", "Muur schouw"),
-        "Beneden - Muur schouw 4": get_or_create_location("Beneden", "Muur schouw"),
-        "Muur schouw 1": get_or_create_location("Beneden", "Muur schouw"),
-        "Muur schouw 2": get_or_create_location("Beneden", "Muur schouw"),
-        "Muur schouw 3": get_or_create_location("Beneden", "Muur schouw"),
-        "Muur schouw 4": get_or_create_location("Beneden", "Muur schouw"),
-        "Beneden - Kast 1/1": get_or_create_location("Beneden", "Kast 1/1"),
-        "Beneden - Kast 1/2": get_or_create_location("Beneden", "Kast 1/2"),
-        "Beneden - Kast 1/3": get_or_create_location("Beneden", "Kast 1/3"),
-        "Beneden - Kast 2/1": get_or_create_location("Beneden", "Kast 2/1"),
-        "Beneden - Kast 2/2": get_or_create_location("Beneden", "Kast 2/2"),
-        "Beneden - Kast 2/3": get_or_create_location("Beneden", "Kast 2/3"),
-        "Beneden - Kast 2/4": get_or_create_location("Beneden", "Kast 2/4"),
-        "Beneden - Kast 2/5": get_or_create_location("Beneden", "Kast 2/5"),
-        "Beneden - Kast 0/1": get_or_create_location("Beneden", "Kast 0/1"),
-        "Beneden - Kast 0/2": get_or_create_location("Beneden", "Kast 0/2"),
-        "Beneden - Kast 0/3": get_or_create_location("Beneden", "Kast 0/3"),
-        "Beneden - Kast 0/4": get_or_create_location("Beneden", "Kast 0/4"),
-        "Beneden - Kast 0/5": get_or_create_location("Beneden", "Kast 0/5"),
-        "Beneden - Kast 0/6": get_or_create_location("Beneden", "Kast 0/6"),
-        "Boven - Keuken kast": get_or_create_location("Boven", "Keuken - kast"),
-        "Boven - Keuken kast links": get_or_create_location(
-            "Boven", "Keuken - kast links"
-        ),
-        "Boven - Keuken links boven": get_or_create_location(
-            "Boven", "Keuken - kast links"
-        ),
-        "Boven - Keuken links onder": get_or_create_location(
-            "Boven", "Keuken - kast links"
-        ),
-        "Boven - Keuken rechts boven": get_or_create_location(
-            "Boven", "Keuken - kast rechts"
-        ),
-        "Boven - Keuken rechts onder": get_or_create_location(
-            "Boven", "Keuken - kast rechts"
-        ),
+        "Boven": ("Opslag", "-"),
+        "Boven - Keuken": ("Boven", "Keuken"),
+        "Boven - Vleugelkamer": ("Boven", "Vleugelkamer"),
+        "Boven - Hal": ("Boven", "Hal"),
+        "Boven - Hal trap": ("Boven", "Hal trap"),
+        "Boven - Studeerkamer": ("Boven", "Studeerkamer"),
+        "Boven - Kleine kamer": ("Boven", "Kleine kamer"),
+        "Boven - Badkamer": ("Boven", "Badkamer"),
+        "Beneden - Schouw": ("Beneden", "Schouw"),
+        "Beneden - Muur schouw": ("Beneden", "Muur schouw"),
+        "Beneden - Muur schouw 1": ("Beneden", "Muur schouw"),
+        "Beneden - Muur schouw 2": ("Beneden", "Muur schouw"),
+        "Beneden - Muur schouw 3": ("Beneden", "Muur schouw"),
+        "Beneden - Muur schouw 4": ("Beneden", "Muur schouw"),
+        "Muur schouw 1": ("Beneden", "Muur schouw"),
+        "Muur schouw 2": ("Beneden", "Muur schouw"),
+        "Muur schouw 3": ("Beneden", "Muur schouw"),
+        "Muur schouw 4": ("Beneden", "Muur schouw"),
+        "Beneden - Kast 1/1": ("Beneden", "Kast 1/1"),
+        "Beneden - Kast 1/2": ("Beneden", "Kast 1/2"),
+        "Beneden - Kast 1/3": ("Beneden", "Kast 1/3"),
+        "Beneden - Kast 2/1": ("Beneden", "Kast 2/1"),
+        "Beneden - Kast 2/2": ("Beneden", "Kast 2/2"),
+        "Beneden - Kast 2/3": ("Beneden", "Kast 2/3"),
+        "Beneden - Kast 2/4": ("Beneden", "Kast 2/4"),
+        "Beneden - Kast 2/5": ("Beneden", "Kast 2/5"),
+        "Beneden - Kast 0/1": ("Beneden", "Kast 0/1"),
+        "Beneden - Kast 0/2": ("Beneden", "Kast 0/2"),
+        "Beneden - Kast 0/3": ("Beneden", "Kast 0/3"),
+        "Beneden - Kast 0/4": ("Beneden", "Kast 0/4"),
+        "Beneden - Kast 0/5": ("Beneden", "Kast 0/5"),
+        "Beneden - Kast 0/6": ("Beneden", "Kast 0/6"),
+        "Boven - Keuken kast": ("Boven", "Keuken - kast"),
+        "Boven - Keuken kast links": ("Boven", "Keuken - kast links"),
+        "Boven - Keuken links boven": ("Boven", "Keuken - kast links"),
+        "Boven - Keuken links onder": ("Boven", "Keuken - kast links"),
+        "Boven - Keuken rechts boven": ("Boven", "Keuken - kast rechts"),
+        "Boven - Keuken rechts onder": ("Boven", "Keuken - kast rechts"),
     }
 
-    def get(self, url, stream=False):
+    def __init__(self, api_url=NINOX_API_URL, max_workers=NINOX_MEDIA_WORKERS):
+        self.api_url = api_url
+        self.max_workers = max_workers
+
+        # One session with a connection pool that is large enough for all
+        # media workers, so connections are reused instead of set up per request
+        self.session = requests.Session()
+        self.session.auth = TokenAuthentication(self.api_token)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url, stream=False, params=None):
         try:
             self._logger.info(f"Sending request: {url}")
-            response = requests.get(
-                url, auth=TokenAuthentication(self.api_token), stream=stream
+            response = self.session.get(
+                url, params=params, stream=stream, timeout=NINOX_REQUEST_TIMEOUT
             )
             response.raise_for_status()
             self._logger.info(f"Got response: {response}")
@@ -207,7 +238,7 @@ class NinoxImporter:
     def get_ninox_endpoint_url(
         self, table_id=None, record_id=None, fetch_files=False, filename=None
     ):
-        url = f"https://api.ninox.com/{self.api_version}/teams"
+        url = f"{self.api_url}/{self.api_version}/teams"
         if self.team_id:
             url = f"{url}/{self.team_id}/databases"
         if self.database_id:
@@ -221,255 +252,493 @@ class NinoxImporter:
         if filename:
             url = f"{url}/{filename}"
 
-        if not record_id and not filename:
-            return f"{url}?perPage=2000"
-
         return url
 
-    def create_asset(self, record, category):
-        try:
-            asset_number = record["fields"]["Nummer"]
-        except KeyError:
-            self._logger.warning(
-                f"Found a {category} asset without number, skipping: {record}"
+    def get_records(self, table_id):
+        """Return all records of a table, requesting them page by page."""
+        records = []
+        page = 0
+        while True:
+            page_records = self.get(
+                self.get_ninox_endpoint_url(table_id=table_id),
+                params={"page": page, "perPage": NINOX_RECORDS_PER_PAGE},
+            )
+            if not page_records:
+                break
+            records.extend(page_records)
+            if len(page_records) < NINOX_RECORDS_PER_PAGE:
+                break
+            page += 1
+        return records
+
+    def download_record_media(self, asset, table_id, record_id, imported_files):
+        """
+        Download the files of a record that were not imported yet into storage.
+
+        This runs in the media workers, so it does not use the database. Each
+        file is streamed to a temporary file and from there to storage.
+        Returns the downloaded files as (filename, storage name, size) tuples
+        and whether all files were downloaded.
+        """
+        record_files = self.get(
+            self.get_ninox_endpoint_url(
+                table_id=table_id, record_id=record_id, fetch_files=True
             )
-            return None, None, None
+        )
+        if record_files is None:
+            return [], False
+
+        field = Attachment._meta.get_field("attachment")
+        downloaded = []
+        complete = True
+        for record_file in record_files:
+            filename = record_file["name"]
+            if filename in imported_files:
+                continue
 
-        try:
-            status = self.ninox_status_to_asset_status[record["fields"]["Status"]]
-        except KeyError:
-            self._logger.warning(
-                f"Could not match status for {category} asset {asset_number}"
+            response = self.get(
+                self.get_ninox_endpoint_url(
+                    table_id=table_id, record_id=record_id, filename=filename
+                ),
+                stream=True,
             )
-            status = AssetStates.UNKNOWN
+            if response is None:
+                complete = False
+                continue
 
-        already_existing_in_different_category = (
-            Asset.objects.exclude(category=category).filter(name=asset_number).exists()
+            filename_saved = filename.replace(" ", "_")
+            try:
+                with (
+                    response,
+                    tempfile.SpooledTemporaryFile(
+                        max_size=NINOX_MEDIA_SPOOL_SIZE
+                    ) as content,
+                ):
+                    size = 0
+                    for chunk in response.iter_content(NINOX_MEDIA_CHUNK_SIZE):
+                        content.write(chunk)
+                        size += len(chunk)
+                    content.seek(0)
+                    name = field.storage.save(
+                        field.generate_filename(
+                            Attachment(asset=asset), filename_saved
+                        ),
+                        File(content, name=filename_saved),
+                    )
+            except Exception as err:
+                self._logger.warning(
+                    f"Could not download file {filename} for {asset.name}: {err}"
+                )
+                complete = False
+            else:
+                self._logger.info(f"Saved file {filename_saved} for {asset.name}.")
+                downloaded.append((filename, name, size))
+
+        return downloaded, complete
+
+    def resolve_reference_data(self):
+        """
+        Load the categories, collections, locations and sizes that records refer to.
+
+        Each kind of reference data is loaded with one query and the missing
+        objects are created with one bulk insert, so records are mapped to
+        them in memory.
+        """
+        categories = get_or_create_by_name(
+            Category,
+            {
+                name: {"name_singular": name_singular}
+                for mapping in (
+                    self.ninox_table_to_asset_category,
+                    self.ninox_category_to_category,
+                )
+                for name, name_singular in mapping.values()
+            },
+        )
+        self.table_categories = {
+            table: categories[name]
+            for table, (name, _) in self.ninox_table_to_asset_category.items()
+        }
+        self.type_categories = {
+            ninox_type: categories[name]
+            for ninox_type, (name, _) in self.ninox_category_to_category.items()
+        }
+
+        collections = get_or_create_by_name(
+            Collection,
+            {
+                name: {"commerce": commerce}
+                for name, commerce in self.ninox_collection_to_collection.values()
+            },
+        )
+        self.collections = {
+            ninox_collection: collections[name]
+            for ninox_collection, (
+                name,
+                _,
+            ) in self.ninox_collection_to_collection.items()
+        }
+
+        parents = get_or_create_by_name(
+            Location,
+            {
+                parent_name: {}
+                for parent_name, _ in self.ninox_location_to_asset_location.values()
+            },
+            parent=None,
         )
-        if already_existing_in_different_category:
-            new_asset_number = slugify(f"{asset_number}-{category}")
+        locations = {
+            (location.parent_id, location.name): location
+            for location in Location.objects.filter(parent__in=parents.values())
+        }
+        missing = {}
+        for parent_name, name in self.ninox_location_to_asset_location.values():
+            key = (parents[parent_name].pk, name)
+            if key not in locations and key not in missing:
+                missing[key] = Location(name=name, parent=parents[parent_name])
+        Location.objects.bulk_create(missing.values())
+        locations.update(missing)
+        self.locations = {
+            ninox_location: locations[(parents[parent_name].pk, name)]
+            for ninox_location, (
+                parent_name,
+                name,
+            ) in self.ninox_location_to_asset_location.items()
+        }
+        # Locations are created in bulk, which does not send the signals that clear the cache
+        clear_locations_cache()
+
+        self.sizes = {size.name: size for size in Size.objects.all()}
+
+    def resolve_sizes(self, names):
+        """Create the sizes with the given names that do not exist yet, at once."""
+        missing = [Size(name=name) for name in names if name not in self.sizes]
+        Size.objects.bulk_create(missing)
+        self.sizes.update((size.name, size) for size in missing)
+
+    def stage_ninox_record(self, record, category):
+        """Map a record of one of the instrument tables to the values of its asset."""
+        fields = record["fields"]
+        if "Nummer" not in fields:
             self._logger.warning(
-                f"Asset {asset_number} already exists in a different category, changing the number to {new_asset_number}"
+                f"Found a {category} asset without number, skipping: {record}"
             )
-            asset_number = new_asset_number
-
-        try:
-            collection = self.ninox_collection_to_collection[
-                record["fields"]["Collectie"]
-            ]
-        except KeyError:
-            self._logger.warning(f"Could not match collection asset {asset_number}")
-            collection = self.ninox_collection_to_collection["Zakelijk"]
+            return None
+        asset_number = str(fields["Nummer"])
 
-        asset, created = Asset.objects.get_or_create(
-            name=asset_number,
-            category=category,
-            collection=collection,
-        )
-
-        if created:
-            self._logger.warning(f"Created {asset}!")
-        else:
-            self._logger.warning(f"Already found {asset}!")
-
-        return asset, created, status
-
-    def update_asset_details(self, asset, record):
-        try:
-            size, _ = Size.objects.get_or_create(name=record["fields"]["Maat"])
-            if not asset.category in size.categories.all():
-                size.categories.add(asset.category)
-        except KeyError:
-            size = None
-
-        try:
-            collection = self.ninox_collection_to_collection[
-                record["fields"]["Collectie"]
-            ]
-        except KeyError:
-            self._logger.warning(f"Could not match collection for {asset}")
-            collection = self.ninox_collection_to_collection["Zakelijk"]
-
-        if "Locatie" in record["fields"]:
+        if "Status" in fields:
             try:
-                location, _ = self.ninox_location_to_asset_location[
-                    record["fields"]["Locatie"]
-                ]
+                status = self.ninox_status_to_asset_status[fields["Status"]]
             except KeyError:
-                self._logger.warning(f"Could not match location for {asset}")
-                location = None
-        else:
-            location = None
-
-        try:
-            listing_price = record["fields"]["Waarde"]
-        except KeyError:
-            listing_price = None
-
-        if "Status" in record["fields"]:
-            try:
-                status = self.ninox_status_to_asset_status[record["fields"]["Status"]]
-            except KeyError:
-                self._logger.info(f"Could not match status for {asset}")
+                self._logger.info(
+                    f"Could not match status for {category} asset {asset_number}"
+                )
                 status = AssetStates.UNKNOWN
         else:
             status = AssetStates.UNKNOWN
 
-        asset.size = size
-        asset.listing_price = listing_price
-        asset.location = location
-        asset.local_status = status
-        asset.collection = collection
-
         try:
-            remarks = record["fields"]["Notities"]
-            remarks = bleach.clean(remarks, tags=[], attributes={}, strip=True)
-            Remark.objects.get_or_create(asset=asset, remark=remarks)
+            collection = self.collections[fields["Collectie"]]
         except KeyError:
-            pass
-
-        asset.raw_data = record
-        if (
-            "createdAt" in record.keys()
-            and record["createdAt"]
-            and record["createdAt"] != ""
-        ):
-            asset.created_at = make_aware(parse_datetime(record["createdAt"]))
-        elif (
-            "updatedAt" in record.keys()
-            and record["updatedAt"]
-            and record["updatedAt"] != ""
-        ):
-            asset.created_at = make_aware(parse_datetime(record["updatedAt"]))
-
-        asset.save()
-
-    def update_asset_media(self, asset, record, table_id):
-        record_attachments = self.get(
-            self.get_ninox_endpoint_url(
-                table_id=table_id, record_id=record["id"], fetch_files=True
+            self._logger.warning(
+                f"Could not match collection for {category} asset {asset_number}"
             )
-        )
-        for attachment in record_attachments:
-            filename = attachment["name"]
-            filename_saved = filename.replace(" ", "_")
-            if Attachment.objects.filter(
-                asset=asset, attachment__endswith=filename_saved
-            ).exists():
-                self._logger.info(
-                    f"File {filename_saved} for {asset} was already saved, skipping."
-                )
-                return
+            collection = self.collections["Zakelijk"]
 
+        location = None
+        if "Locatie" in fields:
             try:
-                file = self.get(
-                    self.get_ninox_endpoint_url(
-                        table_id=table_id, record_id=record["id"], filename=filename
-                    ),
-                    stream=True,
+                location = self.locations[fields["Locatie"]]
+            except KeyError:
+                self._logger.warning(
+                    f"Could not match location for {category} asset {asset_number}"
                 )
-                self._logger.info(f"Saving file {filename_saved} for {asset}.")
 
-                if file:
-                    attachment = Attachment(asset=asset)
-                    attachment.attachment.save(
-                        filename_saved, ContentFile(file.content), save=True
-                    )
-            except Exception as err:
-                self._logger.warning(f"Some error occurred: {err}")
-
-    def sync_ninox_record(self, record, category, table_id, with_media=True):
-        asset, created, status = self.create_asset(record, category)
-
-        if asset:
-            self.update_asset_details(asset, record)
-            if with_media:
-                self.update_asset_media(asset, record, table_id)
+        return {
+            "name": asset_number,
+            "category": category,
+            "collection": collection,
+            "size": fields.get("Maat"),
+            "location": location,
+            "listing_price": fields.get("Waarde"),
+            "local_status": status,
+            "raw_data": record,
+            "created_at": get_record_created_at(record),
+            "remark": get_record_remark(record),
+        }
+
+    def stage_instrument_registration(self, record):
+        """Map a record of the instrument registrations to the values of its asset."""
+        fields = record["fields"]
+        if "Nummer" not in fields:
+            self._logger.warning(
+                f"Found an instrument without number, skipping: {record}"
+            )
+            return None
 
-    def sync_instrument_registrations(self, record, table_id, with_media=True):
-        try:
-            nummer = record["fields"]["Nummer"]
-        except KeyError:
-            logging.warning(f"Found an instrument without number, skipping: {record}")
-            return
         try:
-            collection = self.ninox_collection_to_collection[
-                record["fields"]["Soort registratie"]
-            ]
+            category = self.type_categories[fields["Type"]]
         except KeyError:
-            collection = self.ninox_collection_to_collection["Algemene registratie"]
+            self._logger.warning(
+                f"Could not match category for instrument {fields['Nummer']}"
+            )
+            return None
 
         try:
-            size, _ = Size.objects.get_or_create(name=record["fields"]["Maat"])
+            collection = self.collections[fields["Soort registratie"]]
         except KeyError:
-            size = None
+            collection = self.collections["Algemene registratie"]
+
+        return {
+            "name": str(fields["Nummer"]),
+            "category": category,
+            "collection": collection,
+            "size": fields.get("Maat"),
+            "listing_price": fields.get("Min. verkoopprijs"),
+            "raw_data": record,
+            "created_at": get_record_created_at(record),
+            "remark": get_record_remark(record),
+        }
+
+    def get_assets_by_name(self, names):
+        return {
+            asset.name: asset
+            for asset in annotate_current_status(Asset.objects.filter(name__in=names))
+        }
+
+    def write_assets(self, rows):
+        """
+        Write the assets of staged records with bulk upserts.
+
+        The existing assets are loaded with one query, the new ones are
+        created with one bulk insert and all of them are updated with one bulk
+        update, followed by their sizes and remarks. An asset number that is
+        already used in another category gets the category appended, and the
+        row is changed to that name. Returns the assets by name.
+        """
+        self.resolve_sizes({row["size"] for row in rows if row["size"]})
+
+        existing = self.get_assets_by_name({row["name"] for row in rows})
+        renamed = set()
+        for row in rows:
+            asset = existing.get(row["name"])
+            if asset is not None and asset.category_id != row["category"].pk:
+                new_name = slugify(f"{row['name']}-{row['category']}")
+                self._logger.warning(
+                    f"Asset {row['name']} already exists in a different category, changing the number to {new_name}"
+                )
+                row["name"] = new_name
+                renamed.add(new_name)
+        if renamed:
+            existing.update(self.get_assets_by_name(renamed))
+
+        # Later versions of the same asset replace earlier ones
+        rows_by_name = {row["name"]: row for row in rows}
+        fields = NINOX_ASSET_FIELDS.intersection(*(row.keys() for row in rows))
+        now = timezone.now()
+
+        assets = {}
+        for name, row in rows_by_name.items():
+            asset = existing.get(name)
+            if asset is None:
+                asset = Asset(name=name)
+                # New assets have no status changes yet
+                asset.latest_status_from_changes = None
+            for field in fields:
+                setattr(asset, field, row[field])
+            asset.size = self.sizes[row["size"]] if row["size"] else None
+            asset.updated_at = now
+            asset.update_derived_fields()
+            assets[name] = asset
+
+        Asset.objects.bulk_create(
+            [asset for asset in assets.values() if asset._state.adding]
+        )
+        for name, row in rows_by_name.items():
+            if row["created_at"]:
+                assets[name].created_at = row["created_at"]
+        Asset.objects.bulk_update(
+            assets.values(),
+            sorted(
+                fields
+                | {
+                    "size",
+                    "location",
+                    "location_nr",
+                    "is_margin_asset",
+                    "created_at",
+                    "updated_at",
+                }
+            ),
+        )
 
-        try:
-            category, _ = self.ninox_category_to_category[record["fields"]["Type"]]
-        except KeyError:
-            logging.warning(
-                f"Could not match category for instrument {record['fields']['Nummer']}"
-            )
-            return
+        Size.categories.through.objects.bulk_create(
+            [
+                Size.categories.through(size_id=size_id, category_id=category_id)
+                for size_id, category_id in {
+                    (asset.size_id, asset.category_id)
+                    for asset in assets.values()
+                    if asset.size_id
+                }
+            ],
+            ignore_conflicts=True,
+        )
 
-        try:
-            listing_price = record["fields"]["Min. verkoopprijs"]
-        except KeyError:
-            listing_price = None
-
-        asset, _ = Asset.objects.update_or_create(
-            name=nummer,
-            category=category,
-            defaults={
-                "collection": collection,
-                "size": size,
-                "listing_price": listing_price,
-            },
+        remarks = {
+            (assets[row["name"]].pk, row["remark"]) for row in rows if row["remark"]
+        }
+        remarks -= set(
+            Remark.objects.filter(
+                asset__in=[asset_id for asset_id, _ in remarks]
+            ).values_list("asset_id", "remark")
+        )
+        Remark.objects.bulk_create(
+            Remark(asset_id=asset_id, remark=remark) for asset_id, remark in remarks
         )
 
-        asset.raw_data = record
-        if (
-            "createdAt" in record.keys()
-            and record["createdAt"]
-            and record["createdAt"] != ""
-        ):
-            asset.created_at = make_aware(parse_datetime(record["createdAt"]))
-        elif (
-            "updatedAt" in record.keys()
-            and record["updatedAt"]
-            and record["updatedAt"] != ""
-        ):
-            asset.created_at = make_aware(parse_datetime(record["updatedAt"]))
-        asset.save()
+        return assets
+
+    def write_records(self, records, stage_record, stats):
+        """
+        Write a batch of changed records in one transaction.
+
+        Returns the states of the records that were imported, of which the
+        media still has to be imported.
+        """
+        staged = []
+        for record, state in records:
+            stats["records"] += 1
+            row = stage_record(record)
+            if row is not None:
+                staged.append((row, state))
+        if not staged:
+            return []
+
+        now = timezone.now()
+        with transaction.atomic():
+            assets = self.write_assets([row for row, _ in staged])
+            states = []
+            for row, state in staged:
+                state.asset = assets[row["name"]]
+                state.media_imported = False
+                state.synced_at = now
+                states.append(state)
+
+            NinoxRecordState.objects.bulk_create(
+                [state for state in states if state._state.adding]
+            )
+            NinoxRecordState.objects.bulk_update(
+                states, ["asset", "modified_at", "media_imported", "synced_at"]
+            )
+        return states
+
+    def import_media(self, table_id, states, executor, stats):
+        """Download the media of records with the executor, and attach it to their assets."""
+        media_downloads = {
+            executor.submit(
+                self.download_record_media,
+                state.asset,
+                table_id,
+                state.record_id,
+                set(state.files),
+            ): state
+            for state in states
+        }
+
+        for future in as_completed(media_downloads):
+            state = media_downloads[future]
+            downloaded, complete = future.result()
+            for filename, name, size in downloaded:
+                attachment = Attachment(asset=state.asset)
+                attachment.attachment.name = name
+                attachment.save()
+                state.files.append(filename)
+                stats["files"] += 1
+                stats["bytes"] += size
+            if not complete:
+                stats["failed"] += 1
+            state.media_imported = complete
+            state.save(update_fields=["files", "media_imported", "synced_at"])
+
+    def sync_table(self, table_id, stage_record, stats, executor=None, full=False):
+        """
+        Import the records of a table that changed since they were last imported.
+
+        The changed records are staged in memory and written in batches, and
+        then their media is downloaded by the executor. Without an executor
+        the media is not imported, and records whose media was not fully
+        imported have their media downloaded again on a next sync.
+        """
+        states = {
+            state.record_id: state
+            for state in NinoxRecordState.objects.filter(
+                table_id=table_id
+            ).select_related("asset")
+        }
+        changed = []
+        media_states = []
+
+        for record in self.get_records(table_id):
+            record_id = str(record["id"])
+            modified_at = get_record_modified_at(record)
+            state = states.get(record_id) or NinoxRecordState(
+                table_id=table_id, record_id=record_id
+            )
+            if (
+                not full
+                and modified_at is not None
+                and state.modified_at == modified_at
+            ):
+                stats["skipped"] += 1
+                if not state.media_imported and state.asset is not None:
+                    media_states.append(state)
+                continue
 
-        try:
-            remarks = record["fields"]["Notities"]
-            remarks = bleach.clean(remarks, tags=[], attributes={}, strip=True)
-            Remark.objects.get_or_create(asset=asset, remark=remarks)
-        except KeyError:
-            pass
+            state.modified_at = modified_at
+            changed.append((record, state))
 
-        if with_media:
-            self.update_asset_media(asset, record, table_id)
+        for records in batched(changed, NINOX_WRITE_BATCH_SIZE):
+            media_states.extend(self.write_records(records, stage_record, stats))
 
-    def full_sync(self, with_media=True, with_instrument_registrations=True):
-        tables = self.get(self.get_ninox_endpoint_url())
-        for table in tables:
-            if not table["name"] in self.ninox_table_to_asset_category:
-                if (
+        if executor is not None:
+            self.import_media(table_id, media_states, executor, stats)
+
+    def full_sync(
+        self, with_media=True, with_instrument_registrations=True, full=False
+    ):
+        """
+        Import the changed records of all known tables from Ninox.
+
+        Pass full to also import the records that did not change since the
+        last sync. Returns statistics on the imported records and files.
+        """
+        stats = {"records": 0, "skipped": 0, "files": 0, "bytes": 0, "failed": 0}
+        tables = self.get(self.get_ninox_endpoint_url()) or []
+        self.resolve_reference_data()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for table in tables:
+                if table["name"] in self.table_categories:
+                    stage_record = partial(
+                        self.stage_ninox_record,
+                        category=self.table_categories[table["name"]],
+                    )
+                elif (
                     table["name"] == "Instrumentenregistraties"
                     and with_instrument_registrations
                 ):
-                    records = self.get(
-                        self.get_ninox_endpoint_url(table_id=table["id"])
-                    )
-                    for record in records:
-                        self.sync_instrument_registrations(
-                            record, table["id"], with_media
-                        )
-                continue
+                    stage_record = self.stage_instrument_registration
+                else:
+                    continue
+
+                self.sync_table(
+                    table["id"],
+                    stage_record,
+                    stats,
+                    executor=executor if with_media else None,
+                    full=full,
+                )
 
-            category, _ = self.ninox_table_to_asset_category[table["name"]]
-            records = self.get(self.get_ninox_endpoint_url(table_id=table["id"]))
-            for record in records:
-                self.sync_ninox_record(record, category, table["id"], with_media)
+        # Assets are written in bulk, which does not send the signals that clear the cache
+        clear_asset_names_cache()
+        return stats
@@ -0,0 +1,262 @@
+"""Test the incremental Ninox import against a local fake Ninox API."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from inventory.models.asset import Asset, AssetStates
+from inventory.models.attachment import Attachment
+from inventory.models.category import Category
+from inventory.models.collection import Collection
+from inventory.models.remarks import Remark
+from inventory.services import get_asset_names
+from inventory.tests.utils import TemporaryMediaRootMixin
+from ninox_import.models import NinoxRecordState
+from ninox_import.ninox_sync import NinoxImporter
+
+
+class FakeNinox:
+    """The data served by the fake Ninox API, and the requests it received."""
+
+    def __init__(self):
+        self.tables = [
+            {"id": "A", "name": "Violen"},
+            {"id": "B", "name": "Instrumentenregistraties"},
+            {"id": "C", "name": "Klanten"},
+        ]
+        self.records = {
+            "A": [
+                {
+                    "id": 1,
+                    "createdAt": "2023-01-01T10:00:00",
+                    "modifiedAt": "2024-01-01T10:00:00",
+                    "fields": {
+                        "Nummer": "V1",
+                        "Status": "In huis beschikbaar - boven",
+                        "Collectie": "Zakelijk",
+                        "Maat": "4/4",
+                        "Locatie": "Boven - Keuken",
+                        "Notities": "<b>Mooie</b> viool",
+                    },
+                },
+                {
+                    "id": 2,
+                    "modifiedAt": "2024-01-01T10:00:00",
+                    "fields": {"Nummer": "V2", "Status": "Verkocht"},
+                },
+            ],
+            "B": [
+                {
+                    "id": 1,
+                    "modifiedAt": "2024-01-01T10:00:00",
+                    "fields": {
+                        "Nummer": "C1",
+                        "Type": "Cello",
+                        "Soort registratie": "Prive",
+                    },
+                }
+            ],
+        }
+        self.files = {("A", "1"): {"front photo.jpg": b"\xff\xd8" + b"x" * 200_000}}
+        self.failing_files = set()
+        self.requests = []
+
+
+class FakeNinoxHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        ninox = self.server.ninox
+        path = unquote(urlparse(self.path).path)
+        ninox.requests.append(path)
+        parts = path.strip("/").split("/")[6:]  # Skip v1/teams/T/databases/D/tables
+
+        if not parts:
+            return self._send_json(ninox.tables)
+        if len(parts) == 2:
+            return self._send_json(ninox.records.get(parts[0], []))
+
+        files = ninox.files.get((parts[0], parts[2]), {})
+        if len(parts) == 4:
+            return self._send_json([{"name": name} for name in files])
+        if parts[4] in ninox.failing_files:
+            self.send_response(500)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.end_headers()
+        self.wfile.write(files[parts[4]])
+
+    def _send_json(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class NinoxSyncTest(TemporaryMediaRootMixin, TestCase):
+    """Test cases for NinoxImporter.full_sync."""
+
+    def setUp(self):
+        """Start the fake Ninox API."""
+        super().setUp()
+        cache.clear()
+        self.ninox = FakeNinox()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeNinoxHandler)
+        self.server.ninox = self.ninox
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        """Stop the fake Ninox API."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _sync(self, **kwargs):
+        importer = NinoxImporter(
+            api_url=f"http://127.0.0.1:{self.server.server_port}", max_workers=2
+        )
+        importer.team_id = "T"
+        importer.database_id = "D"
+        self.ninox.requests.clear()
+        return importer.full_sync(**kwargs)
+
+    def _file_requests(self):
+        return [path for path in self.ninox.requests if "/files" in path]
+
+    def test_full_sync(self):
+        """Test records are imported and their media streamed to storage."""
+        stats = self._sync()
+
+        self.assertEqual(
+            stats,
+            {"records": 3, "skipped": 0, "files": 1, "bytes": 200_002, "failed": 0},
+        )
+        asset = Asset.objects.get(name="V1")
+        self.assertEqual(asset.local_status, AssetStates.AVAILABLE)
+        self.assertEqual(asset.size.name, "4/4")
+        self.assertEqual(asset.location.get_full_path(), "Boven › Keuken")
+        self.assertEqual(asset.remarks.get().remark, "Mooie viool")
+        self.assertEqual(Asset.objects.get(name="C1").collection.name, "Prive")
+
+        attachment = Attachment.objects.get()
+        self.assertEqual(attachment.asset, asset)
+        self.assertTrue(attachment.attachment.name.endswith(".jpg"))
+        with attachment.attachment.open("rb") as file:
+            self.assertEqual(
+                file.read(), self.ninox.files[("A", "1")]["front photo.jpg"]
+            )
+        self.assertEqual(NinoxRecordState.objects.count(), 3)
+
+    def test_unchanged_records_skipped(self):
+        """Test a next sync only imports the changed records and new files."""
+        self._sync()
+        stats = self._sync()
+        self.assertEqual(stats["records"], 0)
+        self.assertEqual(stats["skipped"], 3)
+        self.assertEqual(self._file_requests(), [])
+
+        self.ninox.records["A"][0]["modifiedAt"] = "2024-02-01T10:00:00"
+        self.ninox.records["A"][0]["fields"]["Status"] = "Verkocht"
+        self.ninox.files[("A", "1")]["back.jpg"] = b"back"
+        stats = self._sync()
+
+        self.assertEqual(stats["records"], 1)
+        self.assertEqual(stats["skipped"], 2)
+        self.assertEqual(stats["files"], 1)
+        self.assertEqual(Asset.objects.get(name="V1").local_status, AssetStates.SOLD)
+        self.assertEqual(Attachment.objects.count(), 2)
+        self.assertNotIn(
+            "/v1/teams/T/databases/D/tables/A/records/1/files/front photo.jpg",
+            self.ninox.requests,
+        )
+
+        stats = self._sync(full=True)
+        self.assertEqual(stats["records"], 3)
+        self.assertEqual(stats["files"], 0)
+
+    def test_failed_media_retried(self):
+        """Test media that failed to download is tried again, without the record."""
+        self.ninox.failing_files.add("front photo.jpg")
+        stats = self._sync()
+        self.assertEqual(stats["failed"], 1)
+        self.assertFalse(Attachment.objects.exists())
+        self.assertFalse(
+            NinoxRecordState.objects.get(table_id="A", record_id="1").media_imported
+        )
+
+        self.ninox.failing_files.clear()
+        stats = self._sync()
+        self.assertEqual(stats["records"], 0)
+        self.assertEqual(stats["files"], 1)
+        self.assertTrue(
+            NinoxRecordState.objects.get(table_id="A", record_id="1").media_imported
+        )
+
+    def test_quick_sync(self):
+        """Test a sync without media does not request any files."""
+        stats = self._sync(with_media=False)
+        self.assertEqual(stats["records"], 3)
+        self.assertEqual(self._file_requests(), [])
+
+        stats = self._sync()
+        self.assertEqual(stats["records"], 0)
+        self.assertEqual(stats["files"], 1)
+
+    def test_records_written_in_bulk(self):
+        """Test the number of queries does not grow with the number of records."""
+        self.ninox.records["A"] += [
+            {
+                "id": number,
+                "createdAt": "2023-01-01T10:00:00",
+                "modifiedAt": "2024-01-01T10:00:00",
+                "fields": {
+                    "Nummer": f"V{number}",
+                    "Status": "Verhuurd",
+                    "Collectie": "Prive",
+                    "Maat": ["1/2", "3/4", "4/4"][number % 3],
+                    "Notities": f"Viool {number}",
+                },
+            }
+            for number in range(3, 203)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = self._sync(with_media=False)
+
+        self.assertEqual(stats["records"], 203)
+        self.assertLess(len(queries), 50)
+        self.assertEqual(Asset.objects.count(), 203)
+        self.assertEqual(Remark.objects.count(), 201)
+        asset = Asset.objects.get(name="V100")
+        self.assertEqual(asset.size.name, "3/4")
+        self.assertTrue(asset.is_margin_asset)
+        self.assertEqual(asset.created_at.year, 2023)
+        self.assertIn(asset.category, asset.size.categories.all())
+
+    def test_existing_assets_updated(self):
+        """Test assets are matched by name, and remarks are not added twice."""
+        cellos = Category.objects.create(name="Cello's", name_singular="Cello")
+        collection = Collection.objects.create(name="Zakelijk")
+        cello = Asset.objects.create(name="V2", category=cellos, collection=collection)
+        get_asset_names()  # Fill the cache
+
+        self._sync(with_media=False)
+        self._sync(with_media=False, full=True)
+
+        cello.refresh_from_db()
+        self.assertEqual(cello.category, cellos)
+        self.assertEqual(Asset.objects.get(name="v2-violen").category.name, "Violen")
+        self.assertEqual(Asset.objects.filter(name="V1").count(), 1)
+        self.assertEqual(Remark.objects.count(), 1)
+        # Assets are written in bulk, the cached names are cleared after the sync
+        self.assertIn("v2-violen", get_asset_names())
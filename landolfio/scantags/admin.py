@@ -1,6 +1,9 @@
 from django.contrib import admin
+from django.http import HttpResponse
+from django.utils.translation import gettext_lazy as _
 
 from scantags.models import ScanTag
+from scantags.services import write_scan_tags_csv
 
 
 @admin.register(ScanTag)
@@ -9,3 +12,13 @@ class ScanTagAdmin(admin.ModelAdmin):
     ordering = ["id"]
     list_display = ["id", "asset"]
     autocomplete_fields = ["asset"]
+    actions = ["export_csv"]
+
+    @admin.action(description=_("Export selected tags as CSV for printing"))
+    def export_csv(self, request, queryset):
+        response = HttpResponse(content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="scantags.csv"'
+        write_scan_tags_csv(
+            queryset.order_by("id").values_list("id", flat=True), response
+        )
+        return response
@@ -7,3 +7,8 @@ class ScanTagsConfig(AppConfig):
     name = "scantags"
     verbose_name = _("🔖 Scan tags")
     default = True
+
+    def ready(self):
+        """Import the signals when the app is ready."""
+        # pylint: disable=unused-import,import-outside-toplevel
+        from . import signals
@@ -0,0 +1,31 @@
+from datetime import date
+
+from django import forms
+from django.utils.translation import gettext_lazy as _
+
+from inventory.models.asset import AssetStates
+
+
+class StocktakeForm(forms.Form):
+    """Form for the status change that is recorded for all assets scanned in a stocktake."""
+
+    status_date = forms.DateField(
+        required=True,
+        input_formats=["%Y-%m-%d"],
+        label=_("Status Date"),
+        initial=date.today,
+    )
+
+    new_status = forms.ChoiceField(
+        choices=[("", _("No change"))] + list(AssetStates.choices),
+        label=_("New Status"),
+        required=False,
+    )
+
+    comments = forms.CharField(
+        required=False,
+        widget=forms.Textarea(attrs={"class": "form-control", "rows": 2}),
+        label=_("Comments"),
+    )
+
+    idempotency_key = forms.CharField(max_length=64, widget=forms.HiddenInput())
@@ -1,6 +1,12 @@
+import time
+
 from django.core.management.base import BaseCommand
 
-from scantags.models import ScanTag
+from scantags.services import (
+    SCANTAGS_BATCH_SIZE,
+    generate_scan_tags,
+    write_scan_tags_csv,
+)
 
 
 class Command(BaseCommand):
@@ -8,13 +14,37 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("amount", type=int)
+        parser.add_argument(
+            "--output",
+            help="Write the new tags to this CSV file, to print them as labels",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SCANTAGS_BATCH_SIZE,
+            help="Number of tags to insert at once",
+        )
 
     def handle(self, *args, **options):
         amount = options["amount"]
-        for _ in range(amount):
-            new_id = ScanTag.generate_new_id()
-            tag = ScanTag(id=new_id)
-            tag.full_clean()
-            tag.save()
-            self.stdout.write(self.style.NOTICE("New tag generated: {}".format(new_id)))
-        self.stdout.write(self.style.SUCCESS(f"Successfully created {amount} tags."))
+
+        start = time.monotonic()
+        tag_ids = generate_scan_tags(amount, batch_size=options["batch_size"])
+        duration = time.monotonic() - start
+
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as file:
+                write_scan_tags_csv(tag_ids, file)
+            self.stdout.write(f"Wrote the new tags to {options['output']}.")
+        else:
+            for tag_id in tag_ids:
+                self.stdout.write(
+                    self.style.NOTICE("New tag generated: {}".format(tag_id))
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully created {len(tag_ids)} tags in {duration:.1f}s "
+                f"({len(tag_ids) / max(duration, 0.001):.0f} tags/s)."
+            )
+        )
@@ -0,0 +1,48 @@
+# Generated by Django 6.1.2 on 2026-10-19 12:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scantags", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StocktakeUpload",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "idempotency_key",
+                    models.CharField(
+                        help_text="Uploading the same stocktake with the same key again does not record it twice",
+                        max_length=64,
+                        unique=True,
+                        verbose_name="idempotency key",
+                    ),
+                ),
+                (
+                    "result",
+                    models.JSONField(blank=True, default=dict, verbose_name="result"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created at"),
+                ),
+            ],
+            options={
+                "verbose_name": "stocktake upload",
+                "verbose_name_plural": "stocktake uploads",
+            },
+        ),
+    ]
@@ -24,20 +24,23 @@ def validate_iso7064_mod_37_36(value):
         )
 
 
+def random_scan_tag_id():
+    """Return a random scan tag id with a valid check digit."""
+    new_id = settings.SCANTAGS_PREFIX
+    new_id += "".join(
+        random.choices(
+            settings.SCANTAGS_ALPHABET,
+            k=settings.SCANTAGS_ID_LENGTH - 1 - len(new_id),
+        )
+    )
+    new_id += mod_37_36.calc_check_digit(new_id, alphabet=settings.SCANTAGS_ALPHABET)
+    return new_id
+
+
 def generate_new_id():
-    existing_ids = ScanTag.objects.values_list("id", flat=True)
     while True:
-        new_id = settings.SCANTAGS_PREFIX
-        new_id += "".join(
-            random.choices(
-                settings.SCANTAGS_ALPHABET,
-                k=settings.SCANTAGS_ID_LENGTH - 1 - len(new_id),
-            )
-        )
-        new_id += mod_37_36.calc_check_digit(
-            new_id, alphabet=settings.SCANTAGS_ALPHABET
-        )
-        if new_id not in existing_ids:
+        new_id = random_scan_tag_id()
+        if not ScanTag.objects.filter(id=new_id).exists():
             return new_id
 
 
@@ -68,3 +71,25 @@ class ScanTag(models.Model):
     class Meta:
         verbose_name = _("scan tag")
         verbose_name_plural = _("scan tags")
+
+
+class StocktakeUpload(models.Model):
+    """The result of an uploaded stocktake, so a retried upload is not recorded twice."""
+
+    idempotency_key = models.CharField(
+        max_length=64,
+        unique=True,
+        verbose_name=_("idempotency key"),
+        help_text=_(
+            "Uploading the same stocktake with the same key again does not record it twice"
+        ),
+    )
+    result = models.JSONField(default=dict, blank=True, verbose_name=_("result"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("created at"))
+
+    class Meta:
+        verbose_name = _("stocktake upload")
+        verbose_name_plural = _("stocktake uploads")
+
+    def __str__(self):
+        return self.idempotency_key
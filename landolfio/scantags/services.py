@@ -0,0 +1,103 @@
+import csv
+
+from django.conf import settings as django_settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+
+from scantags.models import ScanTag, random_scan_tag_id
+
+SCANTAGS_BATCH_SIZE = 1000
+
+SCAN_TAG_CACHE_KEY = "scantags:tag:{}"
+SCAN_TAG_CACHE_TIMEOUT = 60 * 60
+
+SCANTAGS_CSV_HEADER = ["id", "url"]
+
+
+def generate_scan_tags(amount, batch_size=SCANTAGS_BATCH_SIZE) -> list[str]:
+    """
+    Create new scan tags in bulk and return their ids.
+
+    The existing ids are loaded once, and new ids are generated and inserted in
+    batches. A tag can still be created in the meantime, such as by scanning an
+    unknown tag. Its batch then fails to insert as a whole and is generated
+    again, so every returned id belongs to a tag this call created.
+    """
+    existing_ids = set(ScanTag.objects.values_list("id", flat=True))
+    created = []
+
+    while len(created) < amount:
+        batch = set()
+        while len(batch) < min(batch_size, amount - len(created)):
+            new_id = random_scan_tag_id()
+            if new_id not in existing_ids:
+                batch.add(new_id)
+        existing_ids |= batch
+
+        try:
+            with transaction.atomic():
+                ScanTag.objects.bulk_create([ScanTag(id=new_id) for new_id in batch])
+        except IntegrityError:
+            continue
+        created.extend(sorted(batch))
+
+    return created
+
+
+def write_scan_tags_csv(tag_ids, file):
+    """Write a sheet of scan tags with the URL to encode in their QR code."""
+    writer = csv.writer(file)
+    writer.writerow(SCANTAGS_CSV_HEADER)
+    for tag_id in tag_ids:
+        writer.writerow(
+            [
+                tag_id,
+                f"{getattr(django_settings, 'BASE_URL', '')}{reverse('scan', args=[tag_id])}",
+            ]
+        )
+
+
+def resolve_scan_tags(tag_ids) -> dict[str, str | None]:
+    """
+    Return the id of the linked asset for each known scan tag.
+
+    Tags are looked up in the cache first and the remaining ones are loaded
+    with a single query. Tags that do not exist are left out of the result,
+    and are not cached so they can be created by scanning them. Tags that are
+    not linked to an asset map to None.
+    """
+    tag_ids = list(dict.fromkeys(str(tag_id) for tag_id in tag_ids))
+    cached = cache.get_many([SCAN_TAG_CACHE_KEY.format(tag_id) for tag_id in tag_ids])
+
+    resolved = {}
+    missing = []
+    for tag_id in tag_ids:
+        asset_id = cached.get(SCAN_TAG_CACHE_KEY.format(tag_id))
+        if asset_id is None:
+            missing.append(tag_id)
+        else:
+            # Unlinked tags are cached as an empty string
+            resolved[tag_id] = asset_id or None
+
+    if missing:
+        loaded = {
+            tag_id: str(asset_id) if asset_id else None
+            for tag_id, asset_id in ScanTag.objects.filter(id__in=missing).values_list(
+                "id", "asset_id"
+            )
+        }
+        cache.set_many(
+            {
+                SCAN_TAG_CACHE_KEY.format(tag_id): asset_id or ""
+                for tag_id, asset_id in loaded.items()
+            },
+            SCAN_TAG_CACHE_TIMEOUT,
+        )
+        resolved.update(loaded)
+
+    return resolved
+
+
+def clear_scan_tag_cache(tag_id):
+    cache.delete(SCAN_TAG_CACHE_KEY.format(tag_id))
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from scantags.models import ScanTag
+from scantags.services import clear_scan_tag_cache
+
+
+@receiver([post_save, post_delete], sender=ScanTag)
+def scan_tag_changed(sender, instance, **kwargs):
+    """Clear the cached asset of a scan tag when it is linked, unlinked or deleted."""
+    clear_scan_tag_cache(instance.id)
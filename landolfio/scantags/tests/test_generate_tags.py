@@ -0,0 +1,76 @@
+"""Test generating scan tags in bulk."""
+
+import csv
+import io
+import time
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from scantags.models import ScanTag, validate_iso7064_mod_37_36
+from scantags.services import generate_scan_tags
+
+
+class GenerateScanTagsTest(TestCase):
+    """Test cases for generate_scan_tags."""
+
+    def test_generate(self):
+        """Test the requested number of new, valid tags is created."""
+        ScanTag.objects.create(id="A000000Z")
+        tag_ids = generate_scan_tags(25, batch_size=10)
+
+        self.assertEqual(len(set(tag_ids)), 25)
+        self.assertEqual(ScanTag.objects.count(), 26)
+        for tag_id in tag_ids:
+            validate_iso7064_mod_37_36(tag_id)
+
+    def test_collisions(self):
+        """Test a batch that collides with a tag created in the meantime is generated again."""
+        existing = ScanTag.objects.create().id
+        created_meanwhile = "A1111112"
+        ids = iter([existing, created_meanwhile, "A2222223", "A3333334", "A4444445"])
+
+        def random_scan_tag_id():
+            new_id = next(ids)
+            if new_id == created_meanwhile:
+                # Another tag is scanned after the existing ids were loaded
+                ScanTag.objects.create(id=created_meanwhile)
+            return new_id
+
+        with mock.patch("scantags.services.random_scan_tag_id", random_scan_tag_id):
+            tag_ids = generate_scan_tags(2)
+
+        self.assertEqual(tag_ids, ["A3333334", "A4444445"])
+        self.assertFalse(ScanTag.objects.filter(id="A2222223").exists())
+        self.assertEqual(ScanTag.objects.count(), 4)
+
+    def test_benchmark(self):
+        """Test a print run of tags is created with a few queries per batch."""
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            tag_ids = generate_scan_tags(5000)
+        duration = time.perf_counter() - start
+
+        self.assertEqual(ScanTag.objects.count(), 5000)
+        self.assertEqual(len(tag_ids), 5000)
+        # Loading the existing ids, and inserting each batch in a savepoint
+        self.assertLessEqual(len(queries), 1 + 3 * 5)
+        self.assertLess(duration, 5)
+
+    def test_command_csv(self):
+        """Test the command writes the new tags to a CSV file for printing."""
+        open_mock = self.enterContext(mock.patch("builtins.open", mock.mock_open()))
+        output = open_mock.return_value
+        call_command("generatetags", 3, output="tags.csv", stdout=io.StringIO())
+        open_mock.assert_called_once_with("tags.csv", "w", newline="", encoding="utf-8")
+
+        written = "".join(call.args[0] for call in output.write.call_args_list)
+        rows = list(csv.reader(io.StringIO(written)))
+        self.assertEqual(rows[0], ["id", "url"])
+        self.assertCountEqual(
+            [row[0] for row in rows[1:]], ScanTag.objects.values_list("id", flat=True)
+        )
+        self.assertTrue(rows[1][1].endswith(f"/scan/{rows[1][0]}/"))
@@ -0,0 +1,209 @@
+"""Test resolving scanned tags to assets and uploading stocktakes."""
+
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from inventory.models.asset import Asset, AssetStates
+from inventory.models.status_change import StatusChange
+from inventory.tests.utils import create_category, create_collection
+from scantags.models import ScanTag, random_scan_tag_id
+from scantags.services import resolve_scan_tags
+
+
+class ScanResolutionTest(TestCase):
+    """Test cases for resolve_scan_tags and the scan views."""
+
+    def setUp(self):
+        """Set up the test case."""
+        cache.clear()
+        category = create_category()
+        collection = create_collection()
+        self.asset = Asset.objects.create(
+            name="V1",
+            category=category,
+            collection=collection,
+            local_status=AssetStates.AVAILABLE,
+        )
+        self.linked = ScanTag.objects.create(id=random_scan_tag_id(), asset=self.asset)
+        self.unlinked = ScanTag.objects.create(id=random_scan_tag_id())
+        self.unknown = random_scan_tag_id()
+        self.client.force_login(
+            get_user_model().objects.create_user(
+                username="staff", password="secret", is_staff=True
+            )
+        )
+
+    def test_resolve_cached(self):
+        """Test tags are resolved with one query, and from the cache afterwards."""
+        tag_ids = [self.linked.id, self.unlinked.id, self.unknown]
+        expected = {self.linked.id: str(self.asset.pk), self.unlinked.id: None}
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(resolve_scan_tags(tag_ids), expected)
+        self.assertEqual(len(queries), 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(resolve_scan_tags(tag_ids), expected)
+        self.assertEqual(len(queries), 1)  # Only the unknown tag is looked up
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(resolve_scan_tags(tag_ids[:2]), expected)
+        self.assertEqual(len(queries), 0)
+
+    def test_cache_invalidated(self):
+        """Test linking, unlinking and deleting tags is picked up immediately."""
+        resolve_scan_tags([self.linked.id, self.unlinked.id])
+
+        self.unlinked.asset = self.asset
+        self.unlinked.save()
+        self.linked.delete()
+
+        self.assertEqual(
+            resolve_scan_tags([self.linked.id, self.unlinked.id]),
+            {self.unlinked.id: str(self.asset.pk)},
+        )
+
+    def test_scan_redirects_to_asset(self):
+        """Test scanning a linked tag opens the asset."""
+        response = self.client.get(reverse("scan", args=[self.linked.id]))
+        self.assertRedirects(
+            response,
+            reverse("inventory_frontend:detail", args=[self.asset.pk]),
+            fetch_redirect_response=False,
+        )
+
+        response = self.client.get(reverse("scan", args=[self.unknown]))
+        self.assertRedirects(
+            response,
+            reverse("admin:scantags_scantag_change", args=[self.unknown]),
+            fetch_redirect_response=False,
+        )
+        self.assertTrue(ScanTag.objects.filter(id=self.unknown).exists())
+
+    def test_resolve_view(self):
+        """Test a batch of tags is resolved at once."""
+        response = self.client.post(
+            reverse("scan-resolve"),
+            json.dumps({"tag_ids": [self.linked.id, self.unlinked.id, self.unknown]}),
+            content_type="application/json",
+        )
+
+        tags = response.json()["tags"]
+        self.assertEqual(tags[self.linked.id]["asset"]["name"], "V1")
+        self.assertEqual(tags[self.unlinked.id], {"known": True, "asset": None})
+        self.assertEqual(tags[self.unknown], {"known": False, "asset": None})
+
+        response = self.client.post(
+            reverse("scan-resolve"), "[]", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_stocktake_upload(self):
+        """Test one status change is recorded per scanned asset."""
+        response = self.client.get(reverse("scan-stocktake"))
+        self.assertContains(response, reverse("scan-stocktake-upload"))
+
+        response = self.client.post(
+            reverse("scan-stocktake-upload"),
+            json.dumps(
+                {
+                    "tag_ids": [
+                        self.linked.id,
+                        self.linked.id,
+                        self.unlinked.id,
+                        self.unknown,
+                    ],
+                    "status_date": "2025-01-01",
+                    "new_status": AssetStates.UNDER_REVIEW,
+                    "comments": "Stocktake",
+                    "idempotency_key": "stocktake-1",
+                }
+            ),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            response.json(),
+            {
+                "success": True,
+                "status_changes": 1,
+                "unknown": [self.unknown],
+                "unlinked": [self.unlinked.id],
+                "failures": [],
+            },
+        )
+        status_change = StatusChange.objects.get()
+        self.assertEqual(status_change.asset, self.asset)
+        self.assertEqual(status_change.new_status, AssetStates.UNDER_REVIEW)
+
+        response = self.client.post(
+            reverse("scan-stocktake-upload"),
+            json.dumps(
+                {
+                    "tag_ids": [self.linked.id],
+                    "new_status": "invalid",
+                    "idempotency_key": "stocktake-2",
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def _upload_stocktake(self, tag_ids, idempotency_key="stocktake"):
+        return self.client.post(
+            reverse("scan-stocktake-upload"),
+            json.dumps(
+                {
+                    "tag_ids": tag_ids,
+                    "status_date": "2025-01-01",
+                    "new_status": AssetStates.UNDER_REVIEW,
+                    "idempotency_key": idempotency_key,
+                }
+            ),
+            content_type="application/json",
+        )
+
+    def test_stocktake_upload_retried(self):
+        """Test uploading the same stocktake again does not record it twice."""
+        first = self._upload_stocktake([self.linked.id])
+        retry = self._upload_stocktake([self.linked.id])
+
+        self.assertEqual(first.json()["status_changes"], 1)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(StatusChange.objects.count(), 1)
+
+        self._upload_stocktake([self.linked.id], idempotency_key="next")
+        self.assertEqual(StatusChange.objects.count(), 2)
+
+        response = self.client.post(
+            reverse("scan-stocktake-upload"),
+            json.dumps({"tag_ids": [self.linked.id], "status_date": "2025-01-01"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_stocktake_upload_failures_name_tags(self):
+        """Test assets that could not be changed are reported with their tags."""
+        with mock.patch(
+            "scantags.views.bulk_change_status",
+            return_value=([], [(str(self.asset.pk), "not found")]),
+        ):
+            response = self._upload_stocktake([self.linked.id])
+
+        self.assertEqual(
+            response.json()["failures"],
+            [
+                {
+                    "asset": str(self.asset.pk),
+                    "tags": [self.linked.id],
+                    "reason": "not found",
+                }
+            ],
+        )
@@ -3,5 +3,12 @@ from django.urls import path
 from scantags import views
 
 urlpatterns = [
+    path("resolve/", views.resolve_tags_view, name="scan-resolve"),
+    path("stocktake/", views.stocktake_view, name="scan-stocktake"),
+    path(
+        "stocktake/upload/",
+        views.stocktake_upload_view,
+        name="scan-stocktake-upload",
+    ),
     path("<str:id>/", views.tag_scan_view, name="scan"),
 ]
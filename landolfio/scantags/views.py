@@ -1,39 +1,174 @@
+import json
+
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.core.exceptions import ValidationError
-from django.shortcuts import redirect
+from django.db import IntegrityError, transaction
+from django.http import JsonResponse
+from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.http import require_POST
 
-from scantags.models import ScanTag
+from inventory.models.asset import Asset
+from inventory.services import bulk_change_status
+from scantags.forms import StocktakeForm
+from scantags.models import ScanTag, StocktakeUpload
+from scantags.services import resolve_scan_tags
 
 
 @staff_member_required
 def tag_scan_view(request, *args, **kwargs):
     tag_id = kwargs.get("id")
-    try:
-        scan_tag = ScanTag.objects.get(id=tag_id)
-        if scan_tag.asset:
-            return redirect(reverse("view_asset:view_asset", args=[scan_tag.asset_id]))
+    resolved = resolve_scan_tags([tag_id])
+    if tag_id in resolved:
+        if resolved[tag_id]:
+            return redirect(
+                reverse("inventory_frontend:detail", args=[resolved[tag_id]])
+            )
         else:
             messages.warning(
                 request, _("Tag {} is not linked to an asset.").format(tag_id)
             )
-            return redirect(
-                reverse("admin:scantags_scantag_change", args=[scan_tag.id])
-            )
-    except ScanTag.DoesNotExist:
-        scan_tag = ScanTag(id=tag_id)
-        try:
-            scan_tag.full_clean()
-            scan_tag.save()
-        except ValidationError as e:
-            messages.error(
-                request, _("Scanned a tag with an invalid id: {}").format(e.messages)
-            )
-            return redirect(reverse("admin:scantags_scantag_changelist"))
+            return redirect(reverse("admin:scantags_scantag_change", args=[tag_id]))
+
+    scan_tag = ScanTag(id=tag_id)
+    try:
+        scan_tag.full_clean()
+        scan_tag.save()
+    except ValidationError as e:
+        messages.error(
+            request, _("Scanned a tag with an invalid id: {}").format(e.messages)
+        )
+        return redirect(reverse("admin:scantags_scantag_changelist"))
+    else:
+        messages.success(request, _("New tag generated: {}").format(tag_id))
+        return redirect(reverse("admin:scantags_scantag_change", args=[scan_tag.id]))
+
+
+def _load_tag_ids(request):
+    """Return the list of scanned tag ids posted as JSON, or None if it is invalid."""
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return None, None
+    if not isinstance(data, dict):
+        return None, None
+    tag_ids = data.get("tag_ids")
+    if not isinstance(tag_ids, list) or not all(
+        isinstance(tag_id, str) for tag_id in tag_ids
+    ):
+        return None, data
+    return list(dict.fromkeys(tag_ids)), data
+
+
+@staff_member_required
+@require_POST
+def resolve_tags_view(request):
+    """Resolve a batch of scanned tags to their assets at once."""
+    tag_ids, _data = _load_tag_ids(request)
+    if tag_ids is None:
+        return JsonResponse(
+            {"success": False, "error": "Expected a list of tag_ids"}, status=400
+        )
+
+    resolved = resolve_scan_tags(tag_ids)
+    names = dict(
+        Asset.objects.filter(
+            pk__in=[asset_id for asset_id in resolved.values() if asset_id]
+        ).values_list("id", "name")
+    )
+    names = {str(asset_id): name for asset_id, name in names.items()}
+
+    tags = {}
+    for tag_id in tag_ids:
+        asset_id = resolved.get(tag_id)
+        if tag_id not in resolved:
+            tags[tag_id] = {"known": False, "asset": None}
+        elif asset_id is None or asset_id not in names:
+            tags[tag_id] = {"known": True, "asset": None}
         else:
-            messages.success(request, _("New tag generated: {}").format(tag_id))
-            return redirect(
-                reverse("admin:scantags_scantag_change", args=[scan_tag.id])
+            tags[tag_id] = {
+                "known": True,
+                "asset": {
+                    "id": asset_id,
+                    "name": names[asset_id],
+                    "url": reverse("inventory_frontend:detail", args=[asset_id]),
+                },
+            }
+
+    return JsonResponse({"success": True, "tags": tags})
+
+
+@staff_member_required
+def stocktake_view(request):
+    """Scan tags into a queue kept in the browser, and upload them at once."""
+    return render(request, "scantags/stocktake.html", {"form": StocktakeForm()})
+
+
+@staff_member_required
+@require_POST
+def stocktake_upload_view(request):
+    """Record the same status change for all assets of an uploaded stocktake."""
+    tag_ids, data = _load_tag_ids(request)
+    if tag_ids is None:
+        return JsonResponse(
+            {"success": False, "error": "Expected a list of tag_ids"}, status=400
+        )
+
+    form = StocktakeForm(data)
+    if not form.is_valid():
+        return JsonResponse(
+            {"success": False, "errors": form.errors.get_json_data()}, status=400
+        )
+
+    # A phone may retry an upload whose response was lost, which then returns
+    # the result of the first upload instead of recording the stocktake again
+    idempotency_key = form.cleaned_data["idempotency_key"]
+    upload = StocktakeUpload.objects.filter(idempotency_key=idempotency_key).first()
+    if upload is not None:
+        return JsonResponse(upload.result)
+
+    resolved = resolve_scan_tags(tag_ids)
+    unknown = [tag_id for tag_id in tag_ids if tag_id not in resolved]
+    unlinked = [
+        tag_id for tag_id in tag_ids if tag_id in resolved and not resolved[tag_id]
+    ]
+
+    try:
+        with transaction.atomic():
+            # Claimed first, so a concurrent retry waits for this one and then fails
+            upload = StocktakeUpload.objects.create(idempotency_key=idempotency_key)
+            status_changes, failures = bulk_change_status(
+                list(
+                    dict.fromkeys(
+                        asset_id for asset_id in resolved.values() if asset_id
+                    )
+                ),
+                form.cleaned_data["status_date"],
+                new_status=form.cleaned_data["new_status"] or None,
+                comments=form.cleaned_data["comments"],
             )
+            upload.result = {
+                "success": True,
+                "status_changes": len(status_changes),
+                "unknown": unknown,
+                "unlinked": unlinked,
+                "failures": [
+                    {
+                        "asset": asset_id,
+                        "tags": [
+                            tag_id
+                            for tag_id in tag_ids
+                            if resolved.get(tag_id) == asset_id
+                        ],
+                        "reason": reason,
+                    }
+                    for asset_id, reason in failures
+                ],
+            }
+            upload.save(update_fields=["result"])
+    except IntegrityError:
+        upload = StocktakeUpload.objects.get(idempotency_key=idempotency_key)
+
+    return JsonResponse(upload.result)
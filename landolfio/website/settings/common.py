@@ -165,6 +165,9 @@ MONEYBIRD_NOT_MARGIN_ASSETS_LEDGER_ACCOUNT_ID = os.environ.get(
     "MONEYBIRD_NOT_MARGIN_ASSETS_LEDGER_ACCOUNT_ID"
 )
 
+# Seconds after which the Moneybird data of an asset is refreshed when viewed
+MONEYBIRD_DATA_TTL = int(os.environ.get("MONEYBIRD_DATA_TTL", 15 * 60))
+
 # Django Tasks configuration
 TASKS = {
     "default": {
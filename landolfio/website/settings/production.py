@@ -51,6 +51,16 @@ DATABASES = {
     }
 }
 
+# uWSGI runs several processes next to the task workers, so the cache must be
+# shared between them: a value cleared after a change is then cleared for all
+# of them. The table is created on boot (see entrypoint.sh).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "landolfio_cache",
+    }
+}
+
 STATIC_URL = os.environ.get("DJANGO_STATIC_URL")
 MEDIA_URL = os.environ.get("DJANGO_MEDIA_URL")
 